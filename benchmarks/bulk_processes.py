@@ -0,0 +1,48 @@
+"""Throughput of `BulkProcessPool` country lookups with 1 to 16 worker processes.
+
+Serves the recorded payloads from a local stub server and runs the same set of IP
+addresses twice per pool size: a cold pass that fills the workers' caches, and a
+warm pass where every lookup is a cache hit, which measures the CPU-bound part
+(building the results and the columnar chunks) that more cores speed up.
+Results above `os.cpu_count()` processes only show the overhead of extra workers.
+
+Run with: python -m benchmarks.bulk_processes
+"""
+import os
+import time
+
+from parityvend_api import BulkProcessPool, ParityVendAPI
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+
+def make_ips(count: int):
+    return [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(count)]
+
+
+def run(pool: BulkProcessPool, ips) -> float:
+    start = time.perf_counter()
+    for _ in pool.iter_countries(ips):
+        pass
+    return time.perf_counter() - start
+
+
+def main(count: int = 10000, processes=(1, 2, 4, 8, 16)):
+    ips = make_ips(count)
+    print(f"{count} IP addresses, {os.cpu_count()} CPUs")
+    with serve(StubAPI(payloads.routes())) as url:
+        parityvend = ParityVendAPI(
+            "benchmark", api_urls=[url], cache_options={"maxsize": count}
+        )
+        for n in processes:
+            with BulkProcessPool(parityvend, n) as pool:
+                cold = run(pool, ips)
+                warm = run(pool, ips)
+            print(
+                f"{n:2} processes: cold {count / cold:10.0f} IPs/s, "
+                f"warm {count / warm:10.0f} IPs/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
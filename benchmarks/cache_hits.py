@@ -0,0 +1,40 @@
+"""Latency of lookups answered from the cache.
+
+Fills a `ParityVendAPI` cache from a local stub server, then times repeated lookups
+of the same keys, so no request is sent. This measures what a hit costs: building
+the cache key, reading the cache and turning the payload into the returned objects.
+
+Run with: python -m benchmarks.cache_hits
+"""
+import timeit
+
+from parityvend_api import ParityVendAPI
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+
+def main(number: int = 50000):
+    with serve(StubAPI(payloads.routes())) as url:
+        parityvend = ParityVendAPI("benchmark", api_urls=[url])
+        cases = {
+            "get_country_from_ip": lambda: parityvend.get_country_from_ip("8.8.8.8"),
+            "get_discount_from_ip": lambda: parityvend.get_discount_from_ip(
+                "102.128.79.255"
+            ),
+            "get_discount_with_html_from_ip": lambda: (
+                parityvend.get_discount_with_html_from_ip("102.128.79.255")
+            ),
+            "get_discounts_info": parityvend.get_discounts_info,
+            "get_exchange_rate_info": parityvend.get_exchange_rate_info,
+        }
+        for case in cases.values():
+            case()
+
+        print(f"{number} cache hits per case")
+        for name, case in cases.items():
+            seconds = min(timeit.repeat(case, number=number, repeat=3))
+            print(f"{name:32} {seconds / number * 1e6:8.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Throughput of `get_discount_from_ip` with and without a `DiscountComposer`.
+
+Serves the recorded payloads from a local stub server and looks up the discounts of
+the same IP addresses in three base currencies with `get_discounts_from_ips`, first
+with empty caches (cold) and then again (warm). Without a composer every IP address
+and base currency is a `get-discount-from-ip` call; with one, every IP address is
+one `get-country-from-ip` call and the responses are composed in process.
+
+Run with: python -m benchmarks.compose_discounts
+"""
+import time
+
+from parityvend_api import DiscountComposer, ParityVendAPI
+from benchmarks.bulk_processes import make_ips
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+BASE_CURRENCIES = ("USD", "EUR", "GBP")
+
+
+def run(parityvend: ParityVendAPI, ips) -> float:
+    start = time.perf_counter()
+    for base_currency in BASE_CURRENCIES:
+        parityvend.get_discounts_from_ips(ips, base_currency)
+    return time.perf_counter() - start
+
+
+def main(count: int = 2000):
+    ips = make_ips(count)
+    lookups = count * len(BASE_CURRENCIES)
+    print(f"{count} IP addresses x {len(BASE_CURRENCIES)} base currencies")
+    for composer in (None, DiscountComposer(BASE_CURRENCIES)):
+        stub = StubAPI(payloads.routes())
+        with serve(stub) as url:
+            parityvend = ParityVendAPI(
+                "benchmark",
+                api_urls=[url],
+                cache_options={"maxsize": lookups},
+                discount_composer=composer,
+            )
+            if composer:
+                while not all(map(composer.is_ready, BASE_CURRENCIES)):
+                    time.sleep(0.01)
+            requests = stub.count
+            cold = run(parityvend, ips)
+            requests = stub.count - requests
+            warm = run(parityvend, ips)
+        print(
+            f"{'composed' if composer else 'API':8}: "
+            f"cold {lookups / cold:8.0f} lookups/s ({requests} requests), "
+            f"warm {lookups / warm:8.0f} lookups/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Memory and time of the per-country hot paths.
+
+Fills a `ParityVendAPI` cache with country lookups of many IP addresses from a local
+stub server and reports the memory the cache takes per IP address, then times
+country lookups by code and id, cache hits of `get_country_from_ip`, and sorting
+and comparing `Discount` objects.
+
+Run with: python -m benchmarks.country_ids
+"""
+import gc
+import timeit
+import tracemalloc
+
+from parityvend_api import COUNTRIES, ParityVendAPI, get_country_by_code
+from parityvend_api.objects import Discounts
+from benchmarks.bulk_processes import make_ips
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+
+def cache_bytes_per_ip(url: str, count: int) -> float:
+    ips = make_ips(count)
+    parityvend = ParityVendAPI(
+        "benchmark", api_urls=[url], cache_options={"maxsize": count}
+    )
+    parityvend.get_countries_from_ips(ips[:1])
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parityvend.get_countries_from_ips(ips[1:])
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # includes the cache keys and the cache's own bookkeeping
+    return (after - before) / (count - 1)
+
+
+def timed(case, number: int) -> float:
+    return min(timeit.repeat(case, number=number, repeat=3)) / number * 1e6
+
+
+def main(count: int = 20000, number: int = 200000):
+    with serve(StubAPI(payloads.routes())) as url:
+        per_ip = cache_bytes_per_ip(url, count)
+        print(f"cache: {per_ip:.0f} bytes per cached IP address")
+
+        parityvend = ParityVendAPI("benchmark", api_urls=[url])
+        parityvend.get_country_from_ip("8.8.8.8")
+        discounts = Discounts({code: ["", 0.1] for code in COUNTRIES})
+        items = list(discounts.values())[::-1]
+        us = COUNTRIES["US"]
+        cases = {
+            "get_country_by_code('US')": lambda: get_country_by_code("US"),
+            "get_country_by_code('us')": lambda: get_country_by_code("us"),
+            "COUNTRIES.get_by_id(id)": lambda: COUNTRIES.get_by_id(us.id),
+            "get_country_from_ip (hit)": lambda: parityvend.get_country_from_ip(
+                "8.8.8.8"
+            ),
+            "get_discount_by_country": lambda: discounts.get_discount_by_country(us),
+            "Discount ==": lambda: items[0] == items[1],
+        }
+        for name, case in cases.items():
+            print(f"{name:28} {timed(case, number):8.3f} us")
+        seconds = timed(lambda: sorted(items), 2000)
+        print(f"{'sort 256 Discounts':28} {seconds:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Throughput of `get_discount_from_ip` with and without a `BaseCurrencyDeriver`.
+
+Serves the recorded payloads from a local stub server and looks up the discounts of
+the same IP addresses in three base currencies with `get_discounts_from_ips`, first
+with empty caches (cold) and then again (warm). Without a deriver every IP address
+and base currency is a `get-discount-from-ip` call; with one, every IP address is
+one call in USD, and the EUR and GBP responses are derived from it with a single
+`get-exchange-rate-info` table.
+
+Run with: python -m benchmarks.derive_base_currencies
+"""
+import time
+
+from parityvend_api import BaseCurrencyDeriver, ParityVendAPI
+from benchmarks.bulk_processes import make_ips
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+BASE_CURRENCIES = ("USD", "EUR", "GBP")
+
+
+def run(parityvend: ParityVendAPI, ips) -> float:
+    start = time.perf_counter()
+    for base_currency in BASE_CURRENCIES:
+        parityvend.get_discounts_from_ips(ips, base_currency)
+    return time.perf_counter() - start
+
+
+def main(count: int = 2000):
+    ips = make_ips(count)
+    lookups = count * len(BASE_CURRENCIES)
+    print(f"{count} IP addresses x {len(BASE_CURRENCIES)} base currencies")
+    for deriver in (None, BaseCurrencyDeriver()):
+        stub = StubAPI(payloads.routes())
+        with serve(stub) as url:
+            parityvend = ParityVendAPI(
+                "benchmark",
+                api_urls=[url],
+                cache_options={"maxsize": lookups},
+                base_currency_deriver=deriver,
+            )
+            cold = run(parityvend, ips)
+            requests = stub.count
+            warm = run(parityvend, ips)
+        print(
+            f"{'derived' if deriver else 'API':7}: "
+            f"cold {lookups / cold:8.0f} lookups/s ({requests} requests), "
+            f"warm {lookups / warm:8.0f} lookups/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Cost of refreshing and comparing a full discounts table.
+
+Times the conversion of a `get-discounts-info` payload with a discount for every
+country, which runs each time the table is fetched from the API, with and without
+reusing the `Discounts` snapshot of an unchanged table. Then compares two snapshots
+that differ in one country with `Discounts.diff` and with a loop over all discounts.
+
+Run with: python -m benchmarks.discounts_snapshot
+"""
+import timeit
+
+from parityvend_api import COUNTRIES, ParityVendAPI
+from parityvend_api.objects import Discounts
+
+
+def make_raw_discounts(changed: str = "") -> dict:
+    return {
+        code: ["coupon" if code == changed else "", round(index % 90 / 100, 2)]
+        for index, code in enumerate(COUNTRIES)
+    }
+
+
+def make_payload() -> dict:
+    # a new payload for every fetch, as decoded from the response
+    return {"status": "ok", "discounts": make_raw_discounts()}
+
+
+def timed(case, number: int) -> float:
+    return min(timeit.repeat(case, number=number, repeat=3)) / number * 1e6
+
+
+def compare_all(old: Discounts, new: Discounts) -> dict:
+    return {
+        code: (old.get(code), new.get(code))
+        for code in old.keys() | new.keys()
+        if old.get(code) is None
+        or new.get(code) is None
+        or dict(old[code], raw_discount=None) != dict(new[code], raw_discount=None)
+    }
+
+
+def main(number: int = 500):
+    payloads = [make_payload() for _ in range(number)]
+    convert = ParityVendAPI.convert_result
+
+    def convert_all():
+        for payload in payloads:
+            convert("get-discounts-info", payload)
+
+    reused = timed(convert_all, 1) / number
+    get_snapshot = Discounts.get_snapshot
+    Discounts.get_snapshot = Discounts
+    try:
+        rebuilt = timed(convert_all, 1) / number
+    finally:
+        Discounts.get_snapshot = get_snapshot
+    print(f"converting a get-discounts-info payload, {len(COUNTRIES)} discounts:")
+    print(f"  rebuilt every time       {rebuilt:8.1f} us")
+    print(f"  snapshot reused          {reused:8.1f} us")
+
+    old = Discounts.get_snapshot(make_raw_discounts())
+    new = Discounts.get_snapshot(make_raw_discounts(changed="FR"))
+    assert old.diff(new).keys() == compare_all(old, new).keys() == {"FR"}
+    print("changes between snapshots differing in one country:")
+    for name, case in {
+        "comparing every discount": lambda: compare_all(old, new),
+        "Discounts.diff": lambda: old.diff(new),
+        "Discounts.diff (same)": lambda: old.diff(old),
+    }.items():
+        print(f"  {name:24} {timed(case, number):8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cross rates from one `get_exchange_rate_info` table against a table per base currency.
+
+Serves the recorded payloads from a local stub server. Getting the rates of every
+base currency with a `get_exchange_rate_info` call each is compared with one call
+whose `ExchangeRates` table is rebased to the other base currencies. Then a list of
+prices is converted between two currencies, per price from the raw rates and with
+`ExchangeRates.convert`.
+
+Run with: python -m benchmarks.exchange_rates
+"""
+import random
+import timeit
+
+from parityvend_api import ParityVendAPI
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+BASE_CURRENCIES = tuple(payloads.rates_usd)
+
+
+def per_base_currency(parityvend: ParityVendAPI) -> dict:
+    return {
+        base_currency: parityvend.get_exchange_rate_info(base_currency, cache=False)
+        for base_currency in BASE_CURRENCIES
+    }
+
+
+def rebased(parityvend: ParityVendAPI) -> dict:
+    rates = parityvend.get_exchange_rate_info("USD", cache=False).rates
+    return {
+        base_currency: rates.rebase(base_currency) for base_currency in BASE_CURRENCIES
+    }
+
+
+def convert_per_price(rates: dict, prices: list) -> list:
+    return [price * rates["JPY"] / rates["EUR"] for price in prices]
+
+
+def main(number: int = 20, count: int = 100_000):
+    stub = StubAPI(payloads.routes())
+    with serve(stub) as url:
+        parityvend = ParityVendAPI("benchmark", api_urls=[url])
+        rates = parityvend.get_exchange_rate_info("USD").rates
+        print(f"rates of {len(BASE_CURRENCIES)} base currencies:")
+        for fetch in (per_base_currency, rebased):
+            requests = stub.count
+            seconds = timeit.timeit(lambda: fetch(parityvend), number=number) / number
+            requests = (stub.count - requests) // number
+            print(f"  {fetch.__name__:17}: {seconds * 1e3:6.2f} ms ({requests} requests)")
+
+    prices = [round(random.uniform(1, 500), 2) for _ in range(count)]
+    print(f"{count} prices from EUR to JPY:")
+    for name, convert in (
+        ("per price", lambda: convert_per_price(payloads.rates_usd, prices)),
+        ("convert", lambda: rates.convert(prices, "EUR", "JPY")),
+    ):
+        seconds = min(timeit.repeat(convert, number=1, repeat=5))
+        print(
+            f"  {name:17}: {seconds * 1e3:6.2f} ms in total,"
+            f" {seconds / count * 1e9:5.1f} ns per price"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Throughput of cached lookups shared by 1 to 32 threads.
+
+All threads use one `ParityVendAPI` whose cache has been filled from a local stub
+server, so the benchmark measures the lookup path only: the locked cache, the
+conversion of the cached payload and the `Response` objects. On a free-threaded
+build (e.g. `python3.13t`) throughput should grow with the number of cores; with
+the GIL it stays flat.
+
+Run with: python -m benchmarks.free_threading
+"""
+import os
+import sys
+import threading
+import time
+
+from parityvend_api import ParityVendAPI
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+
+def run(parityvend: ParityVendAPI, ips, threads: int, lookups: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for i in range(lookups):
+            parityvend.get_discount_from_ip(ips[i % len(ips)])
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main(lookups: int = 20000, threads=(1, 2, 4, 8, 16, 32)):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{os.cpu_count()} CPUs, {lookups} lookups per thread")
+
+    ips = list(payloads.ip_countries)
+    with serve(StubAPI(payloads.routes())) as url:
+        parityvend = ParityVendAPI("benchmark", api_urls=[url])
+        for ip in ips:
+            parityvend.get_discount_from_ip(ip)
+
+        for n in threads:
+            seconds = run(parityvend, ips, n, lookups)
+            print(f"{n:2} threads: {n * lookups / seconds:10.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Time of `import parityvend_api`.
+
+Imports the package in fresh interpreters with `-X importtime` and reports the best
+cumulative import time, next to the time of importing `requests` and `aiohttp`, which
+`import parityvend_api` used to pull in (about 370 ms).
+
+Run with: python -m benchmarks.import_time
+"""
+import subprocess
+import sys
+
+
+def import_time_ms(module: str) -> float:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} is missing from the -X importtime output")
+
+
+def main(repeat: int = 5):
+    for module in ("parityvend_api", "requests", "aiohttp"):
+        best = min(import_time_ms(module) for _ in range(repeat))
+        print(f"import {module:16} {best:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
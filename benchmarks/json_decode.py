@@ -0,0 +1,58 @@
+"""Per-response cost of decoding a `get-discount-with-html-from-ip` payload.
+
+Compares the old path (`json.loads(r.text)`, which runs charset detection when the
+server sends no charset and builds an intermediate `str`) with passing `r.content`
+straight to the decoder.
+
+Run with: python -m benchmarks.json_decode
+"""
+import json
+import timeit
+
+import requests
+
+from parityvend_api.decoders import get_default_json_loads
+from tests import payloads
+
+
+def make_response(body: bytes, content_type: str) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.headers["Content-Type"] = content_type
+    r._content = body
+    return r
+
+
+def main(number: int = 20000):
+    payload = payloads.discount_payload("ZW", html=payloads.banner_html("ZW") * 4)
+    body = json.dumps(payload, ensure_ascii=False).encode("utf8")
+    json_loads = get_default_json_loads()
+
+    cases = {
+        "json.loads(r.text), no charset": (json.loads, "text", "application/json"),
+        "json.loads(r.text), utf-8 charset": (
+            json.loads,
+            "text",
+            "application/json; charset=utf-8",
+        ),
+        "json.loads(r.content)": (json.loads, "content", "application/json"),
+        f"{json_loads.__module__}.loads(r.content)": (
+            json_loads,
+            "content",
+            "application/json",
+        ),
+    }
+
+    print(f"payload size: {len(body)} bytes, {number} responses per case")
+    for name, (loads, attr, content_type) in cases.items():
+
+        def decode():
+            # a fresh Response per call, as requests caches `r.text` after the first access
+            return loads(getattr(make_response(body, content_type), attr))
+
+        seconds = min(timeit.repeat(decode, number=number, repeat=3))
+        print(f"{name:40} {seconds / number * 1e6:8.2f} us/response")
+
+
+if __name__ == "__main__":
+    main()
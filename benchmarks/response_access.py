@@ -0,0 +1,59 @@
+"""Attribute-access cost and memory of the response objects.
+
+Compares `Response` as it was before nested objects were decoded once
+(`LegacyResponse` below: a new `Response` on every access to a nested dict, and a
+`__dict__` per object) with the slotted `Response` and the `FrozenResponse`
+returned by the handlers, using a `get-discount-from-ip` payload. The memory of a
+`FrozenResponse` includes its nested objects, which it converts up front.
+
+Run with: python -m benchmarks.response_access
+"""
+import timeit
+import tracemalloc
+
+from parityvend_api.objects import COUNTRIES, FrozenResponse, Response
+from tests import payloads
+
+
+class LegacyResponse(dict):
+    def __getattr__(self, attr):
+        value = self[attr]
+        if isinstance(value, dict):
+            return LegacyResponse(value)
+        return value
+
+
+def make_payload() -> dict:
+    payload = payloads.discount_payload("VE")
+    return {**payload, "country": COUNTRIES["VE"]}
+
+
+def measure_memory(cls, count: int) -> float:
+    data = [make_payload() for _ in range(count)]
+    tracemalloc.start()
+    objects = [cls(payload) for payload in data]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main(number: int = 200000, count: int = 10000):
+    print(f"{number} accesses per case, memory averaged over {count} objects")
+    for cls in (LegacyResponse, Response, FrozenResponse):
+        response = cls(make_payload())
+        cases = {
+            "r.discount": lambda: response.discount,
+            "r.currency.code": lambda: response.currency.code,
+            "r.country.name": lambda: response.country.name,
+        }
+        for name, case in cases.items():
+            seconds = min(timeit.repeat(case, number=number, repeat=5))
+            print(
+                f"{cls.__name__:16} {name:18} {seconds / number * 1e9:8.1f} ns/access"
+            )
+        print(f"{cls.__name__:16} {'memory':18} {measure_memory(cls, count):8.0f} B/object")
+
+
+if __name__ == "__main__":
+    main()
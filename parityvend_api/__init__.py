@@ -1,12 +1,49 @@
-from .handler import ParityVendAPI
-from .handler_async import AsyncParityVendAPI
+import importlib
+
 from .utils import env_get
-from .objects import COUNTRIES, get_country_by_code
-from .exceptions import QuotaExceededError, APIError, ProcessingError, ConnectionError
+from .objects import COUNTRIES, Discounts, ExchangeRates, get_country_by_code
+from .exceptions import (
+    QuotaExceededError,
+    APIError,
+    ProcessingError,
+    ConnectionError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RateLimitExceededError,
+    QuotaReservedError,
+)
+from .circuit import CircuitBreaker, CircuitState
+from .fallback import no_discount_fallback
+from .hedging import HedgePolicy
+from .limiter import AdaptiveLimiter
+from .ratelimit import RateLimiter
+from .priority import Priority
+from .quota import QuotaManager
+from .compose import BaseCurrencyDeriver, DiscountComposer
+from .retry import RetryPolicy
+from .balancer import URLBalancer
+
+# The clients are imported on first use, so that `import parityvend_api` does not import the HTTP libraries
+# (`requests`, `aiohttp`) and `asyncio`. Each client imports its own HTTP library when it is created.
+_LAZY_IMPORTS = {
+    "ParityVendAPI": ".handler",
+    "AsyncParityVendAPI": ".handler_async",
+    "BridgedParityVendAPI": ".bridge",
+    "BulkProcessPool": ".parallel",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_IMPORTS])
 
-# ParityVend API - Official Python Library
-# View API reference at https://www.ambeteco.com/ParityVend/docs/api_reference.html
-# View full docs at https://www.ambeteco.com/ParityVend/docs/index.html
 
 # ParityVend API - Official Python Library
 # View API reference at https://www.ambeteco.com/ParityVend/docs/api_reference.html
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from typing import Iterable, List, Optional
+
+
+class URLBalancer:
+    """
+    A class that spreads requests over several base URLs of the ParityVend API (like regional proxies or mirrors)
+    and fails over between them.
+
+    Every base URL keeps an EWMA (exponentially weighted moving average) of its response latency. A request picks two
+    healthy URLs at random and goes to the faster one ("power of two choices"), which favours fast URLs without
+    sending all the traffic to one of them. A URL that fails with a connection error is marked unhealthy for
+    `cooldown` seconds, and the request fails over to the fastest healthy URL it has not tried yet.
+
+    The balancer is thread-safe and can be shared between handlers.
+
+    Args:
+        urls (Iterable[str]): The base URLs, in the same form as `API_URL` (e.g., "https://api.parityvend.cloud").
+        smoothing (float, optional): The weight (0 to 1) of the latest latency in the moving average. Defaults to 0.2.
+        cooldown (float, optional): How long (in seconds) a URL that failed is skipped. Defaults to 10.0.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        smoothing: float = 0.2,
+        cooldown: float = 10.0,
+    ):
+        self.urls: List[str] = [url.rstrip("/") for url in urls]
+        if not self.urls:
+            raise ValueError("URLBalancer needs at least one base URL.")
+
+        self.smoothing: float = smoothing
+        self.cooldown: float = cooldown
+
+        self._lock = threading.Lock()
+        self._latency: dict = {url: None for url in self.urls}
+        self._down_until: dict = {url: 0.0 for url in self.urls}
+        self._stats: dict = {
+            url: {"requests": 0, "failures": 0, "failovers": 0} for url in self.urls
+        }
+
+    def __repr__(self) -> str:
+        return f"URLBalancer(urls={self.urls!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock",):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Per-URL counters: the number of `requests` and `failures`, how many requests failed over to the URL
+        (`failovers`), its moving average `latency` and whether it is `healthy`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                url: {
+                    **self._stats[url],
+                    "latency": self._latency[url],
+                    "healthy": self._down_until[url] <= now,
+                }
+                for url in self.urls
+            }
+
+    def select(self) -> str:
+        """
+        Pick the base URL for a request.
+
+        Returns:
+            str: The base URL.
+        """
+        with self._lock:
+            now = time.monotonic()
+            healthy = [url for url in self.urls if self._down_until[url] <= now]
+            if not healthy:
+                # everything is down, try the one that has been down for the longest
+                return min(self.urls, key=self._down_until.__getitem__)
+            if len(healthy) == 1:
+                return healthy[0]
+            return min(random.sample(healthy, 2), key=self._get_latency)
+
+    def get_failover_url(self, url: str, tried: set) -> Optional[str]:
+        """
+        Get the URL to retry a request on after a connection error.
+
+        Args:
+            url (str): The full URL of the request that failed.
+            tried (set): The base URLs the request has already been sent to. The base URL of `url` is added to it.
+
+        Returns:
+            Optional[str]: `url` moved to the fastest healthy base URL not in `tried`, or None if there is none.
+        """
+        base_url = self.match(url)
+        if base_url is None:
+            return None
+        tried.add(base_url)
+
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                candidate
+                for candidate in self.urls
+                if candidate not in tried and self._down_until[candidate] <= now
+            ]
+            if not candidates:
+                return None
+            failover = min(candidates, key=self._get_latency)
+            self._stats[failover]["failovers"] += 1
+
+        return f"{failover}{url[len(base_url):]}"
+
+    def record(
+        self,
+        url: str,
+        latency: Optional[float] = None,
+        exc: Optional[BaseException] = None,
+    ):
+        """
+        Record the outcome of a request.
+
+        Args:
+            url (str): The full URL of the request.
+            latency (Optional[float], optional): The latency of the request in seconds. Defaults to None.
+            exc (Optional[BaseException], optional): The connection error the request failed with, if any. Defaults to None.
+        """
+        base_url = self.match(url)
+        if base_url is None:
+            return
+
+        with self._lock:
+            stats = self._stats[base_url]
+            stats["requests"] += 1
+            if exc is not None:
+                stats["failures"] += 1
+                self._down_until[base_url] = time.monotonic() + self.cooldown
+                return
+
+            self._down_until[base_url] = 0.0
+            if latency is not None:
+                average = self._latency[base_url]
+                self._latency[base_url] = (
+                    latency
+                    if average is None
+                    else average + self.smoothing * (latency - average)
+                )
+
+    def match(self, url: str) -> Optional[str]:
+        """
+        Get the base URL a full URL was built from.
+
+        Args:
+            url (str): The full URL.
+
+        Returns:
+            Optional[str]: The longest matching base URL, or None if the URL is not from this balancer.
+        """
+        matches = [
+            base_url
+            for base_url in self.urls
+            if url == base_url or url.startswith(f"{base_url}/")
+        ]
+        return max(matches, key=len) if matches else None
+
+    def _get_latency(self, url: str) -> float:
+        # URLs without a measurement yet are tried first
+        latency = self._latency[url]
+        return 0.0 if latency is None else latency
@@ -0,0 +1,271 @@
+import asyncio
+import concurrent.futures
+import threading
+from ipaddress import IPv4Address, IPv6Address
+from typing import Any, Coroutine, Iterable, List, Optional, Union
+
+from .handler_async import AsyncParityVendAPI
+from .objects import Country, Response
+from .priority import Priority
+
+
+class BridgedParityVendAPI:
+    """
+    A synchronous client that runs an `AsyncParityVendAPI` on an event loop in a background thread.
+
+    It has the method signatures of `ParityVendAPI`, so it can be used from synchronous code (like a Django view),
+    but every request runs on the one shared event loop. Any number of threads can call it at the same time, and the
+    bulk methods run their lookups as tasks instead of a thread each, so one process can have thousands of lookups in
+    flight. Call `close()` (or use it as a context manager) to stop the loop.
+
+    Args:
+        private_key (str): Your ParityVend API private key.
+        **options: Keyword arguments passed to `AsyncParityVendAPI` (e.g., `limiter`, `retry_policy`, `deadline`).
+    """
+
+    def __init__(self, private_key: str, **options: Any):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="parityvend-bridge", daemon=True
+        )
+        self._thread.start()
+
+        try:
+            self.api: AsyncParityVendAPI = self.run(
+                self._create_api(private_key, options)
+            )
+        except BaseException:
+            # e.g., invalid options: do not leave the loop and its thread running
+            self._stop_loop()
+            raise
+
+    def __repr__(self) -> str:
+        return f"BridgedParityVendAPI(running={self.running!r})"
+
+    def __enter__(self) -> "BridgedParityVendAPI":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background event loop is running."""
+        return self._thread.is_alive()
+
+    @staticmethod
+    async def _create_api(private_key: str, options: dict) -> AsyncParityVendAPI:
+        # created on the loop, so the session and the quota poller belong to it
+        api = AsyncParityVendAPI(private_key, **options)
+        try:
+            await api.init()
+        except BaseException:
+            await api.deinit()
+            raise
+        return api
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the background event loop without waiting for it.
+
+        Args:
+            coro (Coroutine): The coroutine to run, e.g. `bridge.api.get_country_from_ip(ip)`.
+
+        Returns:
+            concurrent.futures.Future: A future for the result of the coroutine.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(
+                "BridgedParityVendAPI cannot be called from its own event loop, use its `api` instead."
+            )
+        if not self.running:
+            coro.close()
+            raise RuntimeError("BridgedParityVendAPI is closed.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[Union[int, float]] = None) -> Any:
+        """
+        Run a coroutine on the background event loop and wait for its result.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+            timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for the result. Defaults to None (no limit).
+
+        Raises:
+            concurrent.futures.TimeoutError: If the coroutine does not complete within `timeout`. It is cancelled.
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self, drain_timeout: Optional[Union[int, float]] = 10.0):
+        """
+        Close the client (see `AsyncParityVendAPI.aclose`) and stop the background event loop.
+
+        Args:
+            drain_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for the requests in flight. Defaults to 10.0.
+        """
+        if not self.running:
+            return
+
+        self.run(self.api.aclose(drain_timeout))
+        self._stop_loop()
+
+    def _stop_loop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def warm_up(self, connections: Optional[int] = None) -> int:
+        """
+        Open connections to the ParityVend API in advance. See `ParityVendAPI.warm_up`.
+        """
+        return self.run(self.api.warm_up(connections))
+
+    def get_country_from_ip(
+        self,
+        ip: Union[str, bytes, IPv4Address, IPv6Address],
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Country:
+        """
+        Get the country associated with an IP address. See `ParityVendAPI.get_country_from_ip`.
+        """
+        return self.run(
+            self.api.get_country_from_ip(ip, timeout, cache, deadline, priority)
+        )
+
+    def get_discount_from_ip(
+        self,
+        ip: Union[str, bytes, IPv4Address, IPv6Address],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Response:
+        """
+        Get the discount information associated with an IP address. See `ParityVendAPI.get_discount_from_ip`.
+        """
+        return self.run(
+            self.api.get_discount_from_ip(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+        )
+
+    def get_banner_from_ip(
+        self,
+        ip: Union[str, bytes, IPv4Address, IPv6Address],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Union[str, Response]:
+        """
+        Get an HTML banner for the discount information associated with an IP address. See `ParityVendAPI.get_banner_from_ip`.
+        """
+        return self.run(
+            self.api.get_banner_from_ip(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+        )
+
+    def get_discount_with_html_from_ip(
+        self,
+        ip: Union[str, bytes, IPv4Address, IPv6Address],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Response:
+        """
+        Get the discount information and the HTML banner associated with an IP address. See `ParityVendAPI.get_discount_with_html_from_ip`.
+        """
+        return self.run(
+            self.api.get_discount_with_html_from_ip(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+        )
+
+    def get_quota_info(
+        self, timeout: Optional[Union[int, float]] = None, cache: bool = False
+    ) -> Response:
+        """
+        Get information about the account's API quota. See `ParityVendAPI.get_quota_info`.
+        """
+        return self.run(self.api.get_quota_info(timeout, cache))
+
+    def get_discounts_info(
+        self, timeout: Optional[Union[int, float]] = None, cache: bool = True
+    ) -> Response:
+        """
+        Get information about all the discounts configured for the current project. See `ParityVendAPI.get_discounts_info`.
+        """
+        return self.run(self.api.get_discounts_info(timeout, cache))
+
+    def get_exchange_rate_info(
+        self,
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+    ) -> Response:
+        """
+        Get the current exchange rates. See `ParityVendAPI.get_exchange_rate_info`.
+        """
+        return self.run(
+            self.api.get_exchange_rate_info(base_currency, timeout, cache)
+        )
+
+    def get_countries_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Country, Exception]]:
+        """
+        Get the countries associated with many IP addresses. The lookups run as tasks on the background event loop. See `ParityVendAPI.get_countries_from_ips`.
+        """
+        return self.run(
+            self.api.get_countries_from_ips(
+                ips, timeout, cache, max_concurrency, return_exceptions, priority
+            )
+        )
+
+    def get_discounts_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Response, Exception]]:
+        """
+        Get the discount information associated with many IP addresses. The lookups run as tasks on the background event loop. See `ParityVendAPI.get_discounts_from_ips`.
+        """
+        return self.run(
+            self.api.get_discounts_from_ips(
+                ips,
+                base_currency,
+                timeout,
+                cache,
+                max_concurrency,
+                return_exceptions,
+                priority,
+            )
+        )
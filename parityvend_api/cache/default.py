@@ -1,20 +1,38 @@
+import threading
+
 import cachetools
 
 from .interface import CacheInterface
 
 
 class DefaultCache(CacheInterface):
+    # `cachetools` caches reorder and expire entries on every read, so all access goes through a lock. Without it,
+    # concurrent threads corrupt the cache, especially on free-threaded (no-GIL) builds of Python.
     def __init__(self, **cache_options):
         self.cache = cachetools.TTLCache(**cache_options)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def __contains__(self, key):
-        return self.cache.__contains__(key)
+        with self._lock:
+            return self.cache.__contains__(key)
 
     def __setitem__(self, key, value):
-        return self.cache.__setitem__(key, value)
+        with self._lock:
+            return self.cache.__setitem__(key, value)
 
     def __getitem__(self, key):
-        return self.cache.__getitem__(key)
+        with self._lock:
+            return self.cache.__getitem__(key)
 
     def __delitem__(self, key):
-        return self.cache.__delitem__(key)
+        with self._lock:
+            return self.cache.__delitem__(key)
@@ -0,0 +1,255 @@
+import collections
+import enum
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple, Type
+
+from .exceptions import APIError, ConnectionError
+
+logger = logging.getLogger("parityvend")
+
+
+class CircuitState(str, enum.Enum):
+    """The states of a `CircuitBreaker`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker that stops calling the API while it is degraded.
+
+    The breaker keeps the outcome of the last `window_size` calls. Once at least `minimum_calls` are recorded and
+    either the share of failed calls reaches `failure_rate_threshold` or the share of calls slower than
+    `slow_call_duration` reaches `slow_call_rate_threshold`, the circuit opens: calls are short-circuited without
+    touching the network. After `open_duration` seconds the circuit becomes half-open and lets `half_open_max_calls`
+    probe calls through. If all of them succeed the circuit closes again, otherwise it re-opens.
+
+    The breaker is thread-safe and can be shared by several handlers.
+
+    Args:
+        failure_rate_threshold (float, optional): The share of failed calls (0 to 1) that opens the circuit. Defaults to 0.5.
+        slow_call_duration (Optional[float], optional): Calls that take longer (in seconds) are counted as slow. Defaults to None (not tracked).
+        slow_call_rate_threshold (float, optional): The share of slow calls (0 to 1) that opens the circuit. Defaults to 1.0.
+        window_size (int, optional): The number of recent calls the rates are computed over. Defaults to 20.
+        minimum_calls (int, optional): The number of calls needed before the circuit can open. Defaults to 10.
+        open_duration (float, optional): How long (in seconds) the circuit stays open before probing. Defaults to 30.0.
+        half_open_max_calls (int, optional): The number of probe calls let through while half-open. Defaults to 1.
+        failure_exceptions (Tuple[Type[Exception], ...], optional): Exceptions that count as failed calls. Other exceptions
+            (like `ProcessingError`) mean the API answered and count as successful calls. Defaults to `ConnectionError` and `APIError`.
+        on_state_change (Optional[Callable[[CircuitState, CircuitState], None]], optional): A hook called with the old and
+            the new state on every state change. More hooks can be added with `add_listener`. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Tuple[Type[Exception], ...] = (ConnectionError, APIError),
+        on_state_change: Optional[Callable[[CircuitState, CircuitState], None]] = None,
+    ):
+        self.failure_rate_threshold: float = failure_rate_threshold
+        self.slow_call_duration: Optional[float] = slow_call_duration
+        self.slow_call_rate_threshold: float = slow_call_rate_threshold
+        self.window_size: int = window_size
+        self.minimum_calls: int = minimum_calls
+        self.open_duration: float = open_duration
+        self.half_open_max_calls: int = half_open_max_calls
+        self.failure_exceptions: Tuple[Type[Exception], ...] = tuple(
+            failure_exceptions
+        )
+
+        self.listeners: List[Callable[[CircuitState, CircuitState], None]] = []
+        if on_state_change:
+            self.listeners.append(on_state_change)
+
+        self._lock = threading.Lock()
+        self._state: CircuitState = CircuitState.CLOSED
+        self._window: collections.deque = collections.deque(maxlen=window_size)
+        self._opened_at: float = 0.0
+        self._probes_in_flight: int = 0
+        self._probes_succeeded: int = 0
+        self._metrics: dict = {
+            "calls": 0,
+            "failed_calls": 0,
+            "slow_calls": 0,
+            "short_circuited_calls": 0,
+            "opened": 0,
+            "half_opened": 0,
+            "closed": 0,
+        }
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(state={self.state.value!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock",):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._probes_in_flight = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        with self._lock:
+            return self._state
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Counters describing the breaker: the current `state`, the `failure_rate` and `slow_call_rate` of the
+        current window, the number of `calls`, `failed_calls`, `slow_calls` and `short_circuited_calls`, and how
+        many times the circuit was `opened`, `half_opened` and `closed`.
+        """
+        with self._lock:
+            failure_rate, slow_call_rate = self._rates()
+            return {
+                "state": self._state.value,
+                "failure_rate": failure_rate,
+                "slow_call_rate": slow_call_rate,
+                **self._metrics,
+            }
+
+    def add_listener(self, listener: Callable[[CircuitState, CircuitState], None]):
+        """
+        Add a hook called with the old and the new state on every state change.
+
+        Args:
+            listener (Callable[[CircuitState, CircuitState], None]): The hook.
+        """
+        self.listeners.append(listener)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go to the API. Every allowed call must be followed by `record`.
+
+        Returns:
+            bool: True if the call may proceed, False if it must be short-circuited.
+        """
+        with self._lock:
+            if (
+                self._state is CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self.open_duration
+            ):
+                transition = self._transition(CircuitState.HALF_OPEN)
+            else:
+                transition = None
+
+            if self._state is CircuitState.CLOSED:
+                allowed = True
+            elif (
+                self._state is CircuitState.HALF_OPEN
+                and self._probes_in_flight < self.half_open_max_calls
+            ):
+                self._probes_in_flight += 1
+                allowed = True
+            else:
+                self._metrics["short_circuited_calls"] += 1
+                allowed = False
+
+        self._notify(transition)
+        return allowed
+
+    def record(self, duration: float, exc: Optional[BaseException] = None):
+        """
+        Record the outcome of a call that was allowed by `allow_request`.
+
+        Args:
+            duration (float): How long (in seconds) the call took.
+            exc (Optional[BaseException], optional): The exception raised by the call, if any. Defaults to None.
+        """
+        failed = isinstance(exc, self.failure_exceptions)
+        if exc is not None and not failed and not isinstance(exc, Exception):
+            # the call was cancelled, so it says nothing about the API's health
+            with self._lock:
+                if self._state is CircuitState.HALF_OPEN:
+                    self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            return
+
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+
+        with self._lock:
+            self._metrics["calls"] += 1
+            self._metrics["failed_calls"] += failed
+            self._metrics["slow_calls"] += slow
+
+            transition = None
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    transition = self._transition(CircuitState.OPEN)
+                else:
+                    self._probes_succeeded += 1
+                    if self._probes_succeeded >= self.half_open_max_calls:
+                        transition = self._transition(CircuitState.CLOSED)
+            elif self._state is CircuitState.CLOSED:
+                self._window.append((failed, slow))
+                failure_rate, slow_call_rate = self._rates()
+                if len(self._window) >= self.minimum_calls and (
+                    failure_rate >= self.failure_rate_threshold
+                    or slow_call_rate >= self.slow_call_rate_threshold
+                ):
+                    transition = self._transition(CircuitState.OPEN)
+
+        self._notify(transition)
+
+    def reset(self):
+        """
+        Close the circuit and forget the recorded calls.
+        """
+        with self._lock:
+            transition = None
+            if self._state is not CircuitState.CLOSED:
+                transition = self._transition(CircuitState.CLOSED)
+            self._window.clear()
+        self._notify(transition)
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        failed = sum(failed for failed, _ in self._window)
+        slow = sum(slow for _, slow in self._window)
+        return failed / len(self._window), slow / len(self._window)
+
+    def _transition(self, new_state: CircuitState) -> Tuple[CircuitState, CircuitState]:
+        old_state = self._state
+        self._state = new_state
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+
+        if new_state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self._metrics["opened"] += 1
+        elif new_state is CircuitState.HALF_OPEN:
+            self._metrics["half_opened"] += 1
+        else:
+            self._window.clear()
+            self._metrics["closed"] += 1
+        return old_state, new_state
+
+    def _notify(self, transition: Optional[Tuple[CircuitState, CircuitState]]):
+        if not transition:
+            return
+
+        old_state, new_state = transition
+        logger.warning(
+            f"ParityVend API circuit breaker changed state: {old_state.value} -> {new_state.value}."
+        )
+        for listener in self.listeners:
+            try:
+                listener(old_state, new_state)
+            except Exception:
+                logger.exception("ParityVend API circuit breaker hook failed.")
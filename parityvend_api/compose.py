@@ -0,0 +1,433 @@
+import logging
+import threading
+import time
+import weakref
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from .fallback import NO_DISCOUNT
+from .objects import Country, Discount, Discounts, ExchangeRates, FrozenResponse
+
+logger = logging.getLogger("parityvend")
+
+_MISSING = object()
+
+
+class DiscountComposer:
+    """
+    A class that answers discount lookups in process, from the country of the IP address and the project's tables.
+
+    The composer keeps the `get_discounts_info` table and a `get_exchange_rate_info` table for each of the
+    `base_currencies`, and the handler refreshes them in the background every `refresh_interval` seconds. A
+    `get_discount_from_ip` lookup then only resolves the IP address to its country (from the cache, or with
+    `get_country_from_ip`), and the response is assembled locally, in the same shape as the API response. Lookups
+    use the API as usual until the tables are loaded, once they are older than `max_age`, and for other base
+    currencies.
+
+    Args:
+        base_currencies (Iterable[str], optional): The base currencies to keep exchange rates for. Defaults to ("USD",).
+        refresh_interval (float, optional): How often (in seconds) to refresh the tables. Defaults to 3600.
+        max_age (Optional[float], optional): The age (in seconds) after which the tables are stale, and lookups go back
+            to the API until the next successful refresh. Defaults to None (three times `refresh_interval`).
+    """
+
+    def __init__(
+        self,
+        base_currencies: Iterable[str] = ("USD",),
+        refresh_interval: float = 3600,
+        max_age: Optional[float] = None,
+    ):
+        self.base_currencies: tuple = tuple(code.upper() for code in base_currencies)
+        self.refresh_interval: float = refresh_interval
+        self.max_age: float = 3 * refresh_interval if max_age is None else max_age
+
+        self._lock = threading.Lock()
+        self._discounts: Optional[Discounts] = None
+        self._discounts_at: float = 0.0
+        self._rates: Dict[str, ExchangeRates] = {}
+        self._rates_at: Dict[str, float] = {}
+        # (base currency -> the time its tables go stale, composed responses by (country id, base currency)),
+        # replaced as a whole when a table changes, so lookups never mix old and new tables
+        self._state: tuple = ({}, {})
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"DiscountComposer(base_currencies={self.base_currencies!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock", "_stop", "_thread"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def stats(self) -> dict:
+        """The age (in seconds) of the tables, None for the tables not loaded yet."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "discounts_age": now - self._discounts_at if self._discounts else None,
+                "rates_age": {
+                    base_currency: now - self._rates_at[base_currency]
+                    if base_currency in self._rates
+                    else None
+                    for base_currency in self.base_currencies
+                },
+            }
+
+    def is_ready(self, base_currency: str) -> bool:
+        """
+        Check whether lookups in the given base currency can be composed locally.
+
+        Args:
+            base_currency (str): The base currency of the lookup.
+
+        Returns:
+            bool: True if the tables for `base_currency` are loaded and not stale.
+        """
+        stale_at = self._state[0].get(base_currency)
+        return stale_at is not None and time.monotonic() < stale_at
+
+    def compose(
+        self, country: Country, base_currency: str
+    ) -> Optional[FrozenResponse]:
+        """
+        Compose the `get-discount-from-ip` response for a country.
+
+        Responses are built once per country and base currency for each version of the tables.
+
+        Args:
+            country (Country): The country of the IP address. "XX" (unknown) gets the "no discount" response.
+            base_currency (str): The base currency of the exchange rate.
+
+        Returns:
+            Optional[FrozenResponse]: The response, or None if it cannot be composed locally (the tables are not loaded
+                or stale, or the exchange rate of the country's currency is missing).
+        """
+        stale_at, responses = self._state
+        if time.monotonic() >= stale_at.get(base_currency, 0.0):
+            return None
+
+        key = (country.id, base_currency)
+        response = responses.get(key, _MISSING)
+        if response is _MISSING:
+            with self._lock:
+                # the tables can have changed since the check above, build from the current ones
+                responses = self._state[1]
+                response = responses.get(key, _MISSING)
+                if response is _MISSING:
+                    response = responses[key] = self._build(country, base_currency)
+        return response
+
+    def update_discounts(self, discounts_info: dict, now: Optional[float] = None):
+        """
+        Replace the discounts table with a `get_discounts_info` response. Error responses are ignored.
+
+        Args:
+            discounts_info (dict): The response, with `discounts`.
+            now (Optional[float], optional): The time of the fetch (`time.monotonic()`). Defaults to None (now).
+        """
+        discounts = discounts_info.get("discounts")
+        if discounts_info.get("status") != "ok" or discounts is None:
+            logger.warning(
+                f"ParityVend API discounts table was not updated: {discounts_info!r}"
+            )
+            return
+
+        if not isinstance(discounts, Discounts):
+            discounts = Discounts.get_snapshot(discounts)
+        with self._lock:
+            self._discounts = discounts
+            self._discounts_at = time.monotonic() if now is None else now
+            self._update_state()
+
+    def update_rates(
+        self, base_currency: str, rates_info: dict, now: Optional[float] = None
+    ):
+        """
+        Replace the exchange rates of a base currency with a `get_exchange_rate_info` response. Error responses are
+        ignored.
+
+        Args:
+            base_currency (str): The base currency of the rates.
+            rates_info (dict): The response, with `rates`.
+            now (Optional[float], optional): The time of the fetch (`time.monotonic()`). Defaults to None (now).
+        """
+        rates = rates_info.get("rates")
+        if rates_info.get("status") != "ok" or rates is None:
+            logger.warning(
+                f"ParityVend API exchange rates ({base_currency}) were not updated: {rates_info!r}"
+            )
+            return
+
+        if not isinstance(rates, ExchangeRates):
+            rates = ExchangeRates(rates)
+
+        with self._lock:
+            self._rates[base_currency] = rates
+            self._rates_at[base_currency] = time.monotonic() if now is None else now
+            self._update_state()
+
+    def start(self, refresh: Union[Callable[[], None], weakref.WeakMethod]):
+        """
+        Start refreshing the tables in a daemon thread, right away and then every `refresh_interval` seconds.
+
+        Args:
+            refresh (Union[Callable[[], None], weakref.WeakMethod]): A function fetching the tables and passing them to
+                `update_discounts` and `update_rates`. With a `weakref.WeakMethod`, the thread does not keep the
+                object of the method alive, and stops once it is garbage-collected.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_forever,
+            args=(refresh,),
+            name="parityvend-composer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the refresh thread.
+        """
+        self._stop.set()
+
+    async def refresh_forever_async(self, refresh: Callable[[], Awaitable[None]]):
+        """
+        Refresh the tables forever from an event loop. Run it as a task and cancel the task to stop.
+
+        Args:
+            refresh (Callable[[], Awaitable[None]]): A coroutine function fetching the tables and passing them to
+                `update_discounts` and `update_rates`.
+        """
+        import asyncio
+
+        while True:
+            try:
+                await refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    f"ParityVend API discount tables refresh failed: {exc!r}"
+                )
+            await asyncio.sleep(self.refresh_interval)
+
+    def _refresh_forever(
+        self, refresh: Union[Callable[[], None], weakref.WeakMethod]
+    ):
+        while not self._stop.is_set():
+            refresh_once = (
+                refresh() if isinstance(refresh, weakref.WeakMethod) else refresh
+            )
+            if refresh_once is None:
+                # the client was garbage-collected
+                return
+            try:
+                refresh_once()
+            except Exception as exc:
+                logger.warning(
+                    f"ParityVend API discount tables refresh failed: {exc!r}"
+                )
+            # do not keep the client alive while waiting
+            refresh_once = None
+            self._stop.wait(self.refresh_interval)
+
+    def _update_state(self):
+        stale_at = {}
+        if self._discounts is not None:
+            for base_currency, rates_at in self._rates_at.items():
+                loaded_at = min(self._discounts_at, rates_at)
+                stale_at[base_currency] = loaded_at + self.max_age
+        self._state = (stale_at, {})
+
+    def _build(
+        self, country: Country, base_currency: str
+    ) -> Optional[FrozenResponse]:
+        if country.code == "XX":
+            return FrozenResponse(NO_DISCOUNT)
+
+        if country.currency_code is None:
+            return None
+        try:
+            # a rate that is missing or not a positive number (e.g., null) leaves the lookup to the API
+            rates = self._rates[base_currency]
+            conversion_rate = rates._get_rate(country.currency_code)
+        except KeyError:
+            return None
+
+        discount = self._discounts.discounts_by_id[country.id] or Discount(country)
+        return FrozenResponse(
+            {
+                "status": "ok",
+                "discount": discount.discount,
+                "discount_str": discount.discount_str,
+                "coupon_code": discount.coupon_code,
+                "country": country,
+                "currency": {
+                    "code": country.currency_code,
+                    "symbol": country.currency_symbol,
+                    "localized_symbol": country.currency_localized,
+                    "conversion_rate": conversion_rate,
+                },
+            }
+        )
+
+
+class BaseCurrencyDeriver:
+    """
+    A class that derives `get_discount_from_ip` responses in other base currencies from the one in `source_currency`.
+
+    Only the exchange rate in a discount response depends on the base currency. With a deriver, the handler requests
+    (and caches) every IP address in `source_currency` only, and converts the exchange rate of a lookup in another
+    base currency with a `get_exchange_rate_info` table of `source_currency`, fetched once and used for `max_age`
+    seconds. While the table is stale (until it is fetched again, or for `retry_interval` seconds after a failed
+    fetch), lookups in other base currencies use the API as usual.
+
+    Args:
+        source_currency (str, optional): The base currency requested from the API. Defaults to "USD".
+        max_age (float, optional): How long (in seconds) an exchange rate table is used. Defaults to 3600.
+        retry_interval (float, optional): How long (in seconds) to wait before fetching the table again after a
+            failed fetch (e.g., on a free plan, where exchange rates are not available). Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        source_currency: str = "USD",
+        max_age: float = 3600,
+        retry_interval: float = 60,
+    ):
+        self.source_currency: str = source_currency.upper()
+        self.max_age: float = max_age
+        self.retry_interval: float = retry_interval
+
+        self._lock = threading.Lock()
+        self._rates: Optional[ExchangeRates] = None
+        self._stale_at: float = 0.0
+        self._refresh_claimed_until: float = 0.0
+        # (country id, base currency) -> (the source values, the derived response), for the current table
+        self._derived: dict = {}
+
+    def __repr__(self) -> str:
+        return f"BaseCurrencyDeriver(source_currency={self.source_currency!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the exchange rate table is missing or too old to be used.
+
+        Returns:
+            bool: True if lookups in other base currencies have to use the API.
+        """
+        return time.monotonic() >= self._stale_at
+
+    def claim_refresh(self) -> bool:
+        """
+        Claim the fetch of a new exchange rate table, so that only one caller fetches it at a time.
+
+        Returns:
+            bool: True if the caller should fetch the table and pass it to `update_rates`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._refresh_claimed_until:
+                return False
+            self._refresh_claimed_until = now + self.retry_interval
+            return True
+
+    def update_rates(self, rates_info: dict, now: Optional[float] = None):
+        """
+        Replace the exchange rate table with a `get_exchange_rate_info` response for `source_currency`. Error
+        responses are ignored.
+
+        Args:
+            rates_info (dict): The response, with `rates`.
+            now (Optional[float], optional): The time of the fetch (`time.monotonic()`). Defaults to None (now).
+        """
+        rates = rates_info.get("rates")
+        if rates_info.get("status") != "ok" or rates is None:
+            logger.warning(
+                f"ParityVend API exchange rates ({self.source_currency}) were not updated: {rates_info!r}"
+            )
+            return
+
+        if not isinstance(rates, ExchangeRates):
+            rates = ExchangeRates(rates)
+
+        with self._lock:
+            self._rates = rates
+            self._stale_at = (time.monotonic() if now is None else now) + self.max_age
+            self._refresh_claimed_until = 0.0
+            self._derived = {}
+
+    def derive(
+        self, response: FrozenResponse, base_currency: str
+    ) -> Optional[FrozenResponse]:
+        """
+        Derive the response in `base_currency` from a `get_discount_from_ip` response in `source_currency`.
+
+        Args:
+            response (FrozenResponse): The response in `source_currency`.
+            base_currency (str): The base currency of the derived response.
+
+        Returns:
+            Optional[FrozenResponse]: The derived response, or None if the exchange rate table is stale or has no
+                usable rate for `base_currency` or the currency of the response. Responses without an exchange rate (errors and unknown countries) are returned as
+                they are.
+        """
+        currency = response.get("currency") if response else None
+        if not currency or response.get("status") != "ok":
+            return response
+
+        derived, rates = self._derived, self._rates
+        if rates is None or self.is_stale():
+            return None
+
+        values = (
+            response["discount"],
+            response["coupon_code"],
+            currency["conversion_rate"],
+        )
+        key = (response["country"].id, base_currency)
+        cached = derived.get(key)
+        if cached is not None and cached[0] == values:
+            return cached[1]
+
+        currency_code = currency.get("code")
+        if currency_code is None:
+            return None
+        try:
+            # both rates come from the table, so a rate that is missing or not a positive number (e.g., null) leaves
+            # the lookup to the API
+            conversion_rate = rates._get_rate(currency_code) / rates._get_rate(
+                base_currency
+            )
+        except KeyError:
+            return None
+
+        result = FrozenResponse(
+            {
+                **response,
+                "currency": {**currency, "conversion_rate": conversion_rate},
+            }
+        )
+        derived[key] = (values, result)
+        return result
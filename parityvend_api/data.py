@@ -1,275 +1,1589 @@
 from typing import Dict, Tuple
 
-COUNTRIES_META: Dict[
-    str,
-    Tuple[str, str, str, str, str],
-] = {
-    "AC": ("Ascension Island", "🇦🇨", "SHP", "£", "SHP£"),
-    "AD": ("Andorra", "🇦🇩", "EUR", "€", "€"),
-    "AE": ("United Arab Emirates", "🇦🇪", "AED", "د.إ", "د.إ"),
-    "AF": ("Afghanistan", "🇦🇫", "AFN", "؋", "AFN"),
-    "AG": ("Antigua and Barbuda", "🇦🇬", "XCD", "$", "XCD$"),
-    "AI": ("Anguilla", "🇦🇮", "XCD", "$", "XCD$"),
-    "AL": ("Albania", "🇦🇱", "ALL", "L", "ALL"),
-    "AM": ("Armenia", "🇦🇲", "AMD", "֏", "AMD"),
-    "AN": ("Netherlands Antilles", "🇦🇳", "ANG", "ƒ", "ANGƒ"),
-    "AO": ("Angola", "🇦🇴", "AOA", "Kz", "AOA"),
-    "AQ": ("Antarctica", "🇦🇶", "USD", "$", "USD$"),
-    "AR": ("Argentina", "🇦🇷", "ARS", "$", "ARS$"),
-    "AS": ("American Samoa", "🇦🇸", "USD", "$", "USD$"),
-    "AT": ("Austria", "🇦🇹", "EUR", "€", "€"),
-    "AU": ("Australia", "🇦🇺", "AUD", "$", "AUD$"),
-    "AW": ("Aruba", "🇦🇼", "AWG", "ƒ", "AWGƒ"),
-    "AX": ("Åland Islands", "🇦🇽", "EUR", "€", "€"),
-    "AZ": ("Azerbaijan", "🇦🇿", "AZN", "₼", "AZN₼"),
-    "BA": ("Bosnia and Herzegovina", "🇧🇦", "BAM", "KM", "BAM"),
-    "BB": ("Barbados", "🇧🇧", "BBD", "$", "BBD$"),
-    "BD": ("Bangladesh", "🇧🇩", "BDT", "৳", "BDT৳"),
-    "BE": ("Belgium", "🇧🇪", "EUR", "€", "€"),
-    "BF": ("Burkina Faso", "🇧🇫", "XOF", "CFA", "XOFCFA"),
-    "BG": ("Bulgaria", "🇧🇬", "BGN", "лв", "BGNлв"),
-    "BH": ("Bahrain", "🇧🇭", "BHD", ".د.ب", "BHD.د.ب"),
-    "BI": ("Burundi", "🇧🇮", "BIF", "FBu", "BIF"),
-    "BJ": ("Benin", "🇧🇯", "XOF", "CFA", "XOFCFA"),
-    "BL": ("Saint Barthélemy", "🇧🇱", "EUR", "€", "€"),
-    "BM": ("Bermuda", "🇧🇲", "BMD", "$", "BMD$"),
-    "BN": ("Brunei Darussalam", "🇧🇳", "BND", "$", "BND$"),
-    "BO": ("Bolivia", "🇧🇴", "BOB", "Bs.", "BOB"),
-    "BQ": ("Bonaire, Sint Eustatius and Saba", "🇧🇶", "EUR", "€", "€"),
-    "BR": ("Brazil", "🇧🇷", "BRL", "R$", "BRLR$"),
-    "BS": ("Bahamas", "🇧🇸", "BSD", "$", "BSD$"),
-    "BT": ("Bhutan", "🇧🇹", "BTN", "Nu.", "BTN"),
-    "BV": ("Bouvet Island", "🇧🇻", "NOK", "kr", "NOKkr"),
-    "BW": ("Botswana", "🇧🇼", "BWP", "P", "BWPP"),
-    "BY": ("Belarus", "🇧🇾", "BYN", "Br", "BYNBr"),
-    "BZ": ("Belize", "🇧🇿", "BZD", "$", "BZD$"),
-    "CA": ("Canada", "🇨🇦", "CAD", "$", "CAD$"),
-    "CC": ("Cocos (Keeling) Islands", "🇨🇨", "AUD", "$", "AUD$"),
-    "CD": ("Democratic Republic of the Congo", "🇨🇩", "CDF", "FC", "CDF"),
-    "CF": ("Central African Republic", "🇨🇫", "XAF", "₣", "XAF₣"),
-    "CG": ("Republic of the Congo", "🇨🇬", "XAF", "₣", "XAF₣"),
-    "CH": ("Switzerland", "🇨🇭", "CHF", "CHF", "CHF"),
-    "CI": ("Côte d'Ivoire", "🇨🇮", "XOF", "CFA", "XOFCFA"),
-    "CK": ("Cook Islands", "🇨🇰", "NZD", "$", "NZD$"),
-    "CL": ("Chile", "🇨🇱", "CLP", "$", "CLP$"),
-    "CM": ("Cameroon", "🇨🇲", "XAF", "₣", "XAF₣"),
-    "CN": ("China", "🇨🇳", "CNY", "¥", "CNY¥"),
-    "CO": ("Colombia", "🇨🇴", "COP", "$", "COP$"),
-    "CR": ("Costa Rica", "🇨🇷", "CRC", "₡", "CRC₡"),
-    "CS": ("Serbia and Montenegro", "🇷🇸", "RSD", "дин.", "RSDдин."),
-    "CU": ("Cuba", "🇨🇺", "CUP", "$", "CUP$"),
-    "CV": ("Cabo Verde", "🇨🇻", "CVE", "$", "CVE$"),
-    "CW": ("Curaçao", "🇨🇼", "ANG", "ƒ", "ANGƒ"),
-    "CX": ("Christmas Island", "🇨🇽", "AUD", "$", "AUD$"),
-    "CY": ("Cyprus", "🇨🇾", "EUR", "€", "€"),
-    "CZ": ("Czech Republic", "🇨🇿", "CZK", "Kč", "CZKKč"),
-    "DE": ("Germany", "🇩🇪", "EUR", "€", "€"),
-    "DJ": ("Djibouti", "🇩🇯", "DJF", "Fdj", "DJFFdj"),
-    "DK": ("Denmark", "🇩🇰", "DKK", "kr", "DKKkr"),
-    "DM": ("Dominica", "🇩🇲", "XCD", "$", "XCD$"),
-    "DO": ("Dominican Republic", "🇩🇴", "DOP", "$", "DOP$"),
-    "DZ": ("Algeria", "🇩🇿", "DZD", "د.ج", "DZDد.ج"),
-    "EC": ("Ecuador", "🇪🇨", "USD", "$", "USD$"),
-    "EE": ("Estonia", "🇪🇪", "EUR", "€", "€"),
-    "EG": ("Egypt", "🇪🇬", "EGP", "£", "EGP£"),
-    "EH": ("Western Sahara", "🇪🇭", "MAD", "د.م.", "MADد.م."),
-    "ER": ("Eritrea", "🇪🇷", "ERN", "Nfk", "ERN"),
-    "ES": ("Spain", "🇪🇸", "EUR", "€", "€"),
-    "ET": ("Ethiopia", "🇪🇹", "ETB", "Br", "ETBBr"),
-    "FI": ("Finland", "🇫🇮", "EUR", "€", "€"),
-    "FJ": ("Fiji", "🇫🇯", "FJD", "$", "FJD$"),
-    "FK": ("Falkland Islands (Malvinas)", "🇫🇰", "FKP", "£", "FKP£"),
-    "FM": ("Federated States of Micronesia", "🇫🇲", "USD", "$", "USD$"),
-    "FO": ("Faroe Islands", "🇫🇴", "DKK", "kr", "DKKkr"),
-    "FR": ("France", "🇫🇷", "EUR", "€", "€"),
-    "GA": ("Gabon", "🇬🇦", "XAF", "₣", "XAF₣"),
-    "GB": ("United Kingdom", "🇬🇧", "GBP", "£", "GBP£"),
-    "GD": ("Grenada", "🇬🇩", "XCD", "$", "XCD$"),
-    "GE": ("Georgia", "🇬🇪", "GEL", "₾", "GEL₾"),
-    "GF": ("French Guiana", "🇬🇫", "EUR", "€", "€"),
-    "GG": ("Guernsey", "🇬🇬", "GBP", "£", "GBP£"),
-    "GH": ("Ghana", "🇬🇭", "GHS", "₵", "GHS₵"),
-    "GI": ("Gibraltar", "🇬🇮", "GIP", "£", "GIP£"),
-    "GL": ("Greenland", "🇬🇱", "DKK", "kr", "DKKkr"),
-    "GM": ("Gambia", "🇬🇲", "GMD", "D", "GMDD"),
-    "GN": ("Guinea", "🇬🇳", "GNF", "FG", "GNFFG"),
-    "GP": ("Guadeloupe", "🇬🇵", "EUR", "€", "€"),
-    "GQ": ("Equatorial Guinea", "🇬🇶", "XAF", "₣", "XAF₣"),
-    "GR": ("Greece", "🇬🇷", "EUR", "€", "€"),
-    "GS": (
-        "South Georgia and the South Sandwich Islands",
-        "🇬🇸",
-        "GBP",
-        "£",
-        "GBP£",
-    ),
-    "GT": ("Guatemala", "🇬🇹", "GTQ", "Q", "GTQQ"),
-    "GU": ("Guam", "🇬🇺", "USD", "$", "USD$"),
-    "GW": ("Guinea-Bissau", "🇬🇼", "XOF", "CFA", "XOFCFA"),
-    "GY": ("Guyana", "🇬🇾", "GYD", "$", "GYD$"),
-    "HK": ("Hong Kong", "🇭🇰", "HKD", "$", "HKD$"),
-    "HM": ("Heard Island and McDonald Islands", "🇭🇲", "AUD", "$", "AUD$"),
-    "HN": ("Honduras", "🇭🇳", "HNL", "L", "HNLL"),
-    "HR": ("Croatia", "🇭🇷", "HRK", "kn", "HRKkn"),
-    "HT": ("Haiti", "🇭🇹", "HTG", "G", "HTGG"),
-    "HU": ("Hungary", "🇭🇺", "HUF", "Ft", "HUF"),
-    "IC": ("Canary Islands", "🇮🇨", "EUR", "€", "€"),
-    "ID": ("Indonesia", "🇮🇩", "IDR", "Rp", "IDRRp"),
-    "IE": ("Ireland", "🇮🇪", "EUR", "€", "€"),
-    "IL": ("Israel", "🇮🇱", "ILS", "₪", "ILS₪"),
-    "IM": ("Isle of Man", "🇮🇲", "GBP", "£", "GBP£"),
-    "IN": ("India", "🇮🇳", "INR", "₹", "INR₹"),
-    "IO": ("British Indian Ocean Territory", "🇮🇴", "USD", "$", "USD$"),
-    "IQ": ("Iraq", "🇮🇶", "IQD", "ع.د", "IQDع.د"),
-    "IR": ("Iran", "🇮🇷", "IRR", "﷼", "IRR﷼"),
-    "IS": ("Iceland", "🇮🇸", "ISK", "kr", "ISKkr"),
-    "IT": ("Italy", "🇮🇹", "EUR", "€", "€"),
-    "JE": ("Jersey", "🇯🇪", "GBP", "£", "GBP£"),
-    "JM": ("Jamaica", "🇯🇲", "JMD", "$", "JMD$"),
-    "JO": ("Jordan", "🇯🇴", "JOD", "د.ا", "JODد.ا"),
-    "JP": ("Japan", "🇯🇵", "JPY", "¥", "JPY¥"),
-    "KE": ("Kenya", "🇰🇪", "KES", "KSh", "KESKSh"),
-    "KG": ("Kyrgyzstan", "🇰🇬", "KGS", "с", "KGSс"),
-    "KH": ("Cambodia", "🇰🇭", "KHR", "៛", "KHR៛"),
-    "KI": ("Kiribati", "🇰🇮", "AUD", "$", "AUD$"),
-    "KM": ("Comoros", "🇰🇲", "KMF", "CF", "KMFCF"),
-    "KN": ("Saint Kitts and Nevis", "🇰🇳", "XCD", "$", "XCD$"),
-    "KP": ("North Korea", "🇰🇵", "KPW", "₩", "KPW₩"),
-    "KR": ("South Korea", "🇰🇷", "KRW", "₩", "KRW₩"),
-    "KW": ("Kuwait", "🇰🇼", "KWD", "د.ك", "KWDد.ك"),
-    "KY": ("Cayman Islands", "🇰🇾", "KYD", "$", "KYD$"),
-    "KZ": ("Kazakhstan", "🇰🇿", "KZT", "₸", "KZT₸"),
-    "LA": ("Laos", "🇱🇦", "LAK", "₭", "LAK₭"),
-    "LB": ("Lebanon", "🇱🇧", "LBP", "ل.ل", "LBPl.ل"),
-    "LC": ("Saint Lucia", "🇱🇨", "XCD", "$", "XCD$"),
-    "LI": ("Liechtenstein", "🇱🇮", "CHF", "CHF", "CHF"),
-    "LK": ("Sri Lanka", "🇱🇰", "LKR", "රු", "LKRRs"),
-    "LR": ("Liberia", "🇱🇷", "LRD", "$", "LRD$"),
-    "LS": ("Lesotho", "🇱🇸", "LSL", "L", "LSLL"),
-    "LT": ("Lithuania", "🇱🇹", "EUR", "€", "€"),
-    "LU": ("Luxembourg", "🇱🇺", "EUR", "€", "€"),
-    "LV": ("Latvia", "🇱🇻", "EUR", "€", "€"),
-    "LY": ("Libya", "🇱🇾", "LYD", "ل.د", "LYDل.د"),
-    "MA": ("Morocco", "🇲🇦", "MAD", "د.م.", "MADد.م."),
-    "MC": ("Monaco", "🇲🇨", "EUR", "€", "€"),
-    "MD": ("Moldova", "🇲🇩", "MDL", "L", "MDLL"),
-    "ME": ("Montenegro", "🇲🇪", "EUR", "€", "€"),
-    "MF": ("Saint Martin (French part)", "🇲🇫", "EUR", "€", "€"),
-    "MG": ("Madagascar", "🇲🇬", "MGA", "Ar", "MGAAr"),
-    "MH": ("Marshall Islands", "🇲🇭", "USD", "$", "USD$"),
-    "MK": ("North Macedonia", "🇲🇰", "MKD", "ден", "MKDден"),
-    "ML": ("Mali", "🇲🇱", "XOF", "CFA", "XOFCFA"),
-    "MM": ("Myanmar", "🇲🇲", "MMK", "K", "MMKK"),
-    "MN": ("Mongolia", "🇲🇳", "MNT", "₮", "MNT₮"),
-    "MO": ("Macao", "🇲🇴", "MOP", "MOP$", "MOPMOP$"),
-    "MP": ("Northern Mariana Islands", "🇲🇵", "USD", "$", "USD$"),
-    "MQ": ("Martinique", "🇲🇶", "EUR", "€", "€"),
-    "MR": ("Mauritania", "🇲🇷", "MRU", "UM", "MRUUM"),
-    "MS": ("Montserrat", "🇲🇸", "XCD", "$", "XCD$"),
-    "MT": ("Malta", "🇲🇹", "EUR", "€", "€"),
-    "MU": ("Mauritius", "🇲🇺", "MUR", "₨", "MUR₨"),
-    "MV": ("Maldives", "🇲🇻", "MVR", "ރ.", "MVRރ."),
-    "MW": ("Malawi", "🇲🇼", "MWK", "MK", "MWKMK"),
-    "MX": ("Mexico", "🇲🇽", "MXN", "$", "MXN$"),
-    "MY": ("Malaysia", "🇲🇾", "MYR", "RM", "MYRRM"),
-    "MZ": ("Mozambique", "🇲🇿", "MZN", "MT", "MZNMt"),
-    "NA": ("Namibia", "🇳🇦", "NAD", "$", "NAD$"),
-    "NC": ("New Caledonia", "🇳🇨", "XPF", "₣", "XPF₣"),
-    "NE": ("Niger", "🇳🇪", "XOF", "CFA", "XOFCFA"),
-    "NF": ("Norfolk Island", "🇳🇫", "AUD", "$", "AUD$"),
-    "NG": ("Nigeria", "🇳🇬", "NGN", "₦", "NGN₦"),
-    "NI": ("Nicaragua", "🇳🇮", "NIO", "C$", "NIOC$"),
-    "NL": ("Netherlands", "🇳🇱", "EUR", "€", "€"),
-    "NO": ("Norway", "🇳🇴", "NOK", "kr", "NOKkr"),
-    "NP": ("Nepal", "🇳🇵", "NPR", "₨", "NPR₨"),
-    "NR": ("Nauru", "🇳🇷", "AUD", "$", "AUD$"),
-    "NU": ("Niue", "🇳🇺", "NZD", "$", "NZD$"),
-    "NZ": ("New Zealand", "🇳🇿", "NZD", "$", "NZD$"),
-    "OM": ("Oman", "🇴🇲", "OMR", "ر.ع.", "OMRر.ع."),
-    "PA": ("Panama", "🇵🇦", "PAB", "B/.", "PABB/."),
-    "PE": ("Peru", "🇵🇪", "PEN", "S/.", "PENS/."),
-    "PF": ("French Polynesia", "🇵🇫", "XPF", "₣", "XPF₣"),
-    "PG": ("Papua New Guinea", "🇵🇬", "PGK", "K", "PGKK"),
-    "PH": ("Philippines", "🇵🇭", "PHP", "₱", "PHP₱"),
-    "PK": ("Pakistan", "🇵🇰", "PKR", "₨", "PKR₨"),
-    "PL": ("Poland", "🇵🇱", "PLN", "zł", "PLNzł"),
-    "PM": ("Saint Pierre and Miquelon", "🇵🇲", "EUR", "€", "€"),
-    "PN": ("Pitcairn", "🇵🇳", "NZD", "$", "NZD$"),
-    "PR": ("Puerto Rico", "🇵🇷", "USD", "$", "USD$"),
-    "PS": ("Palestine", "🇵🇸", "ILS", "₪", "ILS₪"),
-    "PT": ("Portugal", "🇵🇹", "EUR", "€", "€"),
-    "PW": ("Palau", "🇵🇼", "USD", "$", "USD$"),
-    "PY": ("Paraguay", "🇵🇾", "PYG", "₲", "PYG₲"),
-    "QA": ("Qatar", "🇶🇦", "QAR", "ر.ق", "QARر.ق"),
-    "RE": ("Réunion", "🇷🇪", "EUR", "€", "€"),
-    "RO": ("Romania", "🇷🇴", "RON", "lei", "RONlei"),
-    "RS": ("Serbia", "🇷🇸", "RSD", "дин.", "RSDдин."),
-    "RU": ("Russia", "🇷🇺", "RUB", "₽", "RUB₽"),
-    "RW": ("Rwanda", "🇷🇼", "RWF", "FRw", "RWFFRw"),
-    "SA": ("Saudi Arabia", "🇸🇦", "SAR", "ر.س", "SARر.س"),
-    "SB": ("Solomon Islands", "🇸🇧", "SBD", "$", "SBD$"),
-    "SC": ("Seychelles", "🇸🇨", "SCR", "₨", "SCR₨"),
-    "SD": ("Sudan", "🇸🇩", "SDG", "ج.س.", "SDGج.س."),
-    "SE": ("Sweden", "🇸🇪", "SEK", "kr", "SEKkr"),
-    "SG": ("Singapore", "🇸🇬", "SGD", "$", "SGD$"),
-    "SH": (
-        "Saint Helena, Ascension and Tristan da Cunha",
-        "🇸🇭",
-        "SHP",
-        "£",
-        "SHP£",
-    ),
-    "SI": ("Slovenia", "🇸🇮", "EUR", "€", "€"),
-    "SJ": ("Svalbard and Jan Mayen", "🇸🇯", "NOK", "kr", "NOKkr"),
-    "SK": ("Slovakia", "🇸🇰", "EUR", "€", "€"),
-    "SL": ("Sierra Leone", "🇸🇱", "SLL", "Le", "SLLLe"),
-    "SM": ("San Marino", "🇸🇲", "EUR", "€", "€"),
-    "SN": ("Senegal", "🇸🇳", "XOF", "CFA", "XOFCFA"),
-    "SO": ("Somalia", "🇸🇴", "SOS", "S", "SOSS"),
-    "SR": ("Suriname", "🇸🇷", "SRD", "$", "SRD$"),
-    "SS": ("South Sudan", "🇸🇸", "SSP", "£", "SSP£"),
-    "ST": ("Sao Tome and Principe", "🇸🇹", "STN", "Db", "STNDb"),
-    "SV": ("El Salvador", "🇸🇻", "USD", "$", "USD$"),
-    "SX": ("Sint Maarten (Dutch part)", "🇸🇽", "ANG", "ƒ", "ANGƒ"),
-    "SY": ("Syria", "🇸🇾", "SYP", "ل.س", "SYPl.س"),
-    "SZ": ("Eswatini", "🇸🇿", "SZL", "L", "SZLL"),
-    "TA": ("Tristan da Cunha", "🇹🇦", "SHP", "£", "SHP£"),
-    "TC": ("Turks and Caicos Islands", "🇹🇨", "USD", "$", "USD$"),
-    "TD": ("Chad", "🇹🇩", "XAF", "₣", "XAF₣"),
-    "TF": ("French Southern Territories", "🇹🇫", "EUR", "€", "€"),
-    "TG": ("Togo", "🇹🇬", "XOF", "CFA", "XOFCFA"),
-    "TH": ("Thailand", "🇹🇭", "THB", "฿", "THB฿"),
-    "TJ": ("Tajikistan", "🇹🇯", "TJS", "ЅМ", "TJSЅМ"),
-    "TK": ("Tokelau", "🇹🇰", "NZD", "$", "NZD$"),
-    "TL": ("Timor-Leste", "🇹🇱", "USD", "$", "USD$"),
-    "TM": ("Turkmenistan", "🇹🇲", "TMT", "m", "TMTm"),
-    "TN": ("Tunisia", "🇹🇳", "TND", "د.ت", "TNDد.ت"),
-    "TO": ("Tonga", "🇹🇴", "TOP", "T$", "TOPT$"),
-    "TR": ("Turkey", "🇹🇷", "TRY", "₺", "TRY₺"),
-    "TT": ("Trinidad and Tobago", "🇹🇹", "TTD", "TT$", "TTD$"),
-    "TV": ("Tuvalu", "🇹🇻", "AUD", "$", "AUD$"),
-    "TW": ("Taiwan", "🇹🇼", "TWD", "NT$", "TWDNT$"),
-    "TZ": ("Tanzania", "🇹🇿", "TZS", "TSh", "TZSTSh"),
-    "UA": ("Ukraine", "🇺🇦", "UAH", "₴", "UAH₴"),
-    "UG": ("Uganda", "🇺🇬", "UGX", "USh", "UGXUSh"),
-    "UM": ("United States Minor Outlying Islands", "🇺🇲", "USD", "$", "USD$"),
-    "US": ("United States of America", "🇺🇸", "USD", "$", "USD$"),
-    "UY": ("Uruguay", "🇺🇾", "UYU", "$", "UYU$"),
-    "UZ": ("Uzbekistan", "🇺🇿", "UZS", "с", "UZSс"),
-    "VA": ("Vatican City", "🇻🇦", "EUR", "€", "€"),
-    "VC": ("Saint Vincent and the Grenadines", "🇻🇨", "XCD", "$", "XCD$"),
-    "VE": ("Venezuela", "🇻🇪", "VES", "Bs.", "VESBs."),
-    "VG": ("British Virgin Islands", "🇻🇬", "USD", "$", "USD$"),
-    "VI": ("U.S. Virgin Islands", "🇻🇮", "USD", "$", "USD$"),
-    "VN": ("Vietnam", "🇻🇳", "VND", "₫", "VND₫"),
-    "VU": ("Vanuatu", "🇻🇺", "VUV", "VT", "VUVVT"),
-    "WF": ("Wallis and Futuna", "🇼🇫", "XPF", "₣", "XPF₣"),
-    "WS": ("Samoa", "🇼🇸", "WST", "T", "WSTT"),
-    "XK": ("Kosovo", "🇽🇰", "ALL", "L", "ALL"),
-    "YE": ("Yemen", "🇾🇪", "YER", "﷼", "YER﷼"),
-    "YT": ("Mayotte", "🇾🇹", "EUR", "€", "€"),
-    "ZA": ("South Africa", "🇿🇦", "ZAR", "R", "ZARR"),
-    "ZM": ("Zambia", "🇿🇲", "ZMW", "ZK", "ZMWZK"),
-    "ZW": ("Zimbabwe", "🇿🇼", "ZWL", "$", "ZWL$"),
-    "XX": ("Unknown", "", "", "", ""),
+# The countries known to the ParityVend API, as parallel tuples indexed by the country id. Ids are stable: new
+# countries are only ever added at the end.
+COUNTRY_CODES: Tuple[str, ...] = (
+    "AC",
+    "AD",
+    "AE",
+    "AF",
+    "AG",
+    "AI",
+    "AL",
+    "AM",
+    "AN",
+    "AO",
+    "AQ",
+    "AR",
+    "AS",
+    "AT",
+    "AU",
+    "AW",
+    "AX",
+    "AZ",
+    "BA",
+    "BB",
+    "BD",
+    "BE",
+    "BF",
+    "BG",
+    "BH",
+    "BI",
+    "BJ",
+    "BL",
+    "BM",
+    "BN",
+    "BO",
+    "BQ",
+    "BR",
+    "BS",
+    "BT",
+    "BV",
+    "BW",
+    "BY",
+    "BZ",
+    "CA",
+    "CC",
+    "CD",
+    "CF",
+    "CG",
+    "CH",
+    "CI",
+    "CK",
+    "CL",
+    "CM",
+    "CN",
+    "CO",
+    "CR",
+    "CS",
+    "CU",
+    "CV",
+    "CW",
+    "CX",
+    "CY",
+    "CZ",
+    "DE",
+    "DJ",
+    "DK",
+    "DM",
+    "DO",
+    "DZ",
+    "EC",
+    "EE",
+    "EG",
+    "EH",
+    "ER",
+    "ES",
+    "ET",
+    "FI",
+    "FJ",
+    "FK",
+    "FM",
+    "FO",
+    "FR",
+    "GA",
+    "GB",
+    "GD",
+    "GE",
+    "GF",
+    "GG",
+    "GH",
+    "GI",
+    "GL",
+    "GM",
+    "GN",
+    "GP",
+    "GQ",
+    "GR",
+    "GS",
+    "GT",
+    "GU",
+    "GW",
+    "GY",
+    "HK",
+    "HM",
+    "HN",
+    "HR",
+    "HT",
+    "HU",
+    "IC",
+    "ID",
+    "IE",
+    "IL",
+    "IM",
+    "IN",
+    "IO",
+    "IQ",
+    "IR",
+    "IS",
+    "IT",
+    "JE",
+    "JM",
+    "JO",
+    "JP",
+    "KE",
+    "KG",
+    "KH",
+    "KI",
+    "KM",
+    "KN",
+    "KP",
+    "KR",
+    "KW",
+    "KY",
+    "KZ",
+    "LA",
+    "LB",
+    "LC",
+    "LI",
+    "LK",
+    "LR",
+    "LS",
+    "LT",
+    "LU",
+    "LV",
+    "LY",
+    "MA",
+    "MC",
+    "MD",
+    "ME",
+    "MF",
+    "MG",
+    "MH",
+    "MK",
+    "ML",
+    "MM",
+    "MN",
+    "MO",
+    "MP",
+    "MQ",
+    "MR",
+    "MS",
+    "MT",
+    "MU",
+    "MV",
+    "MW",
+    "MX",
+    "MY",
+    "MZ",
+    "NA",
+    "NC",
+    "NE",
+    "NF",
+    "NG",
+    "NI",
+    "NL",
+    "NO",
+    "NP",
+    "NR",
+    "NU",
+    "NZ",
+    "OM",
+    "PA",
+    "PE",
+    "PF",
+    "PG",
+    "PH",
+    "PK",
+    "PL",
+    "PM",
+    "PN",
+    "PR",
+    "PS",
+    "PT",
+    "PW",
+    "PY",
+    "QA",
+    "RE",
+    "RO",
+    "RS",
+    "RU",
+    "RW",
+    "SA",
+    "SB",
+    "SC",
+    "SD",
+    "SE",
+    "SG",
+    "SH",
+    "SI",
+    "SJ",
+    "SK",
+    "SL",
+    "SM",
+    "SN",
+    "SO",
+    "SR",
+    "SS",
+    "ST",
+    "SV",
+    "SX",
+    "SY",
+    "SZ",
+    "TA",
+    "TC",
+    "TD",
+    "TF",
+    "TG",
+    "TH",
+    "TJ",
+    "TK",
+    "TL",
+    "TM",
+    "TN",
+    "TO",
+    "TR",
+    "TT",
+    "TV",
+    "TW",
+    "TZ",
+    "UA",
+    "UG",
+    "UM",
+    "US",
+    "UY",
+    "UZ",
+    "VA",
+    "VC",
+    "VE",
+    "VG",
+    "VI",
+    "VN",
+    "VU",
+    "WF",
+    "WS",
+    "XK",
+    "YE",
+    "YT",
+    "ZA",
+    "ZM",
+    "ZW",
+    "XX",
+)
+
+COUNTRY_NAMES: Tuple[str, ...] = (
+    "Ascension Island",
+    "Andorra",
+    "United Arab Emirates",
+    "Afghanistan",
+    "Antigua and Barbuda",
+    "Anguilla",
+    "Albania",
+    "Armenia",
+    "Netherlands Antilles",
+    "Angola",
+    "Antarctica",
+    "Argentina",
+    "American Samoa",
+    "Austria",
+    "Australia",
+    "Aruba",
+    "Åland Islands",
+    "Azerbaijan",
+    "Bosnia and Herzegovina",
+    "Barbados",
+    "Bangladesh",
+    "Belgium",
+    "Burkina Faso",
+    "Bulgaria",
+    "Bahrain",
+    "Burundi",
+    "Benin",
+    "Saint Barthélemy",
+    "Bermuda",
+    "Brunei Darussalam",
+    "Bolivia",
+    "Bonaire, Sint Eustatius and Saba",
+    "Brazil",
+    "Bahamas",
+    "Bhutan",
+    "Bouvet Island",
+    "Botswana",
+    "Belarus",
+    "Belize",
+    "Canada",
+    "Cocos (Keeling) Islands",
+    "Democratic Republic of the Congo",
+    "Central African Republic",
+    "Republic of the Congo",
+    "Switzerland",
+    "Côte d'Ivoire",
+    "Cook Islands",
+    "Chile",
+    "Cameroon",
+    "China",
+    "Colombia",
+    "Costa Rica",
+    "Serbia and Montenegro",
+    "Cuba",
+    "Cabo Verde",
+    "Curaçao",
+    "Christmas Island",
+    "Cyprus",
+    "Czech Republic",
+    "Germany",
+    "Djibouti",
+    "Denmark",
+    "Dominica",
+    "Dominican Republic",
+    "Algeria",
+    "Ecuador",
+    "Estonia",
+    "Egypt",
+    "Western Sahara",
+    "Eritrea",
+    "Spain",
+    "Ethiopia",
+    "Finland",
+    "Fiji",
+    "Falkland Islands (Malvinas)",
+    "Federated States of Micronesia",
+    "Faroe Islands",
+    "France",
+    "Gabon",
+    "United Kingdom",
+    "Grenada",
+    "Georgia",
+    "French Guiana",
+    "Guernsey",
+    "Ghana",
+    "Gibraltar",
+    "Greenland",
+    "Gambia",
+    "Guinea",
+    "Guadeloupe",
+    "Equatorial Guinea",
+    "Greece",
+    "South Georgia and the South Sandwich Islands",
+    "Guatemala",
+    "Guam",
+    "Guinea-Bissau",
+    "Guyana",
+    "Hong Kong",
+    "Heard Island and McDonald Islands",
+    "Honduras",
+    "Croatia",
+    "Haiti",
+    "Hungary",
+    "Canary Islands",
+    "Indonesia",
+    "Ireland",
+    "Israel",
+    "Isle of Man",
+    "India",
+    "British Indian Ocean Territory",
+    "Iraq",
+    "Iran",
+    "Iceland",
+    "Italy",
+    "Jersey",
+    "Jamaica",
+    "Jordan",
+    "Japan",
+    "Kenya",
+    "Kyrgyzstan",
+    "Cambodia",
+    "Kiribati",
+    "Comoros",
+    "Saint Kitts and Nevis",
+    "North Korea",
+    "South Korea",
+    "Kuwait",
+    "Cayman Islands",
+    "Kazakhstan",
+    "Laos",
+    "Lebanon",
+    "Saint Lucia",
+    "Liechtenstein",
+    "Sri Lanka",
+    "Liberia",
+    "Lesotho",
+    "Lithuania",
+    "Luxembourg",
+    "Latvia",
+    "Libya",
+    "Morocco",
+    "Monaco",
+    "Moldova",
+    "Montenegro",
+    "Saint Martin (French part)",
+    "Madagascar",
+    "Marshall Islands",
+    "North Macedonia",
+    "Mali",
+    "Myanmar",
+    "Mongolia",
+    "Macao",
+    "Northern Mariana Islands",
+    "Martinique",
+    "Mauritania",
+    "Montserrat",
+    "Malta",
+    "Mauritius",
+    "Maldives",
+    "Malawi",
+    "Mexico",
+    "Malaysia",
+    "Mozambique",
+    "Namibia",
+    "New Caledonia",
+    "Niger",
+    "Norfolk Island",
+    "Nigeria",
+    "Nicaragua",
+    "Netherlands",
+    "Norway",
+    "Nepal",
+    "Nauru",
+    "Niue",
+    "New Zealand",
+    "Oman",
+    "Panama",
+    "Peru",
+    "French Polynesia",
+    "Papua New Guinea",
+    "Philippines",
+    "Pakistan",
+    "Poland",
+    "Saint Pierre and Miquelon",
+    "Pitcairn",
+    "Puerto Rico",
+    "Palestine",
+    "Portugal",
+    "Palau",
+    "Paraguay",
+    "Qatar",
+    "Réunion",
+    "Romania",
+    "Serbia",
+    "Russia",
+    "Rwanda",
+    "Saudi Arabia",
+    "Solomon Islands",
+    "Seychelles",
+    "Sudan",
+    "Sweden",
+    "Singapore",
+    "Saint Helena, Ascension and Tristan da Cunha",
+    "Slovenia",
+    "Svalbard and Jan Mayen",
+    "Slovakia",
+    "Sierra Leone",
+    "San Marino",
+    "Senegal",
+    "Somalia",
+    "Suriname",
+    "South Sudan",
+    "Sao Tome and Principe",
+    "El Salvador",
+    "Sint Maarten (Dutch part)",
+    "Syria",
+    "Eswatini",
+    "Tristan da Cunha",
+    "Turks and Caicos Islands",
+    "Chad",
+    "French Southern Territories",
+    "Togo",
+    "Thailand",
+    "Tajikistan",
+    "Tokelau",
+    "Timor-Leste",
+    "Turkmenistan",
+    "Tunisia",
+    "Tonga",
+    "Turkey",
+    "Trinidad and Tobago",
+    "Tuvalu",
+    "Taiwan",
+    "Tanzania",
+    "Ukraine",
+    "Uganda",
+    "United States Minor Outlying Islands",
+    "United States of America",
+    "Uruguay",
+    "Uzbekistan",
+    "Vatican City",
+    "Saint Vincent and the Grenadines",
+    "Venezuela",
+    "British Virgin Islands",
+    "U.S. Virgin Islands",
+    "Vietnam",
+    "Vanuatu",
+    "Wallis and Futuna",
+    "Samoa",
+    "Kosovo",
+    "Yemen",
+    "Mayotte",
+    "South Africa",
+    "Zambia",
+    "Zimbabwe",
+    "Unknown",
+)
+
+COUNTRY_EMOJI_FLAGS: Tuple[str, ...] = (
+    "🇦🇨",
+    "🇦🇩",
+    "🇦🇪",
+    "🇦🇫",
+    "🇦🇬",
+    "🇦🇮",
+    "🇦🇱",
+    "🇦🇲",
+    "🇦🇳",
+    "🇦🇴",
+    "🇦🇶",
+    "🇦🇷",
+    "🇦🇸",
+    "🇦🇹",
+    "🇦🇺",
+    "🇦🇼",
+    "🇦🇽",
+    "🇦🇿",
+    "🇧🇦",
+    "🇧🇧",
+    "🇧🇩",
+    "🇧🇪",
+    "🇧🇫",
+    "🇧🇬",
+    "🇧🇭",
+    "🇧🇮",
+    "🇧🇯",
+    "🇧🇱",
+    "🇧🇲",
+    "🇧🇳",
+    "🇧🇴",
+    "🇧🇶",
+    "🇧🇷",
+    "🇧🇸",
+    "🇧🇹",
+    "🇧🇻",
+    "🇧🇼",
+    "🇧🇾",
+    "🇧🇿",
+    "🇨🇦",
+    "🇨🇨",
+    "🇨🇩",
+    "🇨🇫",
+    "🇨🇬",
+    "🇨🇭",
+    "🇨🇮",
+    "🇨🇰",
+    "🇨🇱",
+    "🇨🇲",
+    "🇨🇳",
+    "🇨🇴",
+    "🇨🇷",
+    "🇷🇸",
+    "🇨🇺",
+    "🇨🇻",
+    "🇨🇼",
+    "🇨🇽",
+    "🇨🇾",
+    "🇨🇿",
+    "🇩🇪",
+    "🇩🇯",
+    "🇩🇰",
+    "🇩🇲",
+    "🇩🇴",
+    "🇩🇿",
+    "🇪🇨",
+    "🇪🇪",
+    "🇪🇬",
+    "🇪🇭",
+    "🇪🇷",
+    "🇪🇸",
+    "🇪🇹",
+    "🇫🇮",
+    "🇫🇯",
+    "🇫🇰",
+    "🇫🇲",
+    "🇫🇴",
+    "🇫🇷",
+    "🇬🇦",
+    "🇬🇧",
+    "🇬🇩",
+    "🇬🇪",
+    "🇬🇫",
+    "🇬🇬",
+    "🇬🇭",
+    "🇬🇮",
+    "🇬🇱",
+    "🇬🇲",
+    "🇬🇳",
+    "🇬🇵",
+    "🇬🇶",
+    "🇬🇷",
+    "🇬🇸",
+    "🇬🇹",
+    "🇬🇺",
+    "🇬🇼",
+    "🇬🇾",
+    "🇭🇰",
+    "🇭🇲",
+    "🇭🇳",
+    "🇭🇷",
+    "🇭🇹",
+    "🇭🇺",
+    "🇮🇨",
+    "🇮🇩",
+    "🇮🇪",
+    "🇮🇱",
+    "🇮🇲",
+    "🇮🇳",
+    "🇮🇴",
+    "🇮🇶",
+    "🇮🇷",
+    "🇮🇸",
+    "🇮🇹",
+    "🇯🇪",
+    "🇯🇲",
+    "🇯🇴",
+    "🇯🇵",
+    "🇰🇪",
+    "🇰🇬",
+    "🇰🇭",
+    "🇰🇮",
+    "🇰🇲",
+    "🇰🇳",
+    "🇰🇵",
+    "🇰🇷",
+    "🇰🇼",
+    "🇰🇾",
+    "🇰🇿",
+    "🇱🇦",
+    "🇱🇧",
+    "🇱🇨",
+    "🇱🇮",
+    "🇱🇰",
+    "🇱🇷",
+    "🇱🇸",
+    "🇱🇹",
+    "🇱🇺",
+    "🇱🇻",
+    "🇱🇾",
+    "🇲🇦",
+    "🇲🇨",
+    "🇲🇩",
+    "🇲🇪",
+    "🇲🇫",
+    "🇲🇬",
+    "🇲🇭",
+    "🇲🇰",
+    "🇲🇱",
+    "🇲🇲",
+    "🇲🇳",
+    "🇲🇴",
+    "🇲🇵",
+    "🇲🇶",
+    "🇲🇷",
+    "🇲🇸",
+    "🇲🇹",
+    "🇲🇺",
+    "🇲🇻",
+    "🇲🇼",
+    "🇲🇽",
+    "🇲🇾",
+    "🇲🇿",
+    "🇳🇦",
+    "🇳🇨",
+    "🇳🇪",
+    "🇳🇫",
+    "🇳🇬",
+    "🇳🇮",
+    "🇳🇱",
+    "🇳🇴",
+    "🇳🇵",
+    "🇳🇷",
+    "🇳🇺",
+    "🇳🇿",
+    "🇴🇲",
+    "🇵🇦",
+    "🇵🇪",
+    "🇵🇫",
+    "🇵🇬",
+    "🇵🇭",
+    "🇵🇰",
+    "🇵🇱",
+    "🇵🇲",
+    "🇵🇳",
+    "🇵🇷",
+    "🇵🇸",
+    "🇵🇹",
+    "🇵🇼",
+    "🇵🇾",
+    "🇶🇦",
+    "🇷🇪",
+    "🇷🇴",
+    "🇷🇸",
+    "🇷🇺",
+    "🇷🇼",
+    "🇸🇦",
+    "🇸🇧",
+    "🇸🇨",
+    "🇸🇩",
+    "🇸🇪",
+    "🇸🇬",
+    "🇸🇭",
+    "🇸🇮",
+    "🇸🇯",
+    "🇸🇰",
+    "🇸🇱",
+    "🇸🇲",
+    "🇸🇳",
+    "🇸🇴",
+    "🇸🇷",
+    "🇸🇸",
+    "🇸🇹",
+    "🇸🇻",
+    "🇸🇽",
+    "🇸🇾",
+    "🇸🇿",
+    "🇹🇦",
+    "🇹🇨",
+    "🇹🇩",
+    "🇹🇫",
+    "🇹🇬",
+    "🇹🇭",
+    "🇹🇯",
+    "🇹🇰",
+    "🇹🇱",
+    "🇹🇲",
+    "🇹🇳",
+    "🇹🇴",
+    "🇹🇷",
+    "🇹🇹",
+    "🇹🇻",
+    "🇹🇼",
+    "🇹🇿",
+    "🇺🇦",
+    "🇺🇬",
+    "🇺🇲",
+    "🇺🇸",
+    "🇺🇾",
+    "🇺🇿",
+    "🇻🇦",
+    "🇻🇨",
+    "🇻🇪",
+    "🇻🇬",
+    "🇻🇮",
+    "🇻🇳",
+    "🇻🇺",
+    "🇼🇫",
+    "🇼🇸",
+    "🇽🇰",
+    "🇾🇪",
+    "🇾🇹",
+    "🇿🇦",
+    "🇿🇲",
+    "🇿🇼",
+    "",
+)
+
+CURRENCY_CODES: Tuple[str, ...] = (
+    "SHP",
+    "EUR",
+    "AED",
+    "AFN",
+    "XCD",
+    "XCD",
+    "ALL",
+    "AMD",
+    "ANG",
+    "AOA",
+    "USD",
+    "ARS",
+    "USD",
+    "EUR",
+    "AUD",
+    "AWG",
+    "EUR",
+    "AZN",
+    "BAM",
+    "BBD",
+    "BDT",
+    "EUR",
+    "XOF",
+    "BGN",
+    "BHD",
+    "BIF",
+    "XOF",
+    "EUR",
+    "BMD",
+    "BND",
+    "BOB",
+    "EUR",
+    "BRL",
+    "BSD",
+    "BTN",
+    "NOK",
+    "BWP",
+    "BYN",
+    "BZD",
+    "CAD",
+    "AUD",
+    "CDF",
+    "XAF",
+    "XAF",
+    "CHF",
+    "XOF",
+    "NZD",
+    "CLP",
+    "XAF",
+    "CNY",
+    "COP",
+    "CRC",
+    "RSD",
+    "CUP",
+    "CVE",
+    "ANG",
+    "AUD",
+    "EUR",
+    "CZK",
+    "EUR",
+    "DJF",
+    "DKK",
+    "XCD",
+    "DOP",
+    "DZD",
+    "USD",
+    "EUR",
+    "EGP",
+    "MAD",
+    "ERN",
+    "EUR",
+    "ETB",
+    "EUR",
+    "FJD",
+    "FKP",
+    "USD",
+    "DKK",
+    "EUR",
+    "XAF",
+    "GBP",
+    "XCD",
+    "GEL",
+    "EUR",
+    "GBP",
+    "GHS",
+    "GIP",
+    "DKK",
+    "GMD",
+    "GNF",
+    "EUR",
+    "XAF",
+    "EUR",
+    "GBP",
+    "GTQ",
+    "USD",
+    "XOF",
+    "GYD",
+    "HKD",
+    "AUD",
+    "HNL",
+    "HRK",
+    "HTG",
+    "HUF",
+    "EUR",
+    "IDR",
+    "EUR",
+    "ILS",
+    "GBP",
+    "INR",
+    "USD",
+    "IQD",
+    "IRR",
+    "ISK",
+    "EUR",
+    "GBP",
+    "JMD",
+    "JOD",
+    "JPY",
+    "KES",
+    "KGS",
+    "KHR",
+    "AUD",
+    "KMF",
+    "XCD",
+    "KPW",
+    "KRW",
+    "KWD",
+    "KYD",
+    "KZT",
+    "LAK",
+    "LBP",
+    "XCD",
+    "CHF",
+    "LKR",
+    "LRD",
+    "LSL",
+    "EUR",
+    "EUR",
+    "EUR",
+    "LYD",
+    "MAD",
+    "EUR",
+    "MDL",
+    "EUR",
+    "EUR",
+    "MGA",
+    "USD",
+    "MKD",
+    "XOF",
+    "MMK",
+    "MNT",
+    "MOP",
+    "USD",
+    "EUR",
+    "MRU",
+    "XCD",
+    "EUR",
+    "MUR",
+    "MVR",
+    "MWK",
+    "MXN",
+    "MYR",
+    "MZN",
+    "NAD",
+    "XPF",
+    "XOF",
+    "AUD",
+    "NGN",
+    "NIO",
+    "EUR",
+    "NOK",
+    "NPR",
+    "AUD",
+    "NZD",
+    "NZD",
+    "OMR",
+    "PAB",
+    "PEN",
+    "XPF",
+    "PGK",
+    "PHP",
+    "PKR",
+    "PLN",
+    "EUR",
+    "NZD",
+    "USD",
+    "ILS",
+    "EUR",
+    "USD",
+    "PYG",
+    "QAR",
+    "EUR",
+    "RON",
+    "RSD",
+    "RUB",
+    "RWF",
+    "SAR",
+    "SBD",
+    "SCR",
+    "SDG",
+    "SEK",
+    "SGD",
+    "SHP",
+    "EUR",
+    "NOK",
+    "EUR",
+    "SLL",
+    "EUR",
+    "XOF",
+    "SOS",
+    "SRD",
+    "SSP",
+    "STN",
+    "USD",
+    "ANG",
+    "SYP",
+    "SZL",
+    "SHP",
+    "USD",
+    "XAF",
+    "EUR",
+    "XOF",
+    "THB",
+    "TJS",
+    "NZD",
+    "USD",
+    "TMT",
+    "TND",
+    "TOP",
+    "TRY",
+    "TTD",
+    "AUD",
+    "TWD",
+    "TZS",
+    "UAH",
+    "UGX",
+    "USD",
+    "USD",
+    "UYU",
+    "UZS",
+    "EUR",
+    "XCD",
+    "VES",
+    "USD",
+    "USD",
+    "VND",
+    "VUV",
+    "XPF",
+    "WST",
+    "ALL",
+    "YER",
+    "EUR",
+    "ZAR",
+    "ZMW",
+    "ZWL",
+    "",
+)
+
+CURRENCY_SYMBOLS: Tuple[str, ...] = (
+    "£",
+    "€",
+    "د.إ",
+    "؋",
+    "$",
+    "$",
+    "L",
+    "֏",
+    "ƒ",
+    "Kz",
+    "$",
+    "$",
+    "$",
+    "€",
+    "$",
+    "ƒ",
+    "€",
+    "₼",
+    "KM",
+    "$",
+    "৳",
+    "€",
+    "CFA",
+    "лв",
+    ".د.ب",
+    "FBu",
+    "CFA",
+    "€",
+    "$",
+    "$",
+    "Bs.",
+    "€",
+    "R$",
+    "$",
+    "Nu.",
+    "kr",
+    "P",
+    "Br",
+    "$",
+    "$",
+    "$",
+    "FC",
+    "₣",
+    "₣",
+    "CHF",
+    "CFA",
+    "$",
+    "$",
+    "₣",
+    "¥",
+    "$",
+    "₡",
+    "дин.",
+    "$",
+    "$",
+    "ƒ",
+    "$",
+    "€",
+    "Kč",
+    "€",
+    "Fdj",
+    "kr",
+    "$",
+    "$",
+    "د.ج",
+    "$",
+    "€",
+    "£",
+    "د.م.",
+    "Nfk",
+    "€",
+    "Br",
+    "€",
+    "$",
+    "£",
+    "$",
+    "kr",
+    "€",
+    "₣",
+    "£",
+    "$",
+    "₾",
+    "€",
+    "£",
+    "₵",
+    "£",
+    "kr",
+    "D",
+    "FG",
+    "€",
+    "₣",
+    "€",
+    "£",
+    "Q",
+    "$",
+    "CFA",
+    "$",
+    "$",
+    "$",
+    "L",
+    "kn",
+    "G",
+    "Ft",
+    "€",
+    "Rp",
+    "€",
+    "₪",
+    "£",
+    "₹",
+    "$",
+    "ع.د",
+    "﷼",
+    "kr",
+    "€",
+    "£",
+    "$",
+    "د.ا",
+    "¥",
+    "KSh",
+    "с",
+    "៛",
+    "$",
+    "CF",
+    "$",
+    "₩",
+    "₩",
+    "د.ك",
+    "$",
+    "₸",
+    "₭",
+    "ل.ل",
+    "$",
+    "CHF",
+    "රු",
+    "$",
+    "L",
+    "€",
+    "€",
+    "€",
+    "ل.د",
+    "د.م.",
+    "€",
+    "L",
+    "€",
+    "€",
+    "Ar",
+    "$",
+    "ден",
+    "CFA",
+    "K",
+    "₮",
+    "MOP$",
+    "$",
+    "€",
+    "UM",
+    "$",
+    "€",
+    "₨",
+    "ރ.",
+    "MK",
+    "$",
+    "RM",
+    "MT",
+    "$",
+    "₣",
+    "CFA",
+    "$",
+    "₦",
+    "C$",
+    "€",
+    "kr",
+    "₨",
+    "$",
+    "$",
+    "$",
+    "ر.ع.",
+    "B/.",
+    "S/.",
+    "₣",
+    "K",
+    "₱",
+    "₨",
+    "zł",
+    "€",
+    "$",
+    "$",
+    "₪",
+    "€",
+    "$",
+    "₲",
+    "ر.ق",
+    "€",
+    "lei",
+    "дин.",
+    "₽",
+    "FRw",
+    "ر.س",
+    "$",
+    "₨",
+    "ج.س.",
+    "kr",
+    "$",
+    "£",
+    "€",
+    "kr",
+    "€",
+    "Le",
+    "€",
+    "CFA",
+    "S",
+    "$",
+    "£",
+    "Db",
+    "$",
+    "ƒ",
+    "ل.س",
+    "L",
+    "£",
+    "$",
+    "₣",
+    "€",
+    "CFA",
+    "฿",
+    "ЅМ",
+    "$",
+    "$",
+    "m",
+    "د.ت",
+    "T$",
+    "₺",
+    "TT$",
+    "$",
+    "NT$",
+    "TSh",
+    "₴",
+    "USh",
+    "$",
+    "$",
+    "$",
+    "с",
+    "€",
+    "$",
+    "Bs.",
+    "$",
+    "$",
+    "₫",
+    "VT",
+    "₣",
+    "T",
+    "L",
+    "﷼",
+    "€",
+    "R",
+    "ZK",
+    "$",
+    "",
+)
+
+CURRENCY_LOCALIZED: Tuple[str, ...] = (
+    "SHP£",
+    "€",
+    "د.إ",
+    "AFN",
+    "XCD$",
+    "XCD$",
+    "ALL",
+    "AMD",
+    "ANGƒ",
+    "AOA",
+    "USD$",
+    "ARS$",
+    "USD$",
+    "€",
+    "AUD$",
+    "AWGƒ",
+    "€",
+    "AZN₼",
+    "BAM",
+    "BBD$",
+    "BDT৳",
+    "€",
+    "XOFCFA",
+    "BGNлв",
+    "BHD.د.ب",
+    "BIF",
+    "XOFCFA",
+    "€",
+    "BMD$",
+    "BND$",
+    "BOB",
+    "€",
+    "BRLR$",
+    "BSD$",
+    "BTN",
+    "NOKkr",
+    "BWPP",
+    "BYNBr",
+    "BZD$",
+    "CAD$",
+    "AUD$",
+    "CDF",
+    "XAF₣",
+    "XAF₣",
+    "CHF",
+    "XOFCFA",
+    "NZD$",
+    "CLP$",
+    "XAF₣",
+    "CNY¥",
+    "COP$",
+    "CRC₡",
+    "RSDдин.",
+    "CUP$",
+    "CVE$",
+    "ANGƒ",
+    "AUD$",
+    "€",
+    "CZKKč",
+    "€",
+    "DJFFdj",
+    "DKKkr",
+    "XCD$",
+    "DOP$",
+    "DZDد.ج",
+    "USD$",
+    "€",
+    "EGP£",
+    "MADد.م.",
+    "ERN",
+    "€",
+    "ETBBr",
+    "€",
+    "FJD$",
+    "FKP£",
+    "USD$",
+    "DKKkr",
+    "€",
+    "XAF₣",
+    "GBP£",
+    "XCD$",
+    "GEL₾",
+    "€",
+    "GBP£",
+    "GHS₵",
+    "GIP£",
+    "DKKkr",
+    "GMDD",
+    "GNFFG",
+    "€",
+    "XAF₣",
+    "€",
+    "GBP£",
+    "GTQQ",
+    "USD$",
+    "XOFCFA",
+    "GYD$",
+    "HKD$",
+    "AUD$",
+    "HNLL",
+    "HRKkn",
+    "HTGG",
+    "HUF",
+    "€",
+    "IDRRp",
+    "€",
+    "ILS₪",
+    "GBP£",
+    "INR₹",
+    "USD$",
+    "IQDع.د",
+    "IRR﷼",
+    "ISKkr",
+    "€",
+    "GBP£",
+    "JMD$",
+    "JODد.ا",
+    "JPY¥",
+    "KESKSh",
+    "KGSс",
+    "KHR៛",
+    "AUD$",
+    "KMFCF",
+    "XCD$",
+    "KPW₩",
+    "KRW₩",
+    "KWDد.ك",
+    "KYD$",
+    "KZT₸",
+    "LAK₭",
+    "LBPl.ل",
+    "XCD$",
+    "CHF",
+    "LKRRs",
+    "LRD$",
+    "LSLL",
+    "€",
+    "€",
+    "€",
+    "LYDل.د",
+    "MADد.م.",
+    "€",
+    "MDLL",
+    "€",
+    "€",
+    "MGAAr",
+    "USD$",
+    "MKDден",
+    "XOFCFA",
+    "MMKK",
+    "MNT₮",
+    "MOPMOP$",
+    "USD$",
+    "€",
+    "MRUUM",
+    "XCD$",
+    "€",
+    "MUR₨",
+    "MVRރ.",
+    "MWKMK",
+    "MXN$",
+    "MYRRM",
+    "MZNMt",
+    "NAD$",
+    "XPF₣",
+    "XOFCFA",
+    "AUD$",
+    "NGN₦",
+    "NIOC$",
+    "€",
+    "NOKkr",
+    "NPR₨",
+    "AUD$",
+    "NZD$",
+    "NZD$",
+    "OMRر.ع.",
+    "PABB/.",
+    "PENS/.",
+    "XPF₣",
+    "PGKK",
+    "PHP₱",
+    "PKR₨",
+    "PLNzł",
+    "€",
+    "NZD$",
+    "USD$",
+    "ILS₪",
+    "€",
+    "USD$",
+    "PYG₲",
+    "QARر.ق",
+    "€",
+    "RONlei",
+    "RSDдин.",
+    "RUB₽",
+    "RWFFRw",
+    "SARر.س",
+    "SBD$",
+    "SCR₨",
+    "SDGج.س.",
+    "SEKkr",
+    "SGD$",
+    "SHP£",
+    "€",
+    "NOKkr",
+    "€",
+    "SLLLe",
+    "€",
+    "XOFCFA",
+    "SOSS",
+    "SRD$",
+    "SSP£",
+    "STNDb",
+    "USD$",
+    "ANGƒ",
+    "SYPl.س",
+    "SZLL",
+    "SHP£",
+    "USD$",
+    "XAF₣",
+    "€",
+    "XOFCFA",
+    "THB฿",
+    "TJSЅМ",
+    "NZD$",
+    "USD$",
+    "TMTm",
+    "TNDد.ت",
+    "TOPT$",
+    "TRY₺",
+    "TTD$",
+    "AUD$",
+    "TWDNT$",
+    "TZSTSh",
+    "UAH₴",
+    "UGXUSh",
+    "USD$",
+    "USD$",
+    "UYU$",
+    "UZSс",
+    "€",
+    "XCD$",
+    "VESBs.",
+    "USD$",
+    "USD$",
+    "VND₫",
+    "VUVVT",
+    "XPF₣",
+    "WSTT",
+    "ALL",
+    "YER﷼",
+    "€",
+    "ZARR",
+    "ZMWZK",
+    "ZWL$",
+    "",
+)
+
+# Country code -> country id. `Country.code` and the keys of `Discounts` are the strings of `COUNTRY_CODES`, so the
+# same country is always the same string object.
+COUNTRY_IDS: Dict[str, int] = {code: index for index, code in enumerate(COUNTRY_CODES)}
+
+# Currency code -> currency id, numbered in the order the currencies first appear in `CURRENCY_CODES`, so ids are
+# stable as well. `ExchangeRates` keeps its rates in an array indexed by these ids.
+CURRENCY_IDS: Dict[str, int] = {
+    code: index
+    for index, code in enumerate(dict.fromkeys(code for code in CURRENCY_CODES if code))
 }
+
+
+def __getattr__(name: str):
+    # `COUNTRIES_META` (code -> (name, emoji_flag, currency_code, currency_symbol, currency_localized)) is built on
+    # first use, as the library itself only reads the tuples above
+    if name == "COUNTRIES_META":
+        meta = dict(
+            zip(
+                COUNTRY_CODES,
+                zip(
+                    COUNTRY_NAMES,
+                    COUNTRY_EMOJI_FLAGS,
+                    CURRENCY_CODES,
+                    CURRENCY_SYMBOLS,
+                    CURRENCY_LOCALIZED,
+                ),
+            )
+        )
+        globals()["COUNTRIES_META"] = meta
+        return meta
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+import functools
+import json
+from typing import Callable, Tuple, Type, Union
+
+
+def get_default_json_loads() -> Callable[[Union[str, bytes]], dict]:
+    """
+    Get the fastest available JSON decoder that accepts raw bytes.
+
+    `orjson` is preferred, then `msgspec`, falling back to the standard library `json` module.
+    All three parse UTF-8 bytes directly, so the response body never has to be decoded into
+    an intermediate `str`.
+
+    Returns:
+        Callable[[Union[str, bytes]], dict]: A function that parses a JSON document.
+    """
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec
+
+        return msgspec.json.decode
+    except ImportError:
+        pass
+
+    return json.loads
+
+
+@functools.lru_cache(maxsize=None)
+def get_json_decode_errors() -> Tuple[Type[Exception], ...]:
+    """
+    Get the exceptions the JSON decoders raise for a malformed document.
+
+    `orjson.JSONDecodeError` is a `json.JSONDecodeError`, and `json.loads` raises `UnicodeDecodeError` for bytes
+    that are not valid UTF-8.
+
+    Returns:
+        Tuple[Type[Exception], ...]: The exception types.
+    """
+    errors = [json.JSONDecodeError, UnicodeDecodeError]
+    try:
+        import msgspec
+
+        errors.append(msgspec.DecodeError)
+    except ImportError:
+        pass
+
+    return tuple(errors)
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class QuotaExceededError(Exception):
     """Error indicating that users monthly request quota has been passed."""
 
@@ -7,7 +10,15 @@ class QuotaExceededError(Exception):
 class APIError(Exception):
     """Error indicating that an API error has occurred (meaning something not expected happened, like a 50x-error)."""
 
-    pass
+    def __init__(
+        self,
+        *args,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super(APIError, self).__init__(*args)
+        self.status_code: Optional[int] = status_code
+        self.retry_after: Optional[float] = retry_after
 
 
 class ProcessingError(Exception):
@@ -20,3 +31,29 @@ class ConnectionError(Exception):
     """Error indicating that some sort of an internet connection error has occurred."""
 
     pass
+
+
+class CircuitOpenError(ConnectionError):
+    """Error indicating that the call was short-circuited because the circuit breaker is open."""
+
+    pass
+
+
+class DeadlineExceededError(ConnectionError):
+    """Error indicating that a lookup did not complete within its deadline and no fallback is configured."""
+
+    pass
+
+
+class RateLimitExceededError(Exception):
+    """Error indicating that the client-side rate limit was reached and the request was not sent."""
+
+    def __init__(self, *args, retry_after: Optional[float] = None):
+        super(RateLimitExceededError, self).__init__(*args)
+        self.retry_after: Optional[float] = retry_after
+
+
+class QuotaReservedError(QuotaExceededError):
+    """Error indicating that the remaining quota is reserved for interactive lookups, so a background lookup was not sent."""
+
+    pass
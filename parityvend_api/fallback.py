@@ -0,0 +1,36 @@
+from typing import Union
+
+NO_DISCOUNT: dict = {
+    "status": "ok",
+    "discount": None,
+    "discount_str": None,
+    "coupon_code": None,
+    "country": {},
+    "currency": {},
+}
+
+
+def no_discount_fallback(endpoint_name: str, input_vars: dict) -> Union[dict, None]:
+    """
+    A fallback answering every IP lookup with "no discount", in the same shape the API uses for unknown visitors.
+
+    Pass it as the `fallback` option of a handler to show full prices instead of failing when the API cannot be
+    used. Account-level endpoints (quota, discounts and exchange rates) have no sensible default, so they still raise.
+
+    Args:
+        endpoint_name (str): The name of the endpoint being called (e.g., 'get-discount-from-ip').
+        input_vars (dict): The variables of the call (e.g., `ip` and `base_currency`).
+
+    Returns:
+        Union[dict, None]: The payload to use instead of the API response, or None to raise the original error.
+    """
+    if endpoint_name == "get-country-from-ip":
+        return {"status": "ok", "country": "XX"}
+
+    if endpoint_name in ("get-discount-with-html-from-ip", "get-banner-from-ip"):
+        return {"status": "ok", "html": None, **NO_DISCOUNT}
+
+    if endpoint_name == "get-discount-from-ip":
+        return dict(NO_DISCOUNT)
+
+    return None
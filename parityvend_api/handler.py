@@ -1,18 +1,90 @@
-import json
+import concurrent.futures
+import functools
 import logging
+import os
+import pickle
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from ipaddress import IPv4Address, IPv6Address
-from typing import Callable, Optional, Union
-
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Union
 
+from .balancer import URLBalancer
 from .cache.default import DefaultCache
 from .cache.interface import CacheInterface
+from .circuit import CircuitBreaker
+from .compose import BaseCurrencyDeriver, DiscountComposer
 from .config import API_URL
-from .exceptions import APIError, ConnectionError, ProcessingError, QuotaExceededError
-from .objects import COUNTRIES, Country, Discounts, Response
+from .decoders import get_default_json_loads, get_json_decode_errors
+from .exceptions import (
+    APIError,
+    CircuitOpenError,
+    ConnectionError,
+    DeadlineExceededError,
+    ProcessingError,
+    QuotaExceededError,
+    QuotaReservedError,
+)
+from .hedging import HedgePolicy
+from .limiter import AdaptiveLimiter
+from .objects import (
+    COUNTRIES,
+    Country,
+    Discounts,
+    ExchangeRates,
+    FrozenResponse,
+    Response,
+)
+from .priority import Priority
+from .quota import QuotaManager
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+
+if TYPE_CHECKING:
+    import requests
 
 logger = logging.getLogger("parityvend")
 
+# every live client, so that a forked child can rebuild their per-process state
+_clients: weakref.WeakSet = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for client in list(_clients):
+        client._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _check_picklable(name: str, value: Any):
+    # a lambda or a closure would otherwise fail deep inside `pickle`, without naming the option it was passed as
+    if value is None:
+        return
+
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError) as exc:
+        raise TypeError(
+            f'Cannot pickle "ParityVendAPI": its {name} ({value!r}) is not picklable. Use a function defined at the '
+            "top level of a module instead of a lambda or a closure."
+        ) from exc
+
+
+def _copy_timing(source: dict, timing: Optional[dict]):
+    # hands the timing of the request that answered to the caller of `send_hedged_request`
+    if timing is not None:
+        timing.update(source)
+
+
+def _import_requests():
+    # `requests` is imported when the first client is created, so that importing the library stays fast
+    global requests
+    import requests
+    import requests.adapters
+
 
 class ParityVendAPI:
     def __init__(
@@ -21,10 +93,30 @@ class ParityVendAPI:
         request_options: Optional[dict] = None,
         cache_instance: Optional[CacheInterface] = None,
         cache_options: Optional[dict] = None,
-        json_loads: Optional[Callable[[str], dict]] = None,
+        json_loads: Optional[Callable[[Union[str, bytes]], dict]] = None,
         cache_on_error: bool = True,
         log_api_errors: bool = True,
         raise_exc_on_error: bool = True,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[Union[int, float]] = None,
+        dns_cache_ttl: Optional[int] = None,
+        prewarm_connections: int = 0,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        fallback: Optional[Callable[[str, dict], Union[dict, str, None]]] = None,
+        deadline: Optional[Union[int, float]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        quota_manager: Optional[QuotaManager] = None,
+        api_urls: Optional[Union[Iterable[str], URLBalancer]] = None,
+        connect_timeout: Optional[Union[int, float]] = None,
+        read_timeout: Optional[Union[int, float]] = None,
+        discount_composer: Optional[DiscountComposer] = None,
+        base_currency_deriver: Optional[BaseCurrencyDeriver] = None,
     ):
         """
         Initialize the ParityVendAPI object.
@@ -34,14 +126,36 @@ class ParityVendAPI:
             request_options (Optional[dict], optional): Additional options to pass to the requests library. Defaults to None.
             cache_instance (Optional[CacheInterface], optional): An instance of a custom cache implementation. Defaults to None.
             cache_options (Optional[dict], optional): Options to pass to the default cache implementation. Defaults to None.
-            json_loads (Optional[Callable[[str], dict]], optional): A custom function to use for loading JSON data. Defaults to None.
+            json_loads (Optional[Callable[[Union[str, bytes]], dict]], optional): A custom function to use for loading JSON data. It receives the response text (`str`), and should raise `json.JSONDecodeError` (or a subclass) for a malformed payload, which becomes an `APIError`. Defaults to None (`orjson` or `msgspec` when installed, otherwise `json.loads`, which parse the raw response bytes).
             cache_on_error (bool, optional): Whether to cache API responses on error. Defaults to True.
             log_api_errors (bool, optional): Whether to log API errors. Defaults to True.
             raise_exc_on_error (bool, optional): Whether to raise an exception on API errors. Defaults to True.
+            pool_connections (Optional[int], optional): The number of per-host connection pools to keep. Defaults to None (transport default).
+            pool_maxsize (Optional[int], optional): The maximum number of connections kept in the pool. Defaults to None (transport default).
+            pool_block (bool, optional): Whether to wait for a free pooled connection instead of opening a throwaway one. Defaults to False.
+            limit_per_host (Optional[int], optional): The maximum number of simultaneous connections to one host. Defaults to None (no limit).
+            keepalive_timeout (Optional[Union[int, float]], optional): How long (in seconds) an idle connection is kept alive. Defaults to None (transport default).
+            dns_cache_ttl (Optional[int], optional): How long (in seconds) resolved DNS entries are cached. Only used by the asynchronous handler, as `requests` relies on the system resolver. Defaults to None (transport default).
+            prewarm_connections (int, optional): The number of connections `warm_up()` opens by default, so that the first requests skip the TCP and TLS handshakes. The handler does not open connections when it is created; call `warm_up()` when your application starts. Defaults to 0.
+            retry_policy (Optional[RetryPolicy], optional): When and how to retry failed requests. Defaults to None (no retries).
+            circuit_breaker (Optional[CircuitBreaker], optional): A circuit breaker that short-circuits calls while the API is degraded. Defaults to None.
+            fallback (Optional[Callable[[str, dict], Union[dict, str, None]]], optional): A function called with the endpoint name and the call variables when a call is short-circuited. It returns the payload to use instead (e.g., `no_discount_fallback`), or None to raise. Defaults to None.
+            deadline (Optional[Union[int, float]], optional): The default time budget (in seconds) of the `get_*_from_ip` methods. See their `deadline` argument. Defaults to None (no deadline).
+            hedge_policy (Optional[HedgePolicy], optional): When to send a second, identical request for a slow one. Defaults to None (no hedging).
+            limiter (Optional[AdaptiveLimiter], optional): A concurrency limiter every API call takes a slot from. It can be shared between handlers. Defaults to None (no limit).
+            rate_limiter (Optional[RateLimiter], optional): A token bucket every request to the API takes a token from. It can be process-local or shared between processes. Defaults to None (no limit).
+            quota_manager (Optional[QuotaManager], optional): A quota manager that polls `get_quota_info` in the background and switches background lookups to cache-only mode when the quota runs low. Defaults to None.
+            api_urls (Optional[Union[Iterable[str], URLBalancer]], optional): Base URLs (like regional proxies or mirrors) to spread requests over instead of `API_URL`, picking the faster healthy one and failing over on connection errors. A `URLBalancer` can be passed to tune it or share it between handlers. Defaults to None (`API_URL` only).
+            connect_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for a connection to the API to be established. Defaults to None (no limit).
+            read_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for the next piece of data from the API. Defaults to None (no limit).
+            discount_composer (Optional[DiscountComposer], optional): Keeps the discounts and exchange rates tables, refreshed in the background, and answers `get_discount_from_ip` from them and the country of the IP address, without a `get-discount-from-ip` call. Defaults to None.
+            base_currency_deriver (Optional[BaseCurrencyDeriver], optional): Derives `get_discount_from_ip` responses in other base currencies from the cached response in its source currency and an exchange rate table, instead of calling the API for every base currency. Defaults to None.
         """
         self.private_key: str = private_key
 
         self.request_options: dict = self.get_default_request_options()
+        if connect_timeout is not None or read_timeout is not None:
+            self.request_options["timeout"] = (connect_timeout, read_timeout)
         if request_options:
             self.request_options.update(request_options)
 
@@ -54,19 +168,278 @@ class ParityVendAPI:
 
             self.cache: CacheInterface = DefaultCache(**self.cache_options)
 
-        self.json_loads: Callable[[str], dict] = json.loads
+        self.json_loads: Callable[[Union[str, bytes]], dict] = get_default_json_loads()
+        # the built-in decoders parse the raw bytes, a custom one gets the text, as it always did
+        self._json_loads_text: bool = False
         if json_loads:
-            self.json_loads: Callable[[str], dict] = json_loads
-
-        self.session: requests.Session = requests.Session()
+            self.json_loads: Callable[[Union[str, bytes]], dict] = json_loads
+            self._json_loads_text = True
 
         self.cache_on_error: bool = cache_on_error
         self.log_api_errors: bool = log_api_errors
         self.raise_exc_on_error: bool = raise_exc_on_error
 
+        self.pool_connections: Optional[int] = pool_connections
+        self.pool_maxsize: Optional[int] = pool_maxsize
+        self.pool_block: bool = pool_block
+        self.limit_per_host: Optional[int] = limit_per_host
+        self.keepalive_timeout: Optional[Union[int, float]] = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.connect_timeout: Optional[Union[int, float]] = connect_timeout
+        self.read_timeout: Optional[Union[int, float]] = read_timeout
+        self.prewarm_connections: int = prewarm_connections
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        self.fallback: Optional[Callable[[str, dict], Union[dict, str, None]]] = fallback
+
+        self.deadline: Optional[Union[int, float]] = deadline
+        self.hedge_policy: Optional[HedgePolicy] = hedge_policy
+        self.limiter: Optional[AdaptiveLimiter] = limiter
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.quota_manager: Optional[QuotaManager] = quota_manager
+        self.discount_composer: Optional[DiscountComposer] = discount_composer
+        self.base_currency_deriver: Optional[BaseCurrencyDeriver] = (
+            base_currency_deriver
+        )
+        if api_urls is not None and not isinstance(api_urls, URLBalancer):
+            api_urls = URLBalancer(api_urls)
+        self.url_balancer: Optional[URLBalancer] = api_urls
+        self.deadline_stats: dict = {
+            "met": 0,
+            "missed": 0,
+            "completed_late": 0,
+            "failed_late": 0,
+        }
+        self._create_runtime_state()
+
     def __repr__(self) -> str:
         return f"ParityVendAPI('{self.private_key[:6]}...')"
 
+    # attributes that only make sense in the process that created them
+    _runtime_attributes = (
+        "session",
+        "_deadline_lock",
+        "_deadline_pending",
+        "_deadline_missed",
+        "_deadline_executor",
+        "_hedge_executor",
+        "_hedge_threads_busy",
+        "_idle_lock",
+        "_requests_in_flight",
+        "_last_request_time",
+        "_pollers_lock",
+        "_pollers_started",
+    )
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in self._runtime_attributes:
+            state.pop(name, None)
+        _check_picklable("fallback", self.fallback)
+        _check_picklable("json_loads", self.json_loads)
+        if self.circuit_breaker:
+            for listener in self.circuit_breaker.listeners:
+                _check_picklable("circuit_breaker listener", listener)
+        if isinstance(self.cache, DefaultCache):
+            # ship the configuration only, the copy starts with an empty cache
+            state["cache"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self.cache is None:
+            self.cache = DefaultCache(**self.cache_options)
+        self._create_runtime_state()
+
+    def _create_runtime_state(self, start_pollers: bool = True):
+        """
+        Create the per-process state: the session, the locks and executors, and the quota and discount tables pollers.
+
+        Args:
+            start_pollers (bool, optional): Whether to start the pollers now. Otherwise they are started by the first
+                request that is not served from the cache. Defaults to True.
+        """
+        self._deadline_lock = threading.Lock()
+        self._deadline_pending: dict = {}
+        self._deadline_missed: set = set()
+        self._deadline_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_threads_busy: int = 0
+
+        _import_requests()
+        self._idle_lock = threading.Lock()
+        self._requests_in_flight: int = 0
+        self._last_request_time: float = 0.0
+        self.session: "requests.Session" = self._create_session()
+
+        self._pollers_lock = threading.Lock()
+        self._pollers_started: bool = False
+        if start_pollers:
+            self._start_pollers()
+        _clients.add(self)
+
+    def _start_pollers(self):
+        """
+        Start the quota and discount tables pollers, unless they were already started.
+        """
+        with self._pollers_lock:
+            if self._pollers_started:
+                return
+            self._pollers_started = True
+
+        # the pollers only hold weak references, so a client that is no longer used is garbage-collected and they stop
+        if self.quota_manager:
+            self.quota_manager.start(weakref.WeakMethod(self._poll_quota))
+        if self.discount_composer:
+            self.discount_composer.start(
+                weakref.WeakMethod(self.refresh_discount_tables)
+            )
+
+    def __enter__(self) -> "ParityVendAPI":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the client: stop the quota and discount tables pollers, shut down the background executors and close the
+        session. Lookups that missed their deadline and are still completing in the background are not waited for.
+        """
+        if self.quota_manager:
+            self.quota_manager.stop()
+        if self.discount_composer:
+            self.discount_composer.stop()
+        with self._deadline_lock:
+            executors = (self._deadline_executor, self._hedge_executor)
+            self._deadline_executor = self._hedge_executor = None
+        for executor in executors:
+            if executor:
+                executor.shutdown(wait=False)
+        self.session.close()
+        _clients.discard(self)
+
+    def _poll_quota(self) -> Response:
+        return self.get_quota_info(cache=False)
+
+    def _after_fork(self):
+        """
+        Rebuild the per-process state in a forked child, so it does not share sockets or locks with its parent. The
+        cache entries are kept. The pollers are started by the child's first request, as starting threads in an
+        after-fork hook is unsafe.
+        """
+        for component in (
+            self.circuit_breaker,
+            self.hedge_policy,
+            self.limiter,
+            self.rate_limiter,
+            self.quota_manager,
+            self.discount_composer,
+            self.base_currency_deriver,
+            self.url_balancer,
+        ):
+            if component is not None:
+                # unpickling resets the locks and the per-process state
+                component.__setstate__(component.__getstate__())
+        if isinstance(self.cache, DefaultCache):
+            self.cache.__setstate__(self.cache.__getstate__())
+        self._create_runtime_state(start_pollers=False)
+
+    def _create_session(self) -> "requests.Session":
+        """
+        Create a `requests.Session` with a connection pool sized according to the pool options.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections
+            or requests.adapters.DEFAULT_POOLSIZE,
+            pool_maxsize=self._get_pool_maxsize(),
+            pool_block=self.pool_block or bool(self.limit_per_host),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_pool_maxsize(self) -> int:
+        pool_maxsize = self.pool_maxsize or requests.adapters.DEFAULT_POOLSIZE
+        if self.limit_per_host:
+            # urllib3 keeps one pool per host, so the per-host limit caps the pool size
+            pool_maxsize = min(pool_maxsize, self.limit_per_host)
+        return pool_maxsize
+
+    def _start_request(self):
+        if self.keepalive_timeout is None:
+            return
+        with self._idle_lock:
+            self._expire_idle_connections()
+            self._requests_in_flight += 1
+
+    def _finish_request(self):
+        if self.keepalive_timeout is None:
+            return
+        with self._idle_lock:
+            self._requests_in_flight -= 1
+            self._last_request_time = time.monotonic()
+
+    def _expire_idle_connections(self):
+        """
+        Drop the pooled connections if they have been idle for longer than `keepalive_timeout`.
+
+        Called with `_idle_lock` held. The pools are only cleared while no request is in flight, so no other thread is
+        taking a connection from them.
+        """
+        if (
+            self.keepalive_timeout is not None
+            and not self._requests_in_flight
+            and self._last_request_time
+            and time.monotonic() - self._last_request_time > self.keepalive_timeout
+        ):
+            for adapter in self.session.adapters.values():
+                adapter.poolmanager.clear()
+
+    def warm_up(self, connections: Optional[int] = None) -> int:
+        """
+        Open connections to the ParityVend API in advance and return them to the pool.
+
+        The warm-up requests go to the API root, so they do not use your quota. With `api_urls`, the connections are
+        spread over all the base URLs.
+
+        Args:
+            connections (Optional[int], optional): The number of connections to open. Defaults to `prewarm_connections`.
+
+        Returns:
+            int: The number of connections that were opened successfully.
+        """
+        connections = connections or self.prewarm_connections
+        if not connections:
+            return 0
+
+        request_options = {**self.request_options}
+        request_options.setdefault("timeout", 10)
+
+        urls = self.get_api_urls()
+
+        def warm_one(index: int) -> bool:
+            try:
+                self.session.head(
+                    f"{urls[index % len(urls)]}/", **request_options
+                ).close()
+                return True
+            except requests.exceptions.RequestException:
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            warmed = sum(executor.map(warm_one, range(connections)))
+
+        if warmed < connections:
+            logger.warning(
+                f"ParityVend API warm-up opened {warmed} of {connections} connections."
+            )
+        return warmed
+
     @staticmethod
     def get_default_request_options() -> dict:
         """
@@ -91,16 +464,233 @@ class ParityVendAPI:
         """
         return {"maxsize": 4096, "ttl": 24 * 60 * 60}
 
+    def get_api_url(self) -> str:
+        """
+        Get the base URL for the next request to the ParityVend API.
+
+        Returns:
+            str: A base URL picked from `api_urls`, or `API_URL`.
+        """
+        if self.url_balancer:
+            return self.url_balancer.select()
+        return API_URL
+
+    def get_api_urls(self) -> List[str]:
+        """
+        Get all the base URLs of the ParityVend API the handler sends requests to.
+
+        Returns:
+            List[str]: The base URLs from `api_urls`, or `API_URL`.
+        """
+        if self.url_balancer:
+            return list(self.url_balancer.urls)
+        return [API_URL]
+
     def api_request(
-        self, method: str, url: str, request_options: dict
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
+    ) -> Union[dict, str, None]:
+        """
+        Make a request to the ParityVend API, retrying it according to `retry_policy` and failing over between
+        `api_urls` on connection errors.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the requests library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
+
+        Raises:
+            APIError: If the API returns a non-200 status code or an invalid JSON payload.
+            ConnectionError: If there is an error connecting to the API.
+            ProcessingError: If there is an error with the input data.
+
+        Returns:
+            Union[dict, str, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error).
+        """
+        if not self.retry_policy and not self.url_balancer:
+            return self.send_hedged_request(method, url, request_options, timing)
+
+        started = time.monotonic()
+        attempt = 1
+        tried = set()
+        while True:
+            try:
+                return self.send_hedged_request(
+                    method, url, request_options, timing
+                )
+            except Exception as exc:
+                if self.url_balancer and isinstance(exc, ConnectionError):
+                    failover_url = self.url_balancer.get_failover_url(url, tried)
+                    if failover_url:
+                        logger.warning(
+                            f"ParityVend API ({method.upper()}: {url}) is unreachable, failing over to {failover_url}."
+                        )
+                        url = failover_url
+                        if self.rate_limiter:
+                            self.rate_limiter.acquire(block=True)
+                        continue
+
+                if not self.retry_policy:
+                    raise
+                delay = self.retry_policy.get_retry_delay(
+                    exc, attempt, time.monotonic() - started
+                )
+                if delay is None:
+                    raise
+
+                logger.warning(
+                    f"ParityVend API ({method.upper()}: {url}) attempt {attempt} failed ({exc!r}), retrying in {delay:.3f}s."
+                )
+                time.sleep(delay)
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(block=True)
+                attempt += 1
+                tried.clear()
+
+    def send_hedged_request(
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
     ) -> Union[dict, str, None]:
         """
-        Make a request to the ParityVend API.
+        Send a request to the ParityVend API, hedging it with a second one if it is slow (see `hedge_policy`).
+
+        The first successful response wins. As a `requests` call cannot be interrupted, both requests run on the hedge
+        executor (two threads per pooled connection, see `pool_maxsize`), and the losing request runs to completion in
+        the background and its connection goes back to the pool. Requests never wait for an executor thread: when all
+        of them are busy, the request is sent from the calling thread without a hedge, and a hedge is only sent if a
+        thread is free for it.
 
         Args:
             method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
             url (str): The URL to send the request to.
             request_options (dict): Additional options to pass to the requests library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
+
+        Returns:
+            Union[dict, str, None]: The response from the API.
+        """
+        policy = self.hedge_policy
+        if not policy:
+            return self.send_request(method, url, request_options, timing)
+
+        executor = self._get_hedge_executor()
+        if not self._reserve_hedge_thread():
+            # queueing for a thread would add to the latency the hedge is meant to cut
+            started = time.monotonic()
+            result = self.send_request(method, url, request_options, timing)
+            policy.record_latency(time.monotonic() - started)
+            return result
+
+        first_sent = threading.Event()
+        first_timing, second_timing = {}, {}
+
+        def send(timing: dict, sent: Optional[threading.Event] = None):
+            if sent:
+                sent.set()
+            try:
+                return self.send_request(method, url, request_options, timing)
+            finally:
+                self._release_hedge_thread()
+
+        first = executor.submit(send, first_timing, first_sent)
+        first_sent.wait()
+        started = time.monotonic()
+
+        try:
+            result = first.result(timeout=policy.get_delay())
+        except concurrent.futures.TimeoutError:
+            pass
+        else:
+            policy.record_latency(time.monotonic() - started)
+            _copy_timing(first_timing, timing)
+            return result
+
+        hedge_thread = self._reserve_hedge_thread()
+        if (
+            not hedge_thread
+            or not policy.try_hedge()
+            or (self.rate_limiter and not self.rate_limiter.try_acquire())
+        ):
+            if hedge_thread:
+                self._release_hedge_thread()
+            try:
+                result = first.result()
+            finally:
+                _copy_timing(first_timing, timing)
+            policy.record_latency(time.monotonic() - started)
+            return result
+
+        second = executor.submit(send, second_timing)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        if loser.cancel():
+                            # it never ran, so it did not release its thread
+                            self._release_hedge_thread()
+                    if future is second:
+                        policy.record_hedge_win()
+                    policy.record_latency(time.monotonic() - started)
+                    _copy_timing(
+                        second_timing if future is second else first_timing, timing
+                    )
+                    return future.result()
+                error = error or future.exception()
+        _copy_timing(first_timing, timing)
+        raise error
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._deadline_lock:
+            if self._hedge_executor is None:
+                # a thread per pooled connection for the requests, and as many for their hedges
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self._get_hedge_workers(),
+                    thread_name_prefix="parityvend-hedge",
+                )
+            return self._hedge_executor
+
+    def _get_hedge_workers(self) -> int:
+        return 2 * self._get_pool_maxsize()
+
+    def _reserve_hedge_thread(self) -> bool:
+        # a request is only handed to the hedge executor when a thread is free to send it right away
+        with self._deadline_lock:
+            if self._hedge_threads_busy >= self._get_hedge_workers():
+                return False
+            self._hedge_threads_busy += 1
+            return True
+
+    def _release_hedge_thread(self):
+        with self._deadline_lock:
+            self._hedge_threads_busy -= 1
+
+    def send_request(
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
+    ) -> Union[dict, str, None]:
+        """
+        Send a single request to the ParityVend API.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the requests library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
 
         Raises:
             APIError: If the API returns a non-200 status code or an invalid JSON payload.
@@ -110,17 +700,28 @@ class ParityVendAPI:
         Returns:
             Union[dict, str, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error).
         """
+        self._start_request()
+
+        started = time.monotonic()
         try:
             r = self.session.request(method, url, **request_options)
+            if self.url_balancer:
+                self.url_balancer.record(url, time.monotonic() - started)
 
             if r.status_code != 200:
                 logger.error(
                     f"ParityVend API ({method.upper()}: {url}) returned non-200 status code ({r.status_code=}). See API response below:\n{r.text}\n"
                 )
-                raise APIError("ParityVend API returned non-200 status code.")
+                raise APIError(
+                    "ParityVend API returned non-200 status code.",
+                    status_code=r.status_code,
+                    retry_after=parse_retry_after(r.headers.get("Retry-After")),
+                )
 
             if r.headers["Content-Type"] == "application/json":
-                result = self.json_loads(r.text)
+                result = self.json_loads(
+                    r.text if self._json_loads_text else r.content
+                )
 
                 if self.raise_exc_on_error and result["status"] == "error":
                     raise ProcessingError(
@@ -130,16 +731,87 @@ class ParityVendAPI:
                 return result
             return r.text
 
-        except requests.exceptions.RequestException:
+        except requests.exceptions.RequestException as exc:
+            if self.url_balancer:
+                self.url_balancer.record(url, exc=exc)
             raise ConnectionError(
                 "Not able to reach the ParityVend API. Check your internet connection."
             )
 
-        except json.JSONDecodeError:
+        except get_json_decode_errors():
             logger.error(
                 f"ParityVend API ({method.upper()}: {url}) returned invalid JSON payload ({r.status_code=}). See API response below:\n{r.text}\n"
             )
-            raise APIError("ParityVend API returned invalid JSON payload.")
+            raise APIError(
+                "ParityVend API returned invalid JSON payload.",
+                status_code=r.status_code,
+            )
+
+        finally:
+            self._finish_request()
+            if timing is not None:
+                timing["latency"] = time.monotonic() - started
+
+    def guarded_request(
+        self,
+        method: str,
+        endpoint_name: str,
+        url: str,
+        request_options: dict,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Union[dict, str, None]:
+        """
+        Make a request to the ParityVend API through the concurrency limiter and the circuit breaker.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            endpoint_name (str): The name of the endpoint being called.
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the requests library.
+            priority (Priority, optional): The priority the call waits for a limiter slot with. Defaults to `Priority.INTERACTIVE`.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            RateLimitExceededError: If the rate limiter is out of tokens and does not wait.
+
+        Returns:
+            Union[dict, str, None]: The response from the API.
+        """
+        limiter = self.limiter
+        breaker = self.circuit_breaker
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if limiter:
+            limiter.acquire(priority)
+        if breaker and not breaker.allow_request():
+            if limiter:
+                limiter.release()
+            raise CircuitOpenError(
+                f"ParityVend API ({endpoint_name}) call was short-circuited, as the circuit breaker is open."
+            )
+
+        # the breaker and the limiter get the latency of the last attempt, without retry delays and hedging waits
+        timing = {}
+        started = time.monotonic()
+        try:
+            result = self.api_request(method, url, request_options, timing)
+        except BaseException as exc:
+            latency = timing.get("latency", time.monotonic() - started)
+            if breaker:
+                breaker.record(latency, exc)
+            if limiter:
+                limiter.release(latency, exc)
+            raise
+
+        latency = timing.get("latency", time.monotonic() - started)
+        if breaker:
+            breaker.record(latency)
+        if limiter:
+            limiter.release(latency)
+        if self.quota_manager and endpoint_name != "get-quota-info":
+            self.quota_manager.record_call()
+        return result
 
     def base_call(
         self,
@@ -150,7 +822,9 @@ class ParityVendAPI:
         cache_key: tuple,
         timeout: Union[int, float, None] = None,
         cache: bool = True,
-    ) -> Union[dict, str, None]:
+        deadline: Union[int, float, None] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Union[dict, str, int, None]:
         """
         Make a base call to the ParityVend API.
 
@@ -162,20 +836,61 @@ class ParityVendAPI:
             cache_key (tuple): A tuple representing the cache key for the request.
             timeout (Union[int, float, None], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Union[int, float, None], optional): The time budget (in seconds) for the whole call. When it passes, the fallback is returned and the call completes in the background. Defaults to None.
+            priority (Priority, optional): The priority of the call. Defaults to `Priority.INTERACTIVE`.
 
         Raises:
             QuotaExceededError: If the API returns an 'over_quota' error.
+            DeadlineExceededError: If the deadline passes and no fallback is configured.
+            QuotaReservedError: If the remaining quota is reserved for higher-priority calls and no fallback is configured.
 
         Returns:
-            Union[dict, str, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error).
+            Union[dict, str, int, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error). Cache hits return the cached value (see `get_cache_value`).
         """
+        started = time.monotonic()
+
         try:
             if cache:
                 cached_response = self.cache[cache_key]
+                if type(cached_response) is dict:
+                    # a raw payload, stored by a custom `cache_instance`
+                    return self.convert_result(endpoint_name, cached_response)
                 return cached_response
         except KeyError:
             pass
 
+        if not self._pollers_started:
+            self._start_pollers()
+
+        if self.quota_manager and self.quota_manager.is_cache_only(priority):
+            return self.get_fallback(
+                endpoint_name,
+                input_vars,
+                QuotaReservedError(
+                    f"ParityVend API ({endpoint_name}) call was not sent, as the remaining quota is reserved for higher-priority lookups."
+                ),
+            )
+
+        if deadline is not None:
+            return self.call_with_deadline(
+                functools.partial(
+                    self.base_call,
+                    method,
+                    endpoint_name,
+                    path,
+                    input_vars,
+                    cache_key,
+                    timeout,
+                    cache,
+                    None,
+                    priority,
+                ),
+                deadline - (time.monotonic() - started),
+                endpoint_name,
+                input_vars,
+                cache_key,
+            )
+
         request_options = {**self.request_options}
         if isinstance(timeout, (int, float)):
             request_options["timeout"] = timeout
@@ -186,8 +901,14 @@ class ParityVendAPI:
         }
 
         formatted_path = path.format_map(variables)
-        url = f"{API_URL}{formatted_path}"
-        result = self.api_request(method, url, request_options)
+        url = f"{self.get_api_url()}{formatted_path}"
+
+        try:
+            result = self.guarded_request(
+                method, endpoint_name, url, request_options, priority
+            )
+        except CircuitOpenError as exc:
+            return self.get_fallback(endpoint_name, input_vars, exc)
 
         if not result:
             return
@@ -197,10 +918,14 @@ class ParityVendAPI:
             return result
 
         if result.get("error_name") == "over_quota":
+            if self.quota_manager:
+                self.quota_manager.mark_exhausted()
             raise QuotaExceededError(
                 "Your account has exceeded the quota. Upgrade your billing plan to continue. View more information: https://www.ambeteco.com/ParityVend/docs/debugging_guide.html#over-quota"
             )
 
+        result = self.convert_result(endpoint_name, result)
+
         if result.get("status") == "error":
             if self.log_api_errors:
                 logger.error(
@@ -213,15 +938,184 @@ class ParityVendAPI:
             ):
                 self.cache[cache_key] = result
         else:
-            self.cache[cache_key] = result
+            self.cache[cache_key] = self.get_cache_value(endpoint_name, result)
 
         return result
 
+    def get_fallback(
+        self, endpoint_name: str, input_vars: dict, exc: Exception
+    ) -> Union[dict, str]:
+        """
+        Get the fallback payload for a call that cannot be answered by the API.
+
+        Args:
+            endpoint_name (str): The name of the endpoint being called.
+            input_vars (dict): The variables of the call.
+            exc (Exception): The error to raise if there is no fallback.
+
+        Raises:
+            Exception: `exc`, if no fallback is configured or it returns None.
+
+        Returns:
+            Union[dict, str]: The payload to use instead of the API response.
+        """
+        if self.fallback:
+            payload = self.fallback(endpoint_name, input_vars)
+            if payload is not None:
+                return self.convert_result(endpoint_name, payload)
+        raise exc
+
+    @staticmethod
+    def convert_result(
+        endpoint_name: str, result: Union[dict, str]
+    ) -> Union[FrozenResponse, str]:
+        """
+        Convert an API payload into the object that is cached and returned by the lookups.
+
+        The conversion runs once per API response: the country becomes a `Country`, the discounts a `Discounts`
+        snapshot (shared by the responses with the same discounts), the exchange rates an `ExchangeRates` table, and the
+        payload a `FrozenResponse`. A cache hit
+        returns the cached object as it is.
+
+        Args:
+            endpoint_name (str): The name of the endpoint the payload is from.
+            result (Union[dict, str]): The payload.
+
+        Returns:
+            Union[FrozenResponse, str]: The converted payload. HTML payloads are returned unchanged.
+        """
+        if not isinstance(result, dict):
+            return result
+
+        if endpoint_name == "get-country-from-ip":
+            if "country" in result:
+                result = {**result, "country": COUNTRIES[result["country"]]}
+        elif endpoint_name == "get-discounts-info":
+            if "discounts" in result:
+                discounts = Discounts.get_snapshot(result["discounts"])
+                result = {**result, "discounts": discounts}
+        elif endpoint_name == "get-exchange-rate-info":
+            if "rates" in result:
+                result = {**result, "rates": ExchangeRates(result["rates"])}
+        elif result.get("country"):
+            result = {**result, "country": COUNTRIES[result["country"]["code"]]}
+
+        return FrozenResponse(result)
+
+    @staticmethod
+    def get_cache_value(
+        endpoint_name: str, result: Union[FrozenResponse, str]
+    ) -> Union[FrozenResponse, str, int]:
+        """
+        Get the value to cache for a successful call.
+
+        A country lookup is cached as its country id (`Country.id`), a small integer that takes no memory of its own,
+        instead of a `FrozenResponse` per IP address. `get_country_from_ip` turns it back into the `Country`.
+
+        Args:
+            endpoint_name (str): The name of the endpoint the result is from.
+            result (Union[FrozenResponse, str]): The converted result (see `convert_result`).
+
+        Returns:
+            Union[FrozenResponse, str, int]: The value to store in the cache.
+        """
+        if endpoint_name == "get-country-from-ip":
+            country = result.get("country")
+            if type(country) is Country:
+                return country.id
+        return result
+
+    def call_with_deadline(
+        self,
+        call: Callable[[], Union[dict, str, None]],
+        remaining: Union[int, float],
+        endpoint_name: str,
+        input_vars: dict,
+        cache_key: tuple,
+    ) -> Union[dict, str, None]:
+        """
+        Run a call in the background and wait for it until the deadline passes.
+
+        Calls with the same cache key share one background request. A call that misses its deadline keeps running,
+        so its result still lands in the cache for the next lookup.
+
+        Args:
+            call (Callable[[], Union[dict, str, None]]): The call to run.
+            remaining (Union[int, float]): The time (in seconds) left until the deadline.
+            endpoint_name (str): The name of the endpoint being called.
+            input_vars (dict): The variables of the call.
+            cache_key (tuple): The cache key of the call.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes and no fallback is configured.
+
+        Returns:
+            Union[dict, str, None]: The result of the call, or the fallback payload if the deadline passed.
+        """
+        with self._deadline_lock:
+            future = self._deadline_pending.get(cache_key)
+            if future is None:
+                if self._deadline_executor is None:
+                    self._deadline_executor = ThreadPoolExecutor(
+                        thread_name_prefix="parityvend-deadline"
+                    )
+                future = self._deadline_executor.submit(call)
+                self._deadline_pending[cache_key] = future
+                future.add_done_callback(
+                    functools.partial(self._on_deadline_call_done, cache_key)
+                )
+
+        try:
+            result = future.result(timeout=max(0.0, remaining))
+        except concurrent.futures.TimeoutError:
+            return self._on_deadline_missed(future, endpoint_name, input_vars)
+
+        with self._deadline_lock:
+            self.deadline_stats["met"] += 1
+        return result
+
+    def _on_deadline_missed(
+        self, future, endpoint_name: str, input_vars: dict
+    ) -> Union[dict, str]:
+        with self._deadline_lock:
+            self.deadline_stats["missed"] += 1
+            self._deadline_missed.add(future)
+
+        return self.get_fallback(
+            endpoint_name,
+            input_vars,
+            DeadlineExceededError(
+                f"ParityVend API ({endpoint_name}) call did not complete within its deadline."
+            ),
+        )
+
+    def _on_deadline_call_done(self, cache_key: tuple, future):
+        with self._deadline_lock:
+            if self._deadline_pending.get(cache_key) is future:
+                del self._deadline_pending[cache_key]
+
+            if future not in self._deadline_missed:
+                return
+            self._deadline_missed.discard(future)
+
+            exc = None if future.cancelled() else future.exception()
+            if future.cancelled() or exc is not None:
+                self.deadline_stats["failed_late"] += 1
+            else:
+                self.deadline_stats["completed_late"] += 1
+
+        if exc is not None:
+            logger.error(
+                f"ParityVend API background call completed after its deadline with an error: {exc!r}"
+            )
+
     def get_country_from_ip(
         self,
         ip: Union[str, bytes, IPv4Address, IPv6Address],
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Country:
         """
         Get the country associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-country-from-ip-(private_key)-
@@ -230,6 +1124,8 @@ class ParityVendAPI:
             ip (Union[str, bytes, IPv4Address, IPv6Address]): The IP address to look up.
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Country: An object representing the country associated with the IP address.
@@ -244,9 +1140,14 @@ class ParityVendAPI:
             ("get-country-from-ip", ip),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        return COUNTRIES[result["country"]]
+        if type(result) is int:
+            # a cache hit, see `get_cache_value`
+            return COUNTRIES.get_by_id(result)
+        return result["country"]
 
     def get_discount_from_ip(
         self,
@@ -254,6 +1155,8 @@ class ParityVendAPI:
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Response:
         """
         Get the discount information associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-discount-from-ip-(private_key)-(opt.-base_currency)-
@@ -263,6 +1166,8 @@ class ParityVendAPI:
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Response: An object containing the discount information for the IP address.
@@ -270,6 +1175,22 @@ class ParityVendAPI:
         ip = self.auto_convert_ip(ip)
         base_currency = self.auto_convert_to_str(base_currency).upper()
 
+        if self.discount_composer and self.discount_composer.is_ready(base_currency):
+            result = self.compose_discount(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+            if result is not None:
+                return result
+        if (
+            self.base_currency_deriver
+            and base_currency != self.base_currency_deriver.source_currency
+        ):
+            result = self.derive_discount(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+            if result is not None:
+                return result
+
         result = self.base_call(
             "get",
             "get-discount-from-ip",
@@ -278,12 +1199,102 @@ class ParityVendAPI:
             ("get-discount-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if result["country"]:
-            result["country"] = COUNTRIES[result["country"]["code"]]
+        return result
+
+    def compose_discount(
+        self,
+        ip: str,
+        base_currency: str,
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Optional[Response]:
+        """
+        Answer a discount lookup with the `discount_composer`: look up the country of the IP address, then compose the response from the discounts and exchange rates tables.
+
+        Args:
+            ip (str): The IP address to look up.
+            base_currency (str): The base currency to use for exchange rates.
+            timeout (Optional[Union[int, float]], optional): The timeout value for the country lookup. Defaults to None.
+            cache (bool, optional): Whether to cache the country lookup. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the country lookup. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the country lookup. Defaults to `Priority.INTERACTIVE`.
+
+        Returns:
+            Optional[Response]: The discount information, or None if the lookup has to be sent to the API (the country lookup returned an error, or the tables are missing the exchange rate of the country's currency).
+        """
+        try:
+            country = self.get_country_from_ip(
+                ip, timeout, cache, deadline, priority
+            )
+        except KeyError:
+            # an error response (e.g., for an invalid IP address), let the API answer with its own error
+            return None
+        return self.discount_composer.compose(country, base_currency)
+
+    def derive_discount(
+        self,
+        ip: str,
+        base_currency: str,
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Optional[Response]:
+        """
+        Answer a discount lookup with the `base_currency_deriver`: look up the discount in its source currency, then convert the exchange rate to `base_currency`. The exchange rate table is fetched first if it is stale.
 
-        return Response(result)
+        Args:
+            ip (str): The IP address to look up.
+            base_currency (str): The base currency to use for exchange rates.
+            timeout (Optional[Union[int, float]], optional): The timeout value for the requests. Defaults to None.
+            cache (bool, optional): Whether to cache the discount lookup. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the discount lookup. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the discount lookup. Defaults to `Priority.INTERACTIVE`.
+
+        Returns:
+            Optional[Response]: The discount information, or None if the lookup has to be sent to the API (the exchange rate table is stale, or has no rate for `base_currency`).
+        """
+        deriver = self.base_currency_deriver
+        if deriver.is_stale():
+            if not deriver.claim_refresh():
+                return None
+            try:
+                rates_info = self.get_exchange_rate_info(
+                    deriver.source_currency, timeout, cache=False
+                )
+            except Exception as exc:
+                logger.warning(
+                    f"ParityVend API exchange rates ({deriver.source_currency}) could not be fetched: {exc!r}"
+                )
+                return None
+            deriver.update_rates(rates_info)
+
+        response = self.get_discount_from_ip(
+            ip, deriver.source_currency, timeout, cache, deadline, priority
+        )
+        return deriver.derive(response, base_currency)
+
+    def refresh_discount_tables(self):
+        """
+        Fetch the discounts and exchange rates tables of the `discount_composer`. The handler calls it in the background every `refresh_interval` seconds.
+        """
+        composer = self.discount_composer
+        composer.update_discounts(self.get_discounts_info(cache=False))
+        # one exchange rates table is rebased to the other base currencies it has
+        rates = None
+        for base_currency in composer.base_currencies:
+            if rates is not None and base_currency in rates:
+                rates_info = {"status": "ok", "rates": rates.rebase(base_currency)}
+            else:
+                rates_info = self.get_exchange_rate_info(base_currency, cache=False)
+                rates = rates_info.get("rates") or rates
+            composer.update_rates(base_currency, rates_info)
 
     def get_banner_from_ip(
         self,
@@ -291,6 +1302,8 @@ class ParityVendAPI:
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Union[str, Response]:
         """
         Get an HTML banner for the discount information associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-banner-from-ip-(private_key)-(opt.-base_currency)-
@@ -300,6 +1313,8 @@ class ParityVendAPI:
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Union[str, Response]: Either a string containing the HTML banner, or a Response object if no banner is available.
@@ -315,11 +1330,11 @@ class ParityVendAPI:
             ("get-banner-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if isinstance(result, str):
-            return result
-        return Response(result)
+        return result
 
     def get_discount_with_html_from_ip(
         self,
@@ -327,6 +1342,8 @@ class ParityVendAPI:
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Response:
         """
         Get the discount information and the HTML banner associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-discount-with-html-from-ip-(private_key)-(opt.-base_currency)-
@@ -336,6 +1353,8 @@ class ParityVendAPI:
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Response: An object containing the discount information and HTML banner for the IP address.
@@ -351,12 +1370,11 @@ class ParityVendAPI:
             ("get-discount-with-html-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if result["country"]:
-            result["country"] = COUNTRIES[result["country"]["code"]]
-
-        return Response(result)
+        return result
 
     def get_quota_info(
         self, timeout: Optional[Union[int, float]] = None, cache: bool = False
@@ -381,7 +1399,7 @@ class ParityVendAPI:
             cache,
         )
 
-        return Response(result)
+        return result
 
     def get_discounts_info(
         self, timeout: Optional[Union[int, float]] = None, cache: bool = True
@@ -406,8 +1424,7 @@ class ParityVendAPI:
             cache,
         )
 
-        result["discounts"] = Discounts(result["discounts"])
-        return Response(result)
+        return result
 
     def get_exchange_rate_info(
         self,
@@ -438,7 +1455,134 @@ class ParityVendAPI:
             cache,
         )
 
-        return Response(result)
+        return result
+
+    def get_countries_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Country, Exception]]:
+        """
+        Get the countries associated with many IP addresses. The lookups run concurrently on a thread pool, sharing the handler's cache and `limiter`.
+
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up.
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None (the `max_limit` of the handler's limiter, or 10).
+            return_exceptions (bool, optional): Whether to return the exception of a failed lookup in its place instead of raising it. Defaults to False.
+            priority (Priority, optional): The priority of the lookups. Defaults to `Priority.BACKGROUND`.
+
+        Returns:
+            List[Union[Country, Exception]]: The countries, in the order of `ips`.
+        """
+        return self.run_bulk(
+            functools.partial(
+                self.get_country_from_ip,
+                timeout=timeout,
+                cache=cache,
+                priority=priority,
+            ),
+            ips,
+            max_concurrency,
+            return_exceptions,
+        )
+
+    def get_discounts_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Response, Exception]]:
+        """
+        Get the discount information associated with many IP addresses. The lookups run concurrently on a thread pool, sharing the handler's cache and `limiter`.
+
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up.
+            base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None (the `max_limit` of the handler's limiter, or 10).
+            return_exceptions (bool, optional): Whether to return the exception of a failed lookup in its place instead of raising it. Defaults to False.
+            priority (Priority, optional): The priority of the lookups. Defaults to `Priority.BACKGROUND`.
+
+        Returns:
+            List[Union[Response, Exception]]: The discount information, in the order of `ips`.
+        """
+        return self.run_bulk(
+            functools.partial(
+                self.get_discount_from_ip,
+                base_currency=base_currency,
+                timeout=timeout,
+                cache=cache,
+                priority=priority,
+            ),
+            ips,
+            max_concurrency,
+            return_exceptions,
+        )
+
+    def run_bulk(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """
+        Run a lookup for many items concurrently on a thread pool.
+
+        Args:
+            func (Callable[[Any], Any]): The lookup, called with one item.
+            items (Iterable): The items to look up.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None.
+            return_exceptions (bool, optional): Whether to return exceptions in place of results. Defaults to False (the
+                first exception is raised, and the lookups that have not started yet are cancelled).
+
+        Returns:
+            list: The results, in the order of `items`.
+        """
+
+        def run(item):
+            try:
+                return func(item)
+            except Exception as exc:
+                if return_exceptions:
+                    return exc
+                raise
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_concurrency or self.get_default_bulk_concurrency(),
+            thread_name_prefix="parityvend-bulk",
+        )
+        futures = [executor.submit(run, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        finally:
+            # after a failure, the lookups that have not started are cancelled instead of spending quota on a failed
+            # batch, and only the running ones are waited for (`shutdown(cancel_futures=True)` needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def get_default_bulk_concurrency(self) -> int:
+        """
+        Get the default number of lookups the bulk methods run at once.
+
+        Returns:
+            int: The `max_limit` of the handler's limiter, or 10 without a limiter.
+        """
+        if self.limiter:
+            return self.limiter.max_limit
+        return 10
 
     @staticmethod
     def auto_convert_ip(ip: Union[str, bytes, IPv4Address, IPv6Address]) -> str:
@@ -1,19 +1,48 @@
 import asyncio
-import json
+import contextlib
+import functools
 import logging
 import platform
+import threading
+import time
 from ipaddress import IPv4Address, IPv6Address
-from typing import Callable, Optional, Union
-
-import aiohttp
-import aiohttp.client
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from .balancer import URLBalancer
 from .cache.default import DefaultCache
 from .cache.interface import CacheInterface
-from .config import API_URL
-from .exceptions import APIError, ConnectionError, ProcessingError, QuotaExceededError
-from .handler import ParityVendAPI
-from .objects import COUNTRIES, Country, Discounts, Response
+from .circuit import CircuitBreaker
+from .compose import BaseCurrencyDeriver, DiscountComposer
+from .decoders import get_default_json_loads, get_json_decode_errors
+from .exceptions import (
+    APIError,
+    CircuitOpenError,
+    ConnectionError,
+    DeadlineExceededError,
+    ProcessingError,
+    QuotaExceededError,
+    QuotaReservedError,
+)
+from .hedging import HedgePolicy
+from .handler import ParityVendAPI, _clients, _copy_timing
+from .limiter import AdaptiveLimiter
+from .objects import COUNTRIES, Country, Response
+from .priority import Priority
+from .quota import QuotaManager
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+
+if TYPE_CHECKING:
+    import aiohttp
 
 if platform.system() == "Windows":
     # https://stackoverflow.com/questions/63860576/asyncio-event-loop-is-closed-when-using-asyncio-run
@@ -22,6 +51,29 @@ if platform.system() == "Windows":
 
 logger = logging.getLogger("parityvend")
 
+# aiohttp sessions inherited from the parent process, see `AsyncParityVendAPI._after_fork`
+_inherited_sessions: list = []
+
+
+def _import_aiohttp():
+    # `aiohttp` is imported when the first client is created, so that sync-only applications never import it
+    global aiohttp
+    import aiohttp
+    import aiohttp.client
+
+
+class _LoopSession:
+    # the aiohttp session of one event loop and the requests in flight on it
+    __slots__ = ("session", "inflight", "idle", "tasks", "closing")
+
+    def __init__(self, session: "aiohttp.ClientSession"):
+        self.session = session
+        self.inflight = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.tasks = set()
+        self.closing = False
+
 
 class AsyncParityVendAPI(ParityVendAPI):
     def __init__(
@@ -30,10 +82,30 @@ class AsyncParityVendAPI(ParityVendAPI):
         request_options: Optional[dict] = None,
         cache_instance: Optional[CacheInterface] = None,
         cache_options: Optional[dict] = None,
-        json_loads: Optional[Callable[[str], dict]] = None,
+        json_loads: Optional[Callable[[Union[str, bytes]], dict]] = None,
         cache_on_error: bool = True,
         log_api_errors: bool = True,
         raise_exc_on_error: bool = True,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[Union[int, float]] = None,
+        dns_cache_ttl: Optional[int] = None,
+        prewarm_connections: int = 0,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        fallback: Optional[Callable[[str, dict], Union[dict, str, None]]] = None,
+        deadline: Optional[Union[int, float]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        quota_manager: Optional[QuotaManager] = None,
+        api_urls: Optional[Union[Iterable[str], URLBalancer]] = None,
+        connect_timeout: Optional[Union[int, float]] = None,
+        read_timeout: Optional[Union[int, float]] = None,
+        discount_composer: Optional[DiscountComposer] = None,
+        base_currency_deriver: Optional[BaseCurrencyDeriver] = None,
     ):
         """
         Initialize the AsyncParityVendAPI object.
@@ -43,10 +115,30 @@ class AsyncParityVendAPI(ParityVendAPI):
             request_options (Optional[dict], optional): Additional options to pass to the aiohttp library. Defaults to None.
             cache_instance (Optional[CacheInterface], optional): An instance of a custom cache implementation. Defaults to None.
             cache_options (Optional[dict], optional): Options to pass to the default cache implementation. Defaults to None.
-            json_loads (Optional[Callable[[str], dict]], optional): A custom function to use for loading JSON data. Defaults to None.
+            json_loads (Optional[Callable[[Union[str, bytes]], dict]], optional): A custom function to use for loading JSON data. It receives the response text (`str`), and should raise `json.JSONDecodeError` (or a subclass) for a malformed payload, which becomes an `APIError`. Defaults to None (`orjson` or `msgspec` when installed, otherwise `json.loads`, which parse the raw response bytes).
             cache_on_error (bool, optional): Whether to cache API responses on error. Defaults to True.
             log_api_errors (bool, optional): Whether to log API errors. Defaults to True.
             raise_exc_on_error (bool, optional): Whether to raise an exception on API errors. Defaults to True.
+            pool_connections (Optional[int], optional): Not used by the asynchronous handler, as `aiohttp` keeps a single connection pool. Defaults to None.
+            pool_maxsize (Optional[int], optional): The maximum number of simultaneous connections (`limit` of the connector). Defaults to None (transport default).
+            pool_block (bool, optional): Not used by the asynchronous handler, as `aiohttp` always waits for a free connection. Defaults to False.
+            limit_per_host (Optional[int], optional): The maximum number of simultaneous connections to one host. Defaults to None (no limit).
+            keepalive_timeout (Optional[Union[int, float]], optional): How long (in seconds) an idle connection is kept alive. Defaults to None (transport default).
+            dns_cache_ttl (Optional[int], optional): How long (in seconds) resolved DNS entries are cached. Defaults to None (transport default).
+            prewarm_connections (int, optional): The number of connections to open in advance (during `init`), so that the first requests skip the TCP and TLS handshakes. Defaults to 0.
+            retry_policy (Optional[RetryPolicy], optional): When and how to retry failed requests. Defaults to None (no retries).
+            circuit_breaker (Optional[CircuitBreaker], optional): A circuit breaker that short-circuits calls while the API is degraded. Defaults to None.
+            fallback (Optional[Callable[[str, dict], Union[dict, str, None]]], optional): A function called with the endpoint name and the call variables when a call is short-circuited. It returns the payload to use instead (e.g., `no_discount_fallback`), or None to raise. Defaults to None.
+            deadline (Optional[Union[int, float]], optional): The default time budget (in seconds) of the `get_*_from_ip` methods. See their `deadline` argument. Defaults to None (no deadline).
+            hedge_policy (Optional[HedgePolicy], optional): When to send a second, identical request for a slow one. Defaults to None (no hedging).
+            limiter (Optional[AdaptiveLimiter], optional): A concurrency limiter every API call takes a slot from. It can be shared between handlers. Defaults to None (no limit).
+            rate_limiter (Optional[RateLimiter], optional): A token bucket every request to the API takes a token from. It can be process-local or shared between processes. Defaults to None (no limit).
+            quota_manager (Optional[QuotaManager], optional): A quota manager that polls `get_quota_info` in the background and switches background lookups to cache-only mode when the quota runs low. Defaults to None.
+            api_urls (Optional[Union[Iterable[str], URLBalancer]], optional): Base URLs (like regional proxies or mirrors) to spread requests over instead of `API_URL`, picking the faster healthy one and failing over on connection errors. A `URLBalancer` can be passed to tune it or share it between handlers. Defaults to None (`API_URL` only).
+            connect_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for a connection to the API to be established. Defaults to None (no limit).
+            read_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for the next piece of data from the API. Defaults to None (no limit).
+            discount_composer (Optional[DiscountComposer], optional): Keeps the discounts and exchange rates tables, refreshed in the background, and answers `get_discount_from_ip` from them and the country of the IP address, without a `get-discount-from-ip` call. Defaults to None.
+            base_currency_deriver (Optional[BaseCurrencyDeriver], optional): Derives `get_discount_from_ip` responses in other base currencies from the cached response in its source currency and an exchange rate table, instead of calling the API for every base currency. Defaults to None.
         """
         self.private_key: str = private_key
 
@@ -63,34 +155,369 @@ class AsyncParityVendAPI(ParityVendAPI):
 
             self.cache: CacheInterface = DefaultCache(**self.cache_options)
 
-        self.json_loads: Callable[[str], dict] = json.loads
+        self.json_loads: Callable[[Union[str, bytes]], dict] = get_default_json_loads()
+        # the built-in decoders parse the raw bytes, a custom one gets the text, as it always did
+        self._json_loads_text: bool = False
         if json_loads:
-            self.json_loads: Callable[[str], dict] = json_loads
-
-        self.session: Optional[aiohttp.ClientSession] = None
+            self.json_loads: Callable[[Union[str, bytes]], dict] = json_loads
+            self._json_loads_text = True
 
         self.cache_on_error: bool = cache_on_error
         self.log_api_errors: bool = log_api_errors
         self.raise_exc_on_error: bool = raise_exc_on_error
 
+        self.pool_connections: Optional[int] = pool_connections
+        self.pool_maxsize: Optional[int] = pool_maxsize
+        self.pool_block: bool = pool_block
+        self.limit_per_host: Optional[int] = limit_per_host
+        self.keepalive_timeout: Optional[Union[int, float]] = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.connect_timeout: Optional[Union[int, float]] = connect_timeout
+        self.read_timeout: Optional[Union[int, float]] = read_timeout
+        self.prewarm_connections: int = prewarm_connections
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        self.fallback: Optional[Callable[[str, dict], Union[dict, str, None]]] = fallback
+
+        self.deadline: Optional[Union[int, float]] = deadline
+        self.hedge_policy: Optional[HedgePolicy] = hedge_policy
+        self.limiter: Optional[AdaptiveLimiter] = limiter
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.quota_manager: Optional[QuotaManager] = quota_manager
+        self.discount_composer: Optional[DiscountComposer] = discount_composer
+        self.base_currency_deriver: Optional[BaseCurrencyDeriver] = (
+            base_currency_deriver
+        )
+        if api_urls is not None and not isinstance(api_urls, URLBalancer):
+            api_urls = URLBalancer(api_urls)
+        self.url_balancer: Optional[URLBalancer] = api_urls
+        self.deadline_stats: dict = {
+            "met": 0,
+            "missed": 0,
+            "completed_late": 0,
+            "failed_late": 0,
+        }
+        self._create_runtime_state()
+
+    _runtime_attributes = (
+        "_loop_sessions",
+        "_loop_sessions_lock",
+        "_quota_task",
+        "_composer_task",
+        "_deadline_lock",
+        "_deadline_pending",
+        "_deadline_missed",
+    )
+
+    def _create_runtime_state(self, start_pollers: bool = True):
+        """
+        Create the per-process state: the session registry and the locks. Sessions and the quota and discount tables
+        pollers are created on first use in each event loop.
+
+        Args:
+            start_pollers (bool, optional): Unused, the pollers are always started on first use. Defaults to True.
+        """
+        _import_aiohttp()
+        self._loop_sessions: dict = {}
+        self._loop_sessions_lock = threading.Lock()
+        self._quota_task: Optional[asyncio.Task] = None
+        self._composer_task: Optional[asyncio.Task] = None
+        self._deadline_lock = threading.Lock()
+        self._deadline_pending: dict = {}
+        self._deadline_missed: set = set()
+        _clients.add(self)
+
+    def _after_fork(self):
+        # closing the parent's sessions would shut down its connections, so keep them alive but unused
+        _inherited_sessions.extend(
+            loop_session.session for loop_session in self._loop_sessions.values()
+        )
+        super()._after_fork()
+
+    def __enter__(self):
+        raise TypeError(
+            '"AsyncParityVendAPI" is an asynchronous context manager, use "async with".'
+        )
+
+    def close(self):
+        raise TypeError(
+            '"AsyncParityVendAPI" is closed with "await aclose()" or "await deinit()".'
+        )
+
+    async def __aenter__(self) -> "AsyncParityVendAPI":
+        await self.init()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @property
+    def session(self) -> Optional["aiohttp.ClientSession"]:
+        """The aiohttp session of the running event loop, or None if it has not been created yet."""
+        loop_session = self._get_loop_session()
+        return loop_session.session if loop_session else None
+
     async def init(self):
         self._ensure_aiohttp_ready()
 
+        if self.prewarm_connections:
+            await self.warm_up()
+
+    async def warm_up(self, connections: Optional[int] = None) -> int:
+        """
+        Open connections to the ParityVend API in advance and return them to the pool.
+
+        The warm-up requests go to the API root, so they do not use your quota. With `api_urls`, the connections are
+        spread over all the base URLs.
+
+        Args:
+            connections (Optional[int], optional): The number of connections to open. Defaults to `prewarm_connections`.
+
+        Returns:
+            int: The number of connections that were opened successfully.
+        """
+        connections = connections or self.prewarm_connections
+        if not connections:
+            return 0
+
+        self._ensure_aiohttp_ready()
+
+        request_options = {**self.request_options}
+        request_options.setdefault("timeout", aiohttp.ClientTimeout(total=10))
+
+        async def warm_one(url: str) -> bool:
+            try:
+                async with self.session.head(f"{url}/", **request_options):
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return False
+
+        urls = self.get_api_urls()
+        results = await asyncio.gather(
+            *(warm_one(urls[index % len(urls)]) for index in range(connections))
+        )
+        warmed = sum(results)
+
+        if warmed < connections:
+            logger.warning(
+                f"ParityVend API warm-up opened {warmed} of {connections} connections."
+            )
+        return warmed
+
     async def deinit(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """
+        Close the client right away: stop the quota and discount tables pollers and close the sessions of all event
+        loops. Unlike `aclose`, the requests in flight are neither waited for nor cancelled.
+        """
+        await self._close_sessions()
+
+    async def aclose(self, drain_timeout: Optional[Union[int, float]] = 10.0):
+        """
+        Close the client gracefully.
+
+        Waits for the requests in flight on the running event loop, including the background completions of lookups
+        that missed their deadline, then stops the quota and discount tables pollers and closes the sessions of all
+        event loops. Requests still in flight after `drain_timeout` are cancelled and fail with a `ConnectionError`.
+
+        Args:
+            drain_timeout (Optional[Union[int, float]], optional): How long (in seconds) to wait for the requests in flight. Defaults to 10.0. None waits as long as needed.
+        """
+        loop = asyncio.get_running_loop()
+
+        loop_session = self._get_loop_session()
+        if loop_session and loop_session.inflight:
+            try:
+                await asyncio.wait_for(loop_session.idle.wait(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"ParityVend API client closed with {loop_session.inflight} requests in flight."
+                )
+                loop_session.closing = True
+                for task in loop_session.tasks:
+                    task.cancel()
+                await loop_session.idle.wait()
+
+        await self._close_sessions()
+
+    async def _close_sessions(self):
+        # stops the pollers and closes the sessions of all event loops
+        loop = asyncio.get_running_loop()
+
+        for name in ("_quota_task", "_composer_task"):
+            task = getattr(self, name)
+            setattr(self, name, None)
+            if task and task.get_loop() is loop:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            elif task and not task.get_loop().is_closed():
+                task.get_loop().call_soon_threadsafe(task.cancel)
+
+        with self._loop_sessions_lock:
+            loop_sessions = self._loop_sessions
+            self._loop_sessions = {}
+
+        for session_loop, loop_session in loop_sessions.items():
+            if session_loop is loop:
+                await loop_session.session.close()
+            elif session_loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(
+                        loop_session.session.close(), session_loop
+                    )
+                )
+            else:
+                # nothing runs on the loop, so its session and connector are closed from here (the transports are
+                # closed when the loop runs again)
+                await loop_session.session.close()
 
     async def api_request(
-        self, method: str, url: str, request_options: dict
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
     ) -> Union[dict, str, None]:
         """
-        Make a request to the ParityVend API.
+        Make a request to the ParityVend API, retrying it according to `retry_policy` and failing over between
+        `api_urls` on connection errors.
 
         Args:
             method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
             url (str): The URL to send the request to.
             request_options (dict): Additional options to pass to the aiohttp library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
+
+        Raises:
+            APIError: If the API returns a non-200 status code or an invalid JSON payload.
+            ConnectionError: If there is an error connecting to the API.
+            ProcessingError: If there is an error with the input data.
+
+        Returns:
+            Union[dict, str, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error).
+        """
+        if not self.retry_policy and not self.url_balancer:
+            return await self.send_hedged_request(method, url, request_options, timing)
+
+        started = time.monotonic()
+        attempt = 1
+        tried = set()
+        while True:
+            try:
+                return await self.send_hedged_request(
+                    method, url, request_options, timing
+                )
+            except Exception as exc:
+                if self.url_balancer and isinstance(exc, ConnectionError):
+                    failover_url = self.url_balancer.get_failover_url(url, tried)
+                    if failover_url:
+                        logger.warning(
+                            f"ParityVend API ({method.upper()}: {url}) is unreachable, failing over to {failover_url}."
+                        )
+                        url = failover_url
+                        if self.rate_limiter:
+                            await self.rate_limiter.acquire_async(block=True)
+                        continue
+
+                if not self.retry_policy:
+                    raise
+                delay = self.retry_policy.get_retry_delay(
+                    exc, attempt, time.monotonic() - started
+                )
+                if delay is None:
+                    raise
+
+                logger.warning(
+                    f"ParityVend API ({method.upper()}: {url}) attempt {attempt} failed ({exc!r}), retrying in {delay:.3f}s."
+                )
+                await asyncio.sleep(delay)
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async(block=True)
+                attempt += 1
+                tried.clear()
+
+    async def send_hedged_request(
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
+    ) -> Union[dict, str, None]:
+        """
+        Send a request to the ParityVend API, hedging it with a second one if it is slow (see `hedge_policy`).
+
+        The first successful response wins and the other request is cancelled, releasing its connection.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the aiohttp library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
+
+        Returns:
+            Union[dict, str, None]: The response from the API.
+        """
+        policy = self.hedge_policy
+        if not policy:
+            return await self.send_request(method, url, request_options, timing)
+
+        started = time.monotonic()
+        first_timing, second_timing = {}, {}
+        first = asyncio.ensure_future(
+            self.send_request(method, url, request_options, first_timing)
+        )
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.get_delay())
+            if (
+                not done
+                and policy.try_hedge()
+                and (not self.rate_limiter or self.rate_limiter.try_acquire())
+            ):
+                tasks.add(
+                    asyncio.ensure_future(
+                        self.send_request(method, url, request_options, second_timing)
+                    )
+                )
+
+            pending = tasks
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            policy.record_hedge_win()
+                        policy.record_latency(time.monotonic() - started)
+                        _copy_timing(
+                            first_timing if task is first else second_timing, timing
+                        )
+                        return task.result()
+                    error = error or task.exception()
+            _copy_timing(first_timing, timing)
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            # wait for the cancelled requests to release their connections
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def send_request(
+        self,
+        method: str,
+        url: str,
+        request_options: dict,
+        timing: Optional[dict] = None,
+    ) -> Union[dict, str, None]:
+        """
+        Send a single request to the ParityVend API.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the aiohttp library.
+            timing (Optional[dict], optional): A dictionary that receives the duration (in seconds) of the last attempt as `"latency"`, without the retry delays. Defaults to None.
 
         Raises:
             APIError: If the API returns a non-200 status code or an invalid JSON payload.
@@ -102,19 +529,33 @@ class AsyncParityVendAPI(ParityVendAPI):
         """
         self._ensure_aiohttp_ready()
 
+        started = time.monotonic()
+        body = b""
         try:
-            async with aiohttp.client._RequestContextManager(
-                self.session._request(method.upper(), url, **request_options)
+            # leaving the block releases the connection, also on timeouts and cancellation
+            async with self.session.request(
+                method.upper(), url, **request_options
             ) as r:
+                if self.url_balancer:
+                    self.url_balancer.record(url, time.monotonic() - started)
+
+                body = await r.read()
                 if r.status != 200:
                     logger.error(
-                        f"ParityVend API ({method.upper()}: {url}) returned non-200 status code ({r.status_code=}). See API response below:\n{await r.text()}\n"
+                        f"ParityVend API ({method.upper()}: {url}) returned non-200 status code ({r.status=}). See API response below:\n{body.decode('utf8', errors='replace')}\n"
+                    )
+                    raise APIError(
+                        "ParityVend API returned non-200 status code.",
+                        status_code=r.status,
+                        retry_after=parse_retry_after(r.headers.get("Retry-After")),
                     )
-                    raise APIError("ParityVend API returned non-200 status code.")
 
                 if r.headers["Content-Type"] == "application/json":
-                    response_text = await r.text()
-                    result = self.json_loads(response_text)
+                    result = self.json_loads(
+                        body.decode(r.get_encoding())
+                        if self._json_loads_text
+                        else body
+                    )
 
                     if self.raise_exc_on_error and result["status"] == "error":
                         raise ProcessingError(
@@ -124,16 +565,87 @@ class AsyncParityVendAPI(ParityVendAPI):
                     return result
                 return await r.text()
 
-        except (aiohttp.ClientError, asyncio.TimeoutError):
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            if self.url_balancer:
+                self.url_balancer.record(url, exc=exc)
             raise ConnectionError(
                 "Not able to reach the ParityVend API. Check your internet connection."
             )
 
-        except json.JSONDecodeError:
+        except get_json_decode_errors():
+            # the response is closed by now, log the body that was read inside the block
             logger.error(
-                f"ParityVend API ({method.upper()}: {url}) returned invalid JSON payload ({r.status_code=}). See API response below:\n{await r.text()}\n"
+                f"ParityVend API ({method.upper()}: {url}) returned invalid JSON payload ({r.status=}). See API response below:\n{body.decode('utf8', errors='replace')}\n"
+            )
+            raise APIError(
+                "ParityVend API returned invalid JSON payload.",
+                status_code=r.status,
             )
-            raise APIError("ParityVend API returned invalid JSON payload.")
+
+        finally:
+            if timing is not None:
+                timing["latency"] = time.monotonic() - started
+
+    async def guarded_request(
+        self,
+        method: str,
+        endpoint_name: str,
+        url: str,
+        request_options: dict,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Union[dict, str, None]:
+        """
+        Make a request to the ParityVend API through the concurrency limiter and the circuit breaker.
+
+        Args:
+            method (str): The HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
+            endpoint_name (str): The name of the endpoint being called.
+            url (str): The URL to send the request to.
+            request_options (dict): Additional options to pass to the aiohttp library.
+            priority (Priority, optional): The priority the call waits for a limiter slot with. Defaults to `Priority.INTERACTIVE`.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            RateLimitExceededError: If the rate limiter is out of tokens and does not wait.
+
+        Returns:
+            Union[dict, str, None]: The response from the API.
+        """
+        limiter = self.limiter
+        breaker = self.circuit_breaker
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+        if limiter:
+            await limiter.acquire_async(priority)
+        if breaker and not breaker.allow_request():
+            if limiter:
+                limiter.release()
+            raise CircuitOpenError(
+                f"ParityVend API ({endpoint_name}) call was short-circuited, as the circuit breaker is open."
+            )
+
+        # the breaker and the limiter get the latency of the last attempt, without retry delays and hedging waits
+        timing = {}
+        started = time.monotonic()
+        try:
+            result = await self.api_request(method, url, request_options, timing)
+        except BaseException as exc:
+            latency = timing.get("latency", time.monotonic() - started)
+            if breaker:
+                breaker.record(latency, exc)
+            if limiter:
+                limiter.release(latency, exc)
+            raise
+
+        latency = timing.get("latency", time.monotonic() - started)
+        if breaker:
+            breaker.record(latency)
+        if limiter:
+            limiter.release(latency)
+        if self.quota_manager and endpoint_name != "get-quota-info":
+            self.quota_manager.record_call()
+        return result
 
     async def base_call(
         self,
@@ -144,7 +656,9 @@ class AsyncParityVendAPI(ParityVendAPI):
         cache_key: tuple,
         timeout: Union[int, float, None] = None,
         cache: bool = True,
-    ) -> Union[dict, str, None]:
+        deadline: Union[int, float, None] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Union[dict, str, int, None]:
         """
         Make a base call to the ParityVend API.
 
@@ -156,29 +670,61 @@ class AsyncParityVendAPI(ParityVendAPI):
             cache_key (tuple): A tuple representing the cache key for the request.
             timeout (Union[int, float, None], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Union[int, float, None], optional): The time budget (in seconds) for the whole call. When it passes, the fallback is returned and the call completes in the background. Defaults to None.
+            priority (Priority, optional): The priority of the call. Defaults to `Priority.INTERACTIVE`.
 
         Raises:
             QuotaExceededError: If the API returns an 'over_quota' error.
+            DeadlineExceededError: If the deadline passes and no fallback is configured.
+            QuotaReservedError: If the remaining quota is reserved for higher-priority calls and no fallback is configured.
 
         Returns:
-            Union[dict, str, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error).
+            Union[dict, str, int, None]: The response from the API, either as a dictionary (for JSON responses), a string (for non-JSON responses), or None (if there was an error). Cache hits return the cached value (see `get_cache_value`).
         """
+        started = time.monotonic()
+
         try:
             if cache:
                 cached_response = self.cache[cache_key]
+                if type(cached_response) is dict:
+                    # a raw payload, stored by a custom `cache_instance`
+                    return self.convert_result(endpoint_name, cached_response)
                 return cached_response
         except KeyError:
             pass
 
+        if self.quota_manager and self.quota_manager.is_cache_only(priority):
+            return self.get_fallback(
+                endpoint_name,
+                input_vars,
+                QuotaReservedError(
+                    f"ParityVend API ({endpoint_name}) call was not sent, as the remaining quota is reserved for higher-priority lookups."
+                ),
+            )
+
+        if deadline is not None:
+            return await self.call_with_deadline(
+                functools.partial(
+                    self.base_call,
+                    method,
+                    endpoint_name,
+                    path,
+                    input_vars,
+                    cache_key,
+                    timeout,
+                    cache,
+                    None,
+                    priority,
+                ),
+                deadline - (time.monotonic() - started),
+                endpoint_name,
+                input_vars,
+                cache_key,
+            )
+
         request_options = {**self.request_options}
         if isinstance(timeout, (int, float)):
-            request_options["timeout"] = timeout
-
-            # warning: aiohttp currently has bug related to the timeout
-            # a timeout raised can lead to a fail,
-            # which will raise an exception "Task was destroyed but it is pending!"
-            # see these: https://github.com/aio-libs/aiohttp/issues/7072
-            # https://github.com/aio-libs/aiohttp/pull/7608
+            request_options["timeout"] = self.get_client_timeout(timeout)
 
         variables = {
             "private_key": self.private_key,
@@ -186,8 +732,15 @@ class AsyncParityVendAPI(ParityVendAPI):
         }
 
         formatted_path = path.format_map(variables)
-        url = f"{API_URL}{formatted_path}"
-        result = await self.api_request(method, url, request_options)
+        url = f"{self.get_api_url()}{formatted_path}"
+
+        try:
+            with self._track_inflight():
+                result = await self.guarded_request(
+                    method, endpoint_name, url, request_options, priority
+                )
+        except CircuitOpenError as exc:
+            return self.get_fallback(endpoint_name, input_vars, exc)
 
         if not result:
             return
@@ -197,10 +750,14 @@ class AsyncParityVendAPI(ParityVendAPI):
             return result
 
         if result.get("error_name") == "over_quota":
+            if self.quota_manager:
+                self.quota_manager.mark_exhausted()
             raise QuotaExceededError(
                 "Your account has exceeded the quota. Upgrade your billing plan to continue. View more information: https://www.ambeteco.com/ParityVend/docs/debugging_guide.html#over-quota"
             )
 
+        result = self.convert_result(endpoint_name, result)
+
         if result.get("status") == "error":
             if self.log_api_errors:
                 logger.error(
@@ -213,15 +770,60 @@ class AsyncParityVendAPI(ParityVendAPI):
             ):
                 self.cache[cache_key] = result
         else:
-            self.cache[cache_key] = result
+            self.cache[cache_key] = self.get_cache_value(endpoint_name, result)
 
         return result
 
+    async def call_with_deadline(
+        self,
+        call: Callable[[], Awaitable[Union[dict, str, None]]],
+        remaining: Union[int, float],
+        endpoint_name: str,
+        input_vars: dict,
+        cache_key: tuple,
+    ) -> Union[dict, str, None]:
+        """
+        Run a call in a background task and wait for it until the deadline passes.
+
+        Calls with the same cache key share one background task. A call that misses its deadline keeps running,
+        so its result still lands in the cache for the next lookup.
+
+        Args:
+            call (Callable[[], Awaitable[Union[dict, str, None]]]): The call to run.
+            remaining (Union[int, float]): The time (in seconds) left until the deadline.
+            endpoint_name (str): The name of the endpoint being called.
+            input_vars (dict): The variables of the call.
+            cache_key (tuple): The cache key of the call.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes and no fallback is configured.
+
+        Returns:
+            Union[dict, str, None]: The result of the call, or the fallback payload if the deadline passed.
+        """
+        task = self._deadline_pending.get(cache_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(call())
+            self._deadline_pending[cache_key] = task
+            task.add_done_callback(
+                functools.partial(self._on_deadline_call_done, cache_key)
+            )
+
+        done, _ = await asyncio.wait({task}, timeout=max(0.0, remaining))
+        if not done:
+            return self._on_deadline_missed(task, endpoint_name, input_vars)
+
+        with self._deadline_lock:
+            self.deadline_stats["met"] += 1
+        return task.result()
+
     async def get_country_from_ip(
         self,
         ip: Union[str, bytes, IPv4Address, IPv6Address],
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Country:
         """
         Get the country associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-country-from-ip-(private_key)-
@@ -230,6 +832,8 @@ class AsyncParityVendAPI(ParityVendAPI):
             ip (Union[str, bytes, IPv4Address, IPv6Address]): The IP address to look up.
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Country: An object representing the country associated with the IP address.
@@ -244,8 +848,13 @@ class AsyncParityVendAPI(ParityVendAPI):
             ("get-country-from-ip", ip),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
-        return COUNTRIES[result["country"]]
+        if type(result) is int:
+            # a cache hit, see `get_cache_value`
+            return COUNTRIES.get_by_id(result)
+        return result["country"]
 
     async def get_discount_from_ip(
         self,
@@ -253,6 +862,8 @@ class AsyncParityVendAPI(ParityVendAPI):
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Response:
         """
         Get the discount information associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-discount-from-ip-(private_key)-(opt.-base_currency)-
@@ -262,6 +873,8 @@ class AsyncParityVendAPI(ParityVendAPI):
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Response: An object containing the discount information for the IP address.
@@ -269,6 +882,22 @@ class AsyncParityVendAPI(ParityVendAPI):
         ip = self.auto_convert_ip(ip)
         base_currency = self.auto_convert_to_str(base_currency).upper()
 
+        if self.discount_composer and self.discount_composer.is_ready(base_currency):
+            result = await self.compose_discount(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+            if result is not None:
+                return result
+        if (
+            self.base_currency_deriver
+            and base_currency != self.base_currency_deriver.source_currency
+        ):
+            result = await self.derive_discount(
+                ip, base_currency, timeout, cache, deadline, priority
+            )
+            if result is not None:
+                return result
+
         result = await self.base_call(
             "get",
             "get-discount-from-ip",
@@ -277,12 +906,104 @@ class AsyncParityVendAPI(ParityVendAPI):
             ("get-discount-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if result["country"]:
-            result["country"] = COUNTRIES[result["country"]["code"]]
+        return result
+
+    async def compose_discount(
+        self,
+        ip: str,
+        base_currency: str,
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Optional[Response]:
+        """
+        Answer a discount lookup with the `discount_composer`: look up the country of the IP address, then compose the response from the discounts and exchange rates tables.
+
+        Args:
+            ip (str): The IP address to look up.
+            base_currency (str): The base currency to use for exchange rates.
+            timeout (Optional[Union[int, float]], optional): The timeout value for the country lookup. Defaults to None.
+            cache (bool, optional): Whether to cache the country lookup. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the country lookup. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the country lookup. Defaults to `Priority.INTERACTIVE`.
+
+        Returns:
+            Optional[Response]: The discount information, or None if the lookup has to be sent to the API (the country lookup returned an error, or the tables are missing the exchange rate of the country's currency).
+        """
+        try:
+            country = await self.get_country_from_ip(
+                ip, timeout, cache, deadline, priority
+            )
+        except KeyError:
+            # an error response (e.g., for an invalid IP address), let the API answer with its own error
+            return None
+        return self.discount_composer.compose(country, base_currency)
+
+    async def derive_discount(
+        self,
+        ip: str,
+        base_currency: str,
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Optional[Response]:
+        """
+        Answer a discount lookup with the `base_currency_deriver`: look up the discount in its source currency, then convert the exchange rate to `base_currency`. The exchange rate table is fetched first if it is stale.
+
+        Args:
+            ip (str): The IP address to look up.
+            base_currency (str): The base currency to use for exchange rates.
+            timeout (Optional[Union[int, float]], optional): The timeout value for the requests. Defaults to None.
+            cache (bool, optional): Whether to cache the discount lookup. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the discount lookup. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the discount lookup. Defaults to `Priority.INTERACTIVE`.
+
+        Returns:
+            Optional[Response]: The discount information, or None if the lookup has to be sent to the API (the exchange rate table is stale, or has no rate for `base_currency`).
+        """
+        deriver = self.base_currency_deriver
+        if deriver.is_stale():
+            if not deriver.claim_refresh():
+                return None
+            try:
+                rates_info = await self.get_exchange_rate_info(
+                    deriver.source_currency, timeout, cache=False
+                )
+            except Exception as exc:
+                logger.warning(
+                    f"ParityVend API exchange rates ({deriver.source_currency}) could not be fetched: {exc!r}"
+                )
+                return None
+            deriver.update_rates(rates_info)
+
+        response = await self.get_discount_from_ip(
+            ip, deriver.source_currency, timeout, cache, deadline, priority
+        )
+        return deriver.derive(response, base_currency)
 
-        return Response(result)
+    async def refresh_discount_tables(self):
+        """
+        Fetch the discounts and exchange rates tables of the `discount_composer`. The handler calls it in the background every `refresh_interval` seconds.
+        """
+        composer = self.discount_composer
+        composer.update_discounts(await self.get_discounts_info(cache=False))
+        # one exchange rates table is rebased to the other base currencies it has
+        rates = None
+        for base_currency in composer.base_currencies:
+            if rates is not None and base_currency in rates:
+                rates_info = {"status": "ok", "rates": rates.rebase(base_currency)}
+            else:
+                rates_info = await self.get_exchange_rate_info(
+                    base_currency, cache=False
+                )
+                rates = rates_info.get("rates") or rates
+            composer.update_rates(base_currency, rates_info)
 
     async def get_banner_from_ip(
         self,
@@ -290,6 +1011,8 @@ class AsyncParityVendAPI(ParityVendAPI):
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Union[str, Response]:
         """
         Get an HTML banner for the discount information associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-banner-from-ip-(private_key)-(opt.-base_currency)-
@@ -299,6 +1022,8 @@ class AsyncParityVendAPI(ParityVendAPI):
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Union[str, Response]: Either a string containing the HTML banner, or a Response object if no banner is available.
@@ -314,11 +1039,11 @@ class AsyncParityVendAPI(ParityVendAPI):
             ("get-banner-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if isinstance(result, str):
-            return result
-        return Response(result)
+        return result
 
     async def get_discount_with_html_from_ip(
         self,
@@ -326,6 +1051,8 @@ class AsyncParityVendAPI(ParityVendAPI):
         base_currency: Union[str, bytes] = "USD",
         timeout: Optional[Union[int, float]] = None,
         cache: bool = True,
+        deadline: Optional[Union[int, float]] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> Response:
         """
         Get the discount information and the HTML banner associated with an IP address. View the API docs here: https://www.ambeteco.com/ParityVend/docs/api_reference.html#get--backend-get-discount-with-html-from-ip-(private_key)-(opt.-base_currency)-
@@ -335,6 +1062,8 @@ class AsyncParityVendAPI(ParityVendAPI):
             base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
             timeout (Optional[Union[int, float]], optional): The timeout value for the request. Defaults to None.
             cache (bool, optional): Whether to cache the response. Defaults to True.
+            deadline (Optional[Union[int, float]], optional): The time budget (in seconds) for the whole lookup, including the cache, retries and network. When it passes, the `fallback` result is returned instead, while the request completes in the background and fills the cache. Defaults to None (the handler's `deadline`).
+            priority (Priority, optional): The priority of the lookup. Background lookups wait behind interactive ones for a limiter slot and are answered from the cache only when the quota runs low. Defaults to `Priority.INTERACTIVE`.
 
         Returns:
             Response: An object containing the discount information and HTML banner for the IP address.
@@ -350,12 +1079,11 @@ class AsyncParityVendAPI(ParityVendAPI):
             ("get-discount-with-html-from-ip", ip, base_currency),
             timeout,
             cache,
+            self.deadline if deadline is None else deadline,
+            priority,
         )
 
-        if result["country"]:
-            result["country"] = COUNTRIES[result["country"]["code"]]
-
-        return Response(result)
+        return result
 
     async def get_quota_info(
         self, timeout: Optional[Union[int, float]] = None, cache: bool = False
@@ -380,7 +1108,7 @@ class AsyncParityVendAPI(ParityVendAPI):
             cache,
         )
 
-        return Response(result)
+        return result
 
     async def get_discounts_info(
         self, timeout: Optional[Union[int, float]] = None, cache: bool = True
@@ -405,8 +1133,7 @@ class AsyncParityVendAPI(ParityVendAPI):
             cache,
         )
 
-        result["discounts"] = Discounts(result["discounts"])
-        return Response(result)
+        return result
 
     async def get_exchange_rate_info(
         self,
@@ -437,10 +1164,222 @@ class AsyncParityVendAPI(ParityVendAPI):
             cache,
         )
 
-        return Response(result)
+        return result
 
-    def _ensure_aiohttp_ready(self):
-        if self.session:
-            return
+    async def get_countries_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Country, Exception]]:
+        """
+        Get the countries associated with many IP addresses. The lookups run concurrently as tasks, sharing the handler's cache and `limiter`.
+
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up.
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None (the `max_limit` of the handler's limiter, or 10).
+            return_exceptions (bool, optional): Whether to return the exception of a failed lookup in its place instead of raising it. Defaults to False.
+            priority (Priority, optional): The priority of the lookups. Defaults to `Priority.BACKGROUND`.
+
+        Returns:
+            List[Union[Country, Exception]]: The countries, in the order of `ips`.
+        """
+        return await self.run_bulk(
+            functools.partial(
+                self.get_country_from_ip,
+                timeout=timeout,
+                cache=cache,
+                priority=priority,
+            ),
+            ips,
+            max_concurrency,
+            return_exceptions,
+        )
+
+    async def get_discounts_from_ips(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[Union[Response, Exception]]:
+        """
+        Get the discount information associated with many IP addresses. The lookups run concurrently as tasks, sharing the handler's cache and `limiter`.
 
-        self.session = aiohttp.ClientSession()
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up.
+            base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None (the `max_limit` of the handler's limiter, or 10).
+            return_exceptions (bool, optional): Whether to return the exception of a failed lookup in its place instead of raising it. Defaults to False.
+            priority (Priority, optional): The priority of the lookups. Defaults to `Priority.BACKGROUND`.
+
+        Returns:
+            List[Union[Response, Exception]]: The discount information, in the order of `ips`.
+        """
+        return await self.run_bulk(
+            functools.partial(
+                self.get_discount_from_ip,
+                base_currency=base_currency,
+                timeout=timeout,
+                cache=cache,
+                priority=priority,
+            ),
+            ips,
+            max_concurrency,
+            return_exceptions,
+        )
+
+    async def run_bulk(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """
+        Run a lookup for many items concurrently.
+
+        Args:
+            func (Callable[[Any], Awaitable[Any]]): The lookup, called with one item.
+            items (Iterable): The items to look up.
+            max_concurrency (Optional[int], optional): The maximum number of lookups running at once. Defaults to None.
+            return_exceptions (bool, optional): Whether to return exceptions in place of results. Defaults to False (the
+                first exception is raised, and the lookups that have not finished yet are cancelled).
+
+        Returns:
+            list: The results, in the order of `items`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.get_default_bulk_concurrency())
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            # the lookups that have not finished are cancelled instead of spending quota on a failed batch
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def _get_loop_session(self) -> Optional[_LoopSession]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return self._loop_sessions.get(loop)
+
+    def _ensure_aiohttp_ready(self) -> _LoopSession:
+        loop = asyncio.get_running_loop()
+        with self._loop_sessions_lock:
+            loop_session = self._loop_sessions.get(loop)
+            if loop_session:
+                return loop_session
+
+            # sessions of closed loops cannot be used or closed anymore
+            for closed_loop in [key for key in self._loop_sessions if key.is_closed()]:
+                del self._loop_sessions[closed_loop]
+
+            loop_session = _LoopSession(
+                aiohttp.ClientSession(
+                    connector=self._create_connector(),
+                    timeout=self.get_client_timeout(),
+                )
+            )
+            self._loop_sessions[loop] = loop_session
+
+        if self._quota_task and (
+            self._quota_task.done() or self._quota_task.get_loop().is_closed()
+        ):
+            self._quota_task = None
+        if self.quota_manager and not self._quota_task:
+            self._quota_task = asyncio.ensure_future(
+                self.quota_manager.poll_forever_async(
+                    functools.partial(self.get_quota_info, cache=False)
+                )
+            )
+
+        if self._composer_task and (
+            self._composer_task.done() or self._composer_task.get_loop().is_closed()
+        ):
+            self._composer_task = None
+        if self.discount_composer and not self._composer_task:
+            self._composer_task = asyncio.ensure_future(
+                self.discount_composer.refresh_forever_async(
+                    self.refresh_discount_tables
+                )
+            )
+        return loop_session
+
+    @contextlib.contextmanager
+    def _track_inflight(self):
+        loop_session = self._ensure_aiohttp_ready()
+        task = asyncio.current_task()
+        loop_session.inflight += 1
+        loop_session.tasks.add(task)
+        loop_session.idle.clear()
+        try:
+            yield
+        except asyncio.CancelledError:
+            if not loop_session.closing:
+                raise
+            # cancelled by `aclose`, not by the caller
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+            raise ConnectionError(
+                "The ParityVend API client was closed before the request completed."
+            ) from None
+        finally:
+            loop_session.inflight -= 1
+            loop_session.tasks.discard(task)
+            if not loop_session.inflight:
+                loop_session.idle.set()
+
+    def get_client_timeout(
+        self, total: Optional[Union[int, float]] = None
+    ) -> "aiohttp.ClientTimeout":
+        """
+        Get the `aiohttp.ClientTimeout` for a request, combining the total limit with `connect_timeout` and `read_timeout`.
+
+        Args:
+            total (Optional[Union[int, float]], optional): The time limit (in seconds) for the whole request, including waiting for a pooled connection. Defaults to None (the aiohttp default of 5 minutes).
+
+        Returns:
+            aiohttp.ClientTimeout: The timeout to pass to aiohttp.
+        """
+        return aiohttp.ClientTimeout(
+            total=aiohttp.client.DEFAULT_TIMEOUT.total if total is None else total,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+    def _create_connector(self) -> "aiohttp.TCPConnector":
+        """
+        Create an `aiohttp.TCPConnector` sized according to the pool options.
+
+        Returns:
+            aiohttp.TCPConnector: The configured connector.
+        """
+        connector_options = {}
+        if self.pool_maxsize is not None:
+            connector_options["limit"] = self.pool_maxsize
+        if self.limit_per_host is not None:
+            connector_options["limit_per_host"] = self.limit_per_host
+        if self.keepalive_timeout is not None:
+            connector_options["keepalive_timeout"] = self.keepalive_timeout
+        if self.dns_cache_ttl is not None:
+            connector_options["ttl_dns_cache"] = self.dns_cache_ttl
+        return aiohttp.TCPConnector(**connector_options)
@@ -0,0 +1,132 @@
+import collections
+import math
+import threading
+from typing import Optional
+
+
+class HedgePolicy:
+    """
+    A class describing when a slow request is hedged with a second, identical one.
+
+    A request that has not completed after the `percentile` of the recently observed latencies gets a duplicate sent
+    on another pooled connection. The first successful response wins and the other request is cancelled. To keep
+    the quota use bounded, at most `budget` (a share of all requests) may be hedged.
+
+    The policy is thread-safe and keeps its latency statistics across calls, so create one per handler.
+
+    Args:
+        percentile (float, optional): The latency percentile (0 to 1) after which a request is hedged. Defaults to 0.95.
+        budget (float, optional): The largest share of requests (0 to 1) that may be hedged. Defaults to 0.05.
+        initial_delay (float, optional): The hedging delay (in seconds) used until `min_samples` latencies are known. Defaults to 0.5.
+        min_delay (float, optional): The smallest hedging delay (in seconds). Defaults to 0.01.
+        max_delay (Optional[float], optional): The largest hedging delay (in seconds). Defaults to None (no limit).
+        window_size (int, optional): The number of recent latencies the percentile is computed over. Defaults to 1000.
+        min_samples (int, optional): The number of latencies needed before the percentile is used. Defaults to 20.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: Optional[float] = None,
+        window_size: int = 1000,
+        min_samples: int = 20,
+    ):
+        self.percentile: float = percentile
+        self.budget: float = budget
+        self.initial_delay: float = initial_delay
+        self.min_delay: float = min_delay
+        self.max_delay: Optional[float] = max_delay
+        self.min_samples: int = min_samples
+
+        self._lock = threading.Lock()
+        self._latencies: collections.deque = collections.deque(maxlen=window_size)
+        self._delay: Optional[float] = None
+        self._recorded: int = 0
+        self._stats: dict = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+    def __repr__(self) -> str:
+        return f"HedgePolicy(percentile={self.percentile!r}, budget={self.budget!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock",):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Counters describing the policy: the number of `requests`, how many were `hedged`, how many times the hedge
+        answered first (`hedge_wins`), and the current hedging `delay`.
+        """
+        with self._lock:
+            return {**self._stats, "delay": self._get_delay()}
+
+    def get_delay(self) -> float:
+        """
+        Get how long (in seconds) to wait for a request before hedging it.
+
+        Returns:
+            float: The hedging delay.
+        """
+        with self._lock:
+            self._stats["requests"] += 1
+            return self._get_delay()
+
+    def record_latency(self, latency: float):
+        """
+        Record the latency of a completed request.
+
+        Args:
+            latency (float): The latency in seconds.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._recorded += 1
+            # recomputing the percentile on every request would sort the whole window each time
+            if self._recorded % 16 == 0:
+                self._delay = None
+
+    def try_hedge(self) -> bool:
+        """
+        Reserve a hedge from the budget.
+
+        Returns:
+            bool: True if the request may be hedged.
+        """
+        with self._lock:
+            if self._stats["hedged"] + 1 > self.budget * self._stats["requests"]:
+                return False
+            self._stats["hedged"] += 1
+            return True
+
+    def record_hedge_win(self):
+        """
+        Record that the hedged request answered before the original one.
+        """
+        with self._lock:
+            self._stats["hedge_wins"] += 1
+
+    def _get_delay(self) -> float:
+        if len(self._latencies) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            if self._delay is None:
+                latencies = sorted(self._latencies)
+                index = min(
+                    len(latencies) - 1, math.ceil(self.percentile * len(latencies)) - 1
+                )
+                self._delay = latencies[max(0, index)]
+            delay = self._delay
+
+        delay = max(self.min_delay, delay)
+        if self.max_delay is not None:
+            delay = min(self.max_delay, delay)
+        return delay
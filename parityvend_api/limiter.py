@@ -0,0 +1,249 @@
+import collections
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Tuple, Type
+
+from .exceptions import APIError, ConnectionError
+from .priority import Priority
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted", "priority", "enqueued")
+
+    def __init__(
+        self,
+        priority: Priority,
+        loop: Optional["asyncio.AbstractEventLoop"] = None,
+    ):
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+        self.granted = False
+        self.priority = priority
+        self.enqueued = time.monotonic()
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._set_result)
+
+    def _set_result(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    A concurrency limiter that finds the highest concurrency the API sustains, using AIMD (additive increase,
+    multiplicative decrease).
+
+    Every call takes a slot before going to the API. While calls complete within `tolerance` times the lowest
+    recently observed latency, the limit grows by about one slot per round of calls. When calls slow down beyond
+    that, or fail with a `ConnectionError` or `APIError` (like a 429 or 503), the limit is multiplied by
+    `backoff_ratio`.
+
+    Calls waiting for a slot are queued by priority: a free slot always goes to the oldest `Priority.INTERACTIVE`
+    call first, so interactive lookups do not queue behind bulk work. To keep background calls from starving, one
+    that has waited longer than `starvation_timeout` seconds is granted the next slot ahead of interactive calls.
+
+    The limiter is thread-safe and works for threads and event loops at the same time, so one limiter can be shared
+    by a `ParityVendAPI`, its thread-pool bulk methods and any number of `AsyncParityVendAPI`s. A pickled or forked copy starts
+    with no calls in flight and keeps the current limit.
+
+    Args:
+        initial_limit (int, optional): The starting concurrency. Defaults to 10.
+        min_limit (int, optional): The lowest concurrency. Defaults to 1.
+        max_limit (int, optional): The highest concurrency. Defaults to 200.
+        tolerance (float, optional): How many times slower than the baseline latency a call may be before the limit is
+            lowered. Defaults to 2.0.
+        latency_target (Optional[float], optional): A fixed latency (in seconds) to use instead of `tolerance` times the
+            baseline. Defaults to None.
+        backoff_ratio (float, optional): The factor the limit is multiplied by on a slow or failed call. Defaults to 0.9.
+        baseline_window (int, optional): The number of recent latencies the baseline (the lowest one) is taken from. Defaults to 100.
+        failure_exceptions (Tuple[Type[Exception], ...], optional): Exceptions that lower the limit. Defaults to `ConnectionError` and `APIError`.
+        starvation_timeout (Optional[float], optional): How long (in seconds) a lower-priority call may wait before it
+            is granted a slot ahead of higher-priority calls. Defaults to 5.0. None disables starvation protection.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        tolerance: float = 2.0,
+        latency_target: Optional[float] = None,
+        backoff_ratio: float = 0.9,
+        baseline_window: int = 100,
+        failure_exceptions: Tuple[Type[Exception], ...] = (ConnectionError, APIError),
+        starvation_timeout: Optional[float] = 5.0,
+    ):
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.tolerance: float = tolerance
+        self.latency_target: Optional[float] = latency_target
+        self.backoff_ratio: float = backoff_ratio
+        self.failure_exceptions: Tuple[Type[Exception], ...] = tuple(
+            failure_exceptions
+        )
+
+        self._lock = threading.Lock()
+        self._limit: float = float(min(max(initial_limit, min_limit), max_limit))
+        self._inflight: int = 0
+        self.starvation_timeout: Optional[float] = starvation_timeout
+        self._waiters: dict = {priority: collections.deque() for priority in Priority}
+        self._waiting: int = 0
+        self._latencies: collections.deque = collections.deque(maxlen=baseline_window)
+
+    def __repr__(self) -> str:
+        return f"AdaptiveLimiter(limit={self.limit!r}, inflight={self.inflight!r}, queue_depth={self.queue_depth!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock", "_waiters"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        # calls in flight or waiting belong to the process the limiter came from
+        self._waiters = {priority: collections.deque() for priority in Priority}
+        self._waiting = 0
+        self._inflight = 0
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        with self._lock:
+            return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        """The number of calls currently holding a slot."""
+        with self._lock:
+            return self._inflight
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of calls waiting for a slot."""
+        with self._lock:
+            return self._waiting
+
+    def get_queue_depth(self, priority: Priority) -> int:
+        """
+        Get the number of calls of a priority waiting for a slot.
+
+        Args:
+            priority (Priority): The priority to count.
+
+        Returns:
+            int: The number of waiting calls.
+        """
+        with self._lock:
+            return len(self._waiters[priority])
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        Take a slot, blocking the current thread until one is free.
+
+        Args:
+            priority (Priority, optional): The priority of the call. Defaults to `Priority.INTERACTIVE`.
+        """
+        with self._lock:
+            if not self._waiting and self._inflight < int(self._limit):
+                self._inflight += 1
+                return
+            waiter = _Waiter(priority)
+            self._enqueue(waiter)
+
+        waiter.event.wait()
+
+    async def acquire_async(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        Take a slot, waiting (without blocking the event loop) until one is free.
+
+        Args:
+            priority (Priority, optional): The priority of the call. Defaults to `Priority.INTERACTIVE`.
+        """
+        # imported here, as synchronous applications never need asyncio
+        import asyncio
+
+        with self._lock:
+            if not self._waiting and self._inflight < int(self._limit):
+                self._inflight += 1
+                return
+            waiter = _Waiter(priority, asyncio.get_running_loop())
+            self._enqueue(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters[waiter.priority].remove(waiter)
+                    self._waiting -= 1
+            if granted:
+                self.release()
+            raise
+
+    def release(self, latency: Optional[float] = None, exc: Optional[BaseException] = None):
+        """
+        Give back a slot, adjusting the limit with the outcome of the call.
+
+        Args:
+            latency (Optional[float], optional): The latency of the call in seconds, or None if it should not adjust the limit. Defaults to None.
+            exc (Optional[BaseException], optional): The exception raised by the call, if any. Defaults to None.
+        """
+        with self._lock:
+            self._inflight -= 1
+
+            if isinstance(exc, self.failure_exceptions):
+                self._decrease()
+            elif latency is not None and (exc is None or isinstance(exc, Exception)):
+                self._latencies.append(latency)
+                if latency > self._get_latency_threshold():
+                    self._decrease()
+                elif self._inflight + 1 >= int(self._limit) // 2:
+                    # only grow while the limit is actually being used
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+            woken = self._grant()
+
+        for waiter in woken:
+            waiter.wake()
+
+    def _get_latency_threshold(self) -> float:
+        if self.latency_target is not None:
+            return self.latency_target
+        return min(self._latencies) * self.tolerance
+
+    def _decrease(self):
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+
+    def _enqueue(self, waiter: _Waiter):
+        self._waiters[waiter.priority].append(waiter)
+        self._waiting += 1
+
+    def _next_waiter(self) -> _Waiter:
+        queues = [queue for queue in self._waiters.values() if queue]
+        if self.starvation_timeout is not None and len(queues) > 1:
+            starved_before = time.monotonic() - self.starvation_timeout
+            for queue in reversed(queues[1:]):
+                if queue[0].enqueued <= starved_before:
+                    return queue.popleft()
+        return queues[0].popleft()
+
+    def _grant(self) -> list:
+        woken = []
+        while self._waiting and self._inflight < int(self._limit):
+            waiter = self._next_waiter()
+            waiter.granted = True
+            self._waiting -= 1
+            self._inflight += 1
+            woken.append(waiter)
+        return woken
@@ -1,11 +1,64 @@
 import functools
-from typing import Dict, Optional, Union, Sequence
+import hashlib
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple, Union, Sequence
+
+from .data import (
+    COUNTRY_CODES,
+    COUNTRY_EMOJI_FLAGS,
+    COUNTRY_IDS,
+    COUNTRY_NAMES,
+    CURRENCY_CODES,
+    CURRENCY_IDS,
+    CURRENCY_LOCALIZED,
+    CURRENCY_SYMBOLS,
+)
+
+
+class _FrozenDict(dict):
+    """
+    A `dict` whose items cannot be changed after it is created.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(
+            f'"{type(self).__name__}" object is immutable, copy it with dict() to modify it.'
+        )
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+
+# the ids of uppercase and lowercase codes, so that neither needs `upper()`
+_ANY_CASE_COUNTRY_IDS = {
+    **COUNTRY_IDS,
+    **{code.lower(): country_id for code, country_id in COUNTRY_IDS.items()},
+}
+
 
-from .data import COUNTRIES_META
+def _get_country_id(code: Union[str, bytes]) -> int:
+    try:
+        return _ANY_CASE_COUNTRY_IDS[code]
+    except KeyError:
+        if isinstance(code, bytes):
+            code = code.decode("utf8")
+        return COUNTRY_IDS[code.upper()]
 
 
 @functools.total_ordering
-class Country(dict):
+class Country(_FrozenDict):
     """
     A class representing a country and its associated metadata.
 
@@ -19,6 +72,7 @@ class Country(dict):
         ValueError: If an invalid country code is provided.
 
     Attributes:
+        id (int): The country id, a small integer that identifies the country (see `parityvend_api.data`).
         code (str): The ISO code representing the country.
         name (str): The name of the country.
         emoji_flag (str): The emoji flag representing the country.
@@ -28,6 +82,7 @@ class Country(dict):
     """
 
     __slots__ = (
+        "id",
         "code",
         "name",
         "emoji_flag",
@@ -38,17 +93,20 @@ class Country(dict):
 
     def __init__(self, code: Union[str, bytes]):
         try:
-            if isinstance(code, bytes):
-                code = code.decode("utf8")
-            code = code.upper()
-            meta = COUNTRIES_META[code]
+            country_id = _get_country_id(code)
         except (KeyError, TypeError, ValueError):
             raise ValueError(
                 f'"Country" object received invalid country code "{code}".'
             )
 
-        name, emoji_flag, currency_code, currency_symbol, currency_localized = meta
+        code = COUNTRY_CODES[country_id]
+        name = COUNTRY_NAMES[country_id]
+        emoji_flag = COUNTRY_EMOJI_FLAGS[country_id]
+        currency_code = CURRENCY_CODES[country_id]
+        currency_symbol = CURRENCY_SYMBOLS[country_id]
+        currency_localized = CURRENCY_LOCALIZED[country_id]
 
+        self.id: int = country_id
         self.code: str = code
         self.name: str = name
         self.emoji_flag: str = emoji_flag
@@ -67,6 +125,9 @@ class Country(dict):
             }
         )
 
+    def __reduce__(self):
+        return Country, (self.code,)
+
     def __repr__(self) -> str:
         return f"Country({self.code!r})"
 
@@ -80,7 +141,7 @@ class Country(dict):
     def __eq__(self, other) -> bool:
         if not self._is_valid_operand(other):
             return NotImplemented
-        return self.code == other.code
+        return self.id == other.id
 
     def __lt__(self, other) -> bool:
         if not self._is_valid_operand(other):
@@ -88,6 +149,11 @@ class Country(dict):
         return self.code < other.code
 
 
+class _MissingKeyError(KeyError, AttributeError):
+    # a missing key accessed as an attribute, so that `hasattr()`, `getattr()` with a default and `copy` work
+    pass
+
+
 class Response(dict):
     """
     A class representing a JSON response from an API.
@@ -95,42 +161,77 @@ class Response(dict):
     This class inherits from the `dict` class and provides an additional way to access
     its keys and nested dictionaries as attributes (via 'dot notation').
 
+    A nested dictionary is converted to a `Response` the first time it is accessed as an attribute, and the
+    `Response` replaces it, so later accesses return the same object.
+
     Args:
         *args: Positional arguments, typically dictionaries or other objects that can be converted to dictionaries.
         **kwargs: Keyword arguments, typically key-value pairs that will be added to the dictionary.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
+        # the arguments are not modified, as they can be shared (e.g., stored in the cache)
         super(Response, self).__init__(*args, **kwargs)
 
-        for arg in args:
-            if isinstance(arg, dict) and not isinstance(arg, Discounts):
-                for k, v in arg.items():
-                    if isinstance(v, dict):
-                        arg[k] = Response(v)
-
-        if kwargs:
-            for k, v in kwargs.items():
-                if isinstance(v, dict):
-                    kwargs[k] = Response(v)
-
     def __getattr__(self, attr):
         """
         Allows accessing dictionary keys as attributes ('dot notation').
         """
-        value = self[attr]
+        try:
+            value = self[attr]
+        except KeyError:
+            raise _MissingKeyError(attr) from None
 
-        if isinstance(value, dict) and not isinstance(value, Discounts):
-            return Response(value)
-        else:
-            return value
+        if type(value) is dict:
+            value = Response(value)
+            self[attr] = value
+        return value
 
     def __repr__(self) -> str:
         return f"Response({super(Response, self).__repr__()})"
 
 
+class FrozenResponse(_FrozenDict, Response):
+    """
+    An immutable `Response`, as returned by the handlers.
+
+    Nested dictionaries are converted to `FrozenResponse` objects once, when it is created, so attribute access
+    returns them without creating new objects. The handlers cache one `FrozenResponse` per lookup and return it on
+    every cache hit, so it cannot be modified; use `dict(response)` to get a modifiable copy.
+
+    Args:
+        *args: Positional arguments, typically dictionaries or other objects that can be converted to dictionaries.
+        **kwargs: Keyword arguments, typically key-value pairs that will be added to the dictionary.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        super(FrozenResponse, self).__init__(
+            {
+                key: FrozenResponse(value) if type(value) is dict else value
+                for key, value in items.items()
+            }
+        )
+
+    def __getattr__(self, attr):
+        """
+        Allows accessing dictionary keys as attributes ('dot notation').
+        """
+        try:
+            return self[attr]
+        except KeyError:
+            raise _MissingKeyError(attr) from None
+
+    def __reduce__(self):
+        return FrozenResponse, (dict(self),)
+
+
 @functools.total_ordering
-class Discount(dict):
+class Discount(_FrozenDict):
     """
     A class representing a discount and its associated metadata.
 
@@ -196,6 +297,9 @@ class Discount(dict):
             }
         )
 
+    def __reduce__(self):
+        return Discount, (self.country, None, None, self.raw_discount)
+
     def __repr__(self) -> str:
         return f"Discount({self.country!r}, {self.coupon_code!r}, {self.discount!r})"
 
@@ -206,65 +310,334 @@ class Discount(dict):
     def __eq__(self, other) -> bool:
         if not self._is_valid_operand(other):
             return NotImplemented
-        return self.country["code"] == other.country["code"]
+        return self.country.id == other.country.id
 
     def __lt__(self, other) -> bool:
         if not self._is_valid_operand(other):
             return NotImplemented
-        return self.country["code"] < other.country["code"]
+        return self.country.code < other.country.code
 
 
-class Discounts(dict):
+class Discounts(_FrozenDict):
     """
     A class representing a collection of `Discount` objects.
 
     This class inherits from the `dict` class and provides a convenient way to manage and access
     discounts associated with different countries (via 'dot notation').
 
+    The handlers build it with `get_snapshot`, which returns the same `Discounts` object for the same discounts
+    table, so an unchanged table is not parsed again. `version` identifies the content, and `diff` compares two
+    snapshots.
+
     Args:
         raw_discounts (dict): A dictionary containing raw discount data, where the keys are country codes
                                and the values are tuples of (coupon_code, discount_value).
+        previous (Optional[Discounts], optional): An earlier snapshot whose unchanged `Discount` objects are reused.
+                                                  Defaults to None.
     """
 
-    def __init__(self, raw_discounts: dict):
-        self.raw_discounts: dict = raw_discounts
+    # the latest snapshots, by content, shared by all handlers (see `get_snapshot`)
+    _snapshots: "OrderedDict[tuple, Discounts]" = OrderedDict()
+    _snapshots_lock = threading.Lock()
+    max_snapshots: int = 4
 
-        discounts = {
-            key: Discount(get_country_by_code(key), raw_discount=value)
-            for key, value in raw_discounts.items()
-        }
+    def __init__(self, raw_discounts: dict, previous: Optional["Discounts"] = None):
+        self.raw_discounts: dict = raw_discounts
+        self.content_key: Optional[tuple] = _get_content_key(raw_discounts)
+
+        reuse = previous.discounts_by_id if previous else _NO_DISCOUNTS
+        discounts, by_id = {}, [None] * len(COUNTRY_CODES)
+        for key, value in raw_discounts.items():
+            country = get_country_by_code(key)
+            if country is None:
+                # a country this version of the library does not know about
+                discounts[key] = Discount(country, raw_discount=value)
+                continue
+            discount = reuse[country.id]
+            if discount is None or discount.raw_discount != value:
+                discount = Discount(country, raw_discount=value)
+            discounts[country.code] = by_id[country.id] = discount
 
         self.discounts: dict = discounts
-        super(Discounts, self).__init__(discounts)
+        # a dense array indexed by the country id, with None for the countries without a discount
+        self.discounts_by_id: Tuple[Optional[Discount], ...] = tuple(by_id)
+        super(Discounts, self).__init__(self.discounts)
+
+    @classmethod
+    def get_snapshot(cls, raw_discounts: dict) -> "Discounts":
+        """
+        Get the `Discounts` object for a discounts table, reusing the one built for the same content.
+
+        The last `max_snapshots` snapshots are kept. A new snapshot reuses the `Discount` objects that did not change
+        since the latest one.
+
+        Args:
+            raw_discounts (dict): A dictionary containing raw discount data, as for `Discounts`.
+
+        Returns:
+            Discounts: The snapshot of the discounts table.
+        """
+        key = _get_content_key(raw_discounts)
+        if key is None:
+            return cls(raw_discounts)
+
+        with cls._snapshots_lock:
+            snapshot = cls._snapshots.get(key)
+            if snapshot is not None:
+                cls._snapshots.move_to_end(key)
+                return snapshot
+            previous = next(reversed(cls._snapshots.values()), None)
+
+        snapshot = cls(raw_discounts, previous)
+        with cls._snapshots_lock:
+            snapshot = cls._snapshots.setdefault(key, snapshot)
+            while len(cls._snapshots) > cls.max_snapshots:
+                cls._snapshots.popitem(last=False)
+        return snapshot
+
+    @functools.cached_property
+    def version(self) -> str:
+        """
+        A hash of the content of the discounts table, the same in every process for the same discounts.
+        """
+        content = repr(self.content_key or sorted(self.raw_discounts.items()))
+        return hashlib.blake2b(content.encode("utf8"), digest_size=8).hexdigest()
+
+    def diff(
+        self, other: "Discounts"
+    ) -> Dict[str, Tuple[Optional[Discount], Optional[Discount]]]:
+        """
+        Get the discounts that differ between this snapshot and `other`.
 
-    def get_discount_by_country(self, country: Union[Country, str, bytes]) -> Discount:
+        Snapshots with the same content are compared by their content key, and `Discount` objects shared by both
+        snapshots (see `get_snapshot`) are skipped without comparing them.
+
+        Args:
+            other (Discounts): The snapshot to compare with, usually a newer one.
+
+        Returns:
+            Dict[str, Tuple[Optional[Discount], Optional[Discount]]]: The country codes whose discount changed,
+                mapped to a tuple of (discount in this snapshot, discount in `other`). A discount that is missing from
+                one of the snapshots is None.
+        """
+        if self is other or (
+            self.content_key is not None and self.content_key == other.content_key
+        ):
+            return {}
+
+        changes = {}
+        for country_id, (old, new) in enumerate(
+            zip(self.discounts_by_id, other.discounts_by_id)
+        ):
+            if old is not new and _is_changed(old, new):
+                changes[COUNTRY_CODES[country_id]] = (old, new)
+
+        # the countries this version of the library does not know about
+        unknown = (self.discounts.keys() | other.discounts.keys()) - COUNTRY_IDS.keys()
+        for key in unknown:
+            old, new = self.discounts.get(key), other.discounts.get(key)
+            if _is_changed(old, new):
+                changes[key] = (old, new)
+        return changes
+
+    def get_discount_by_country(
+        self, country: Union[Country, str, bytes, int]
+    ) -> Discount:
         """
         Retrieves the `Discount` object associated with the given country.
 
         Args:
-            country (Union[Country, str, bytes]): The country for which to retrieve the discount.
-                                                   Can be a `Country` object, a country code string, or bytes.
+            country (Union[Country, str, bytes, int]): The country for which to retrieve the discount.
+                                                   Can be a `Country` object, a country code string, bytes, or a
+                                                   country id.
 
         Returns:
             Discount: The `Discount` object associated with the given country.
         """
-        country = self.auto_convert_country(country)
-        return self.discounts[country]
+        if type(country) is not int:
+            country = self.auto_convert_country(country)
+        discount = None
+        if 0 <= country < len(self.discounts_by_id):
+            discount = self.discounts_by_id[country]
+        if discount is None:
+            raise KeyError(country)
+        return discount
 
     @staticmethod
-    def auto_convert_country(country: Union[Country, str, bytes]) -> Country:
+    def auto_convert_country(country: Union[Country, str, bytes]) -> int:
         if isinstance(country, Country):
-            return country["code"]
+            return country.id
 
-        if isinstance(country, bytes):
-            country = country.decode("utf8")
+        return _get_country_id(country)
 
-        return country.upper()
+    def __reduce__(self):
+        return Discounts, (self.raw_discounts,)
 
     def __repr__(self) -> str:
         return f"Discounts({self.discounts!r})"
 
 
+def _is_rate(value) -> bool:
+    # only positive, finite numbers are usable rates, the table keeps other values (e.g., null) as they are
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and 0 < value < math.inf
+    )
+
+
+class ExchangeRates(_FrozenDict):
+    """
+    A class representing an exchange rates table, as returned by `get_exchange_rate_info`.
+
+    It maps currency codes to their rate against the base currency the table was requested in. Every cross rate is
+    the ratio of two rates, so one table converts between any two of its currencies: `get_rate` computes a cross
+    rate on demand, `convert` converts arrays of prices, and `rebase` returns the table of another base currency,
+    without an API call per base currency. The rates are also kept in `rates_by_id`, a dense array indexed by the
+    currency id (see `CURRENCY_IDS` in `parityvend_api.data`).
+
+    Args:
+        raw_rates (dict): A dictionary mapping currency codes to their exchange rates.
+    """
+
+    def __init__(self, raw_rates: dict):
+        self.raw_rates: dict = raw_rates
+
+        currency_ids = CURRENCY_IDS
+        unknown = [code for code in raw_rates if code not in currency_ids]
+        if unknown:
+            # the currencies this version of the library does not know about are numbered after the known ones
+            first_id = len(currency_ids)
+            currency_ids = {
+                **currency_ids,
+                **{code: first_id + index for index, code in enumerate(unknown)},
+            }
+        rates_by_id = array("d", bytes(8 * len(currency_ids)))
+        for code, rate in raw_rates.items():
+            if _is_rate(rate):
+                rates_by_id[currency_ids[code]] = rate
+
+        self.currency_ids: Dict[str, int] = currency_ids
+        # a dense array indexed by the currency id, with 0.0 for the currencies missing from the table or whose rate is
+        # not a positive number (e.g., null)
+        self.rates_by_id: array = rates_by_id
+        super(ExchangeRates, self).__init__(raw_rates)
+
+    def get_currency_id(self, currency: Union[str, bytes]) -> int:
+        """
+        Get the id of a currency, its index in `rates_by_id`.
+
+        Args:
+            currency (Union[str, bytes]): The currency code.
+
+        Returns:
+            int: The currency id.
+        """
+        try:
+            return self.currency_ids[currency]
+        except KeyError:
+            if isinstance(currency, bytes):
+                currency = currency.decode("utf8")
+            return self.currency_ids[currency.upper()]
+
+    def get_rate(
+        self,
+        from_currency: Union[str, bytes, int],
+        to_currency: Union[str, bytes, int],
+    ) -> float:
+        """
+        Get the exchange rate between two currencies of the table: the amount of `to_currency` that one unit of
+        `from_currency` buys.
+
+        Args:
+            from_currency (Union[str, bytes, int]): The currency to convert from, as a currency code or id.
+            to_currency (Union[str, bytes, int]): The currency to convert to, as a currency code or id.
+
+        Returns:
+            float: The exchange rate. Raises `KeyError` if either currency is missing from the table, or its rate is not
+                a positive number.
+        """
+        return self._get_rate(to_currency) / self._get_rate(from_currency)
+
+    def convert(
+        self,
+        amounts: Union[float, Sequence[float], "array"],
+        from_currency: Union[str, bytes, int],
+        to_currency: Union[str, bytes, int],
+    ) -> Union[float, "array"]:
+        """
+        Convert amounts from one currency of the table to another.
+
+        The cross rate is computed once for all the amounts.
+
+        Args:
+            amounts (Union[float, Sequence[float], array]): An amount, or an iterable of amounts (e.g., a list of
+                prices). NumPy arrays are multiplied in a single operation.
+            from_currency (Union[str, bytes, int]): The currency of the amounts, as a currency code or id.
+            to_currency (Union[str, bytes, int]): The currency to convert to, as a currency code or id.
+
+        Returns:
+            Union[float, array]: The converted amount, an `array("d")` of the converted amounts, or an array of the
+                same type for NumPy arrays.
+        """
+        rate = self.get_rate(from_currency, to_currency)
+        if isinstance(amounts, (int, float)) or hasattr(amounts, "__array_ufunc__"):
+            return amounts * rate
+        return array("d", [amount * rate for amount in amounts])
+
+    def rebase(self, base_currency: Union[str, bytes, int]) -> "ExchangeRates":
+        """
+        Get the table of another base currency, as `get_exchange_rate_info` would return it for `base_currency`.
+
+        Args:
+            base_currency (Union[str, bytes, int]): The new base currency, as a currency code or id.
+
+        Returns:
+            ExchangeRates: The exchange rates against `base_currency`. Raises `KeyError` if it is missing from the
+                table.
+        """
+        base_rate = self._get_rate(base_currency)
+        return ExchangeRates(
+            {
+                code: rate / base_rate if _is_rate(rate) else rate
+                for code, rate in self.raw_rates.items()
+            }
+        )
+
+    def _get_rate(self, currency: Union[str, bytes, int]) -> float:
+        currency_id = currency
+        if type(currency) is not int:
+            currency_id = self.get_currency_id(currency)
+        rate = 0.0
+        if 0 <= currency_id < len(self.rates_by_id):
+            rate = self.rates_by_id[currency_id]
+        if not rate:
+            raise KeyError(currency)
+        return rate
+
+    def __reduce__(self):
+        return ExchangeRates, (self.raw_rates,)
+
+    def __repr__(self) -> str:
+        return f"ExchangeRates({self.raw_rates!r})"
+
+
+_NO_DISCOUNTS = (None,) * len(COUNTRY_CODES)
+
+
+def _get_content_key(raw_discounts: dict) -> Optional[tuple]:
+    # the content of a discounts table in the shape returned by the API as a hashable key, or None for other shapes
+    if not all(type(value) is list for value in raw_discounts.values()):
+        return None
+    return tuple(raw_discounts), tuple(map(tuple, raw_discounts.values()))
+
+
+def _is_changed(old: Optional[Discount], new: Optional[Discount]) -> bool:
+    if old is None or new is None:
+        return old is not new
+    return (old.coupon_code, old.discount) != (new.coupon_code, new.discount)
+
+
 def get_country_by_code(country_code: Union[str, bytes]) -> Country:
     """
     Retrieves the `Country` object associated with the given country code.
@@ -275,11 +648,57 @@ def get_country_by_code(country_code: Union[str, bytes]) -> Country:
     Returns:
         Country: The `Country` object associated with the given country code.
     """
-    if isinstance(country_code, bytes):
-        country_code = country_code.decode("utf8")
+    try:
+        return COUNTRIES.get_by_id(_get_country_id(country_code))
+    except KeyError:
+        return None
 
-    country_code = country_code.upper()
-    return COUNTRIES.get(country_code)
+
+class CountryRegistry(Mapping):
+    """
+    A read-only mapping of country codes to `Country` objects (`COUNTRIES`).
+
+    The `Country` objects are created on first use, so importing the library does not build all of them. Each code
+    always maps to the same object.
+    """
+
+    def __init__(self):
+        self._countries: List[Optional[Country]] = [None] * len(COUNTRY_CODES)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, code: str) -> Country:
+        return self.get_by_id(COUNTRY_IDS[code])
+
+    def get_by_id(self, country_id: int) -> Country:
+        """
+        Retrieves the `Country` object with the given country id.
+
+        Args:
+            country_id (int): The country id (`Country.id`).
+
+        Returns:
+            Country: The `Country` object with the given country id.
+        """
+        country = self._countries[country_id]
+        if country is None:
+            with self._lock:
+                country = self._countries[country_id]
+                if country is None:
+                    country = Country(COUNTRY_CODES[country_id])
+                    self._countries[country_id] = country
+        return country
+
+    def __contains__(self, code) -> bool:
+        return code in COUNTRY_IDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(COUNTRY_CODES)
+
+    def __len__(self) -> int:
+        return len(COUNTRY_CODES)
+
+    def __repr__(self) -> str:
+        return f"CountryRegistry({len(self)} countries)"
 
 
-COUNTRIES: Dict[str, Country] = {key: Country(key) for key in COUNTRIES_META}
+COUNTRIES: CountryRegistry = CountryRegistry()
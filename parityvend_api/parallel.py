@@ -0,0 +1,282 @@
+import array
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import zlib
+from ipaddress import IPv4Address, IPv6Address
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .handler import ParityVendAPI
+
+class BulkProcessPool:
+    """
+    A pool of worker processes for enriching very large numbers of IP addresses on several cores.
+
+    Every worker has its own copy of `client` (pickled by configuration) with its own cache. IP addresses are sharded
+    between the workers by a hash of the address, so repeated addresses always go to the worker that already has
+    them cached. Each worker runs the lookups with the bulk methods of its client and builds the `Response` and
+    `Country` objects itself. Only compact columnar chunks go back to the parent process: a dict of lists and arrays,
+    where `chunk["index"][i]` is the position in the input of the IP address the other columns describe at `i`.
+    Numeric columns are `array.array("d")`, with NaN where the API returned no value, and the "country_id" column
+    (`Country.id`) is an `array.array("h")`, with -1 where there is no country. A failed lookup has the `repr` of its
+    exception in the `error` column and None (or NaN, -1) in the others. An error payload (with
+    `raise_exc_on_error=False`) has its `error_name` in the `error` column. An exception raised while building a chunk
+    is raised by the iterator in the parent process.
+
+    Chunks are yielded as soon as they are ready, not in the input order, and at most `max_pending_chunks` chunks per
+    worker are in flight, so inputs of any size are streamed in bounded memory. Iterate over one run at a time: the
+    chunks still in flight for an iterator that was abandoned (or raised) are discarded by the next run.
+
+    Args:
+        client (ParityVendAPI): The configured client to copy into every worker.
+        processes (Optional[int], optional): The number of worker processes. Defaults to None (the number of CPUs).
+        chunk_size (int, optional): The number of IP addresses sent to a worker at once. Defaults to 1000.
+        max_concurrency (Optional[int], optional): The maximum number of lookups running at once in each worker. Defaults to None (see `ParityVendAPI.get_countries_from_ips`).
+        max_pending_chunks (int, optional): The maximum number of chunks in flight per worker. Defaults to 2.
+        mp_context (Optional[multiprocessing.context.BaseContext], optional): The multiprocessing context to start the workers with. Defaults to None (the default context).
+    """
+
+    def __init__(
+        self,
+        client: ParityVendAPI,
+        processes: Optional[int] = None,
+        chunk_size: int = 1000,
+        max_concurrency: Optional[int] = None,
+        max_pending_chunks: int = 2,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ):
+        self.processes: int = processes or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+        self.max_concurrency: Optional[int] = max_concurrency
+        self.max_pending_chunks: int = max_pending_chunks
+
+        context = mp_context or multiprocessing.get_context()
+        self._run_ids = itertools.count()
+        self._results = context.Queue()
+        self._tasks = [context.Queue() for _ in range(self.processes)]
+        self._workers = [
+            context.Process(
+                target=_work,
+                args=(client, tasks, self._results, max_concurrency),
+                name=f"parityvend-bulk-{shard}",
+                daemon=True,
+            )
+            for shard, tasks in enumerate(self._tasks)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __repr__(self) -> str:
+        return f"BulkProcessPool(processes={self.processes!r})"
+
+    def __enter__(self) -> "BulkProcessPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def iter_countries(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Look up the countries of many IP addresses on the worker processes.
+
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up. It is consumed lazily.
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+
+        Returns:
+            Iterator[dict]: Chunks with the columns "index", "ip", "country" (the country code), "country_id" and "error".
+        """
+        return self._run("countries", ips, (timeout, cache))
+
+    def iter_discounts(
+        self,
+        ips: Iterable[Union[str, bytes, IPv4Address, IPv6Address]],
+        base_currency: Union[str, bytes] = "USD",
+        timeout: Optional[Union[int, float]] = None,
+        cache: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Look up the discounts of many IP addresses on the worker processes.
+
+        Args:
+            ips (Iterable[Union[str, bytes, IPv4Address, IPv6Address]]): The IP addresses to look up. It is consumed lazily.
+            base_currency (Union[str, bytes], optional): The base currency to use for exchange rates. Defaults to "USD".
+            timeout (Optional[Union[int, float]], optional): The timeout value for each request. Defaults to None.
+            cache (bool, optional): Whether to cache the responses. Defaults to True.
+
+        Returns:
+            Iterator[dict]: Chunks with the columns "index", "ip", "country", "country_id", "discount", "coupon_code", "currency_code", "conversion_rate" and "error".
+        """
+        return self._run("discounts", ips, (base_currency, timeout, cache))
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        for tasks in self._tasks:
+            tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._results.close()
+        for tasks in self._tasks:
+            tasks.close()
+
+    def _run(self, kind: str, ips: Iterable, args: tuple) -> Iterator[dict]:
+        run_id = next(self._run_ids)
+        shards = self.processes
+        buckets: List[list] = [[] for _ in range(shards)]
+        positions: List[array.array] = [array.array("q") for _ in range(shards)]
+        pending = [0] * shards
+
+        def send(shard: int):
+            while pending[shard] >= self.max_pending_chunks:
+                yield self._receive(run_id, pending)
+            self._tasks[shard].put(
+                (run_id, kind, positions[shard], buckets[shard], args)
+            )
+            pending[shard] += 1
+            buckets[shard] = []
+            positions[shard] = array.array("q")
+
+        for index, ip in enumerate(ips):
+            ip = ParityVendAPI.auto_convert_ip(ip)
+            shard = zlib.crc32(ip.encode("utf8")) % shards
+            buckets[shard].append(ip)
+            positions[shard].append(index)
+            if len(buckets[shard]) >= self.chunk_size:
+                yield from send(shard)
+
+        for shard in range(shards):
+            if buckets[shard]:
+                yield from send(shard)
+        while any(pending):
+            yield self._receive(run_id, pending)
+
+    def _receive(self, run_id: int, pending: List[int]) -> dict:
+        while True:
+            try:
+                chunk_run_id, shard, chunk, error = self._results.get(timeout=1)
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self._workers):
+                    raise RuntimeError("A ParityVend API bulk worker process died.")
+                continue
+            if chunk_run_id != run_id:
+                # left over from a run whose iterator was abandoned
+                continue
+            pending[shard] -= 1
+            if error is not None:
+                raise error
+            return chunk
+
+
+def _work(client: ParityVendAPI, tasks, results, max_concurrency: Optional[int]):
+    shard = int(multiprocessing.current_process().name.rsplit("-", 1)[1])
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        run_id, kind, index, ips, args = task
+        try:
+            if kind == "countries":
+                chunk = _country_columns(client, ips, args, max_concurrency)
+            else:
+                chunk = _discount_columns(client, ips, args, max_concurrency)
+        except Exception as exc:
+            # the worker keeps running, and the parent raises the exception instead of waiting for the chunk
+            results.put((run_id, shard, None, _get_picklable_exception(exc)))
+            continue
+        chunk["index"] = index
+        chunk["ip"] = ips
+        results.put((run_id, shard, chunk, None))
+
+
+def _get_picklable_exception(exc: Exception) -> Exception:
+    # an exception that does not survive pickling would be lost by the results queue
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        return RuntimeError(f"A ParityVend API bulk worker failed: {exc!r}")
+    return exc
+
+
+def _lookup_unique(method, ips: List[str], *args) -> list:
+    # a chunk can repeat an IP address, look it up once instead of racing the cache
+    unique = list(dict.fromkeys(ips))
+    results = dict(zip(unique, method(unique, *args, return_exceptions=True)))
+    return [results[ip] for ip in ips]
+
+
+def _country_columns(client, ips, args, max_concurrency) -> dict:
+    timeout, cache = args
+    countries = _lookup_unique(
+        client.get_countries_from_ips, ips, timeout, cache, max_concurrency
+    )
+
+    codes, ids, errors = [], array.array("h"), []
+    for country in countries:
+        if isinstance(country, Exception):
+            codes.append(None)
+            ids.append(-1)
+            errors.append(repr(country))
+        else:
+            codes.append(country.code)
+            ids.append(country.id)
+            errors.append(None)
+    return {"country": codes, "country_id": ids, "error": errors}
+
+
+def _discount_columns(client, ips, args, max_concurrency) -> dict:
+    base_currency, timeout, cache = args
+    responses = _lookup_unique(
+        client.get_discounts_from_ips,
+        ips,
+        base_currency,
+        timeout,
+        cache,
+        max_concurrency,
+    )
+
+    columns = {
+        "country": [],
+        "country_id": array.array("h"),
+        "discount": array.array("d"),
+        "coupon_code": [],
+        "currency_code": [],
+        "conversion_rate": array.array("d"),
+        "error": [],
+    }
+    for response in responses:
+        if isinstance(response, Exception):
+            row = (None, -1, math.nan, None, None, math.nan, repr(response))
+        elif response.get("status") != "ok":
+            # an error payload, returned instead of raised with `raise_exc_on_error=False`
+            error = response.get("error_name") or "error"
+            row = (None, -1, math.nan, None, None, math.nan, error)
+        else:
+            country = response.get("country")
+            currency = response.get("currency") or {}
+            row = (
+                country.code if country else None,
+                country.id if country else -1,
+                _to_float(response.get("discount")),
+                response.get("coupon_code"),
+                currency.get("code"),
+                _to_float(currency.get("conversion_rate")),
+                None,
+            )
+        for column, value in zip(columns.values(), row):
+            column.append(value)
+    return columns
+
+
+def _to_float(value) -> float:
+    return math.nan if value is None else float(value)
@@ -0,0 +1,13 @@
+import enum
+
+
+class Priority(enum.IntEnum):
+    """
+    The priority of a lookup. Lower values are more important.
+
+    Interactive lookups serve a visitor who is waiting for the page. Background lookups are bulk jobs, cache warmers
+    and other work that can wait, or be skipped when the quota runs low.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
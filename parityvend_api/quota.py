@@ -0,0 +1,248 @@
+import logging
+import threading
+import time
+import weakref
+from typing import Awaitable, Callable, Optional, Union
+
+from .priority import Priority
+
+logger = logging.getLogger("parityvend")
+
+
+class QuotaManager:
+    """
+    A class that keeps track of the API quota and protects it for interactive traffic.
+
+    The manager polls `get_quota_info` in the background every `poll_interval` seconds and counts the billable calls
+    made locally between polls. From the change in the used quota it estimates the current request rate and forecasts
+    when the quota will run out. Once fewer than `reserve` (a share of the quota limit) requests are left, or the
+    quota is forecast to run out within `forecast_horizon` seconds, lookups with a priority of `cache_only_priority`
+    or lower are only answered from the cache. Interactive lookups keep using the API.
+
+    Args:
+        poll_interval (float, optional): How often (in seconds) to poll `get_quota_info`. Defaults to 300.
+        reserve (float, optional): The share of the quota limit (0 to 1) kept for interactive traffic. Defaults to 0.1.
+        forecast_horizon (Optional[float], optional): Switch to cache-only mode when the quota is forecast to run out
+            within this many seconds. Defaults to None (only `reserve` is used).
+        cache_only_priority (Priority, optional): The highest priority that is switched to cache-only mode. Defaults to `Priority.BACKGROUND`.
+        smoothing (float, optional): The weight (0 to 1) of the latest poll in the request rate estimate. Defaults to 0.3.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 300,
+        reserve: float = 0.1,
+        forecast_horizon: Optional[float] = None,
+        cache_only_priority: Priority = Priority.BACKGROUND,
+        smoothing: float = 0.3,
+    ):
+        self.poll_interval: float = poll_interval
+        self.reserve: float = reserve
+        self.forecast_horizon: Optional[float] = forecast_horizon
+        self.cache_only_priority: Priority = cache_only_priority
+        self.smoothing: float = smoothing
+
+        self._lock = threading.Lock()
+        self._quota_limit: Optional[int] = None
+        self._quota_left: Optional[int] = None
+        self._quota_used: Optional[int] = None
+        self._polled_at: Optional[float] = None
+        self._local_calls: int = 0
+        self._rate: Optional[float] = None
+        self._exhausted: bool = False
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"QuotaManager(quota_left={self.quota_left!r}, rate={self.rate!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock", "_stop", "_thread"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def quota_left(self) -> Optional[int]:
+        """The estimated quota left: the last polled value minus the calls made locally since. None until the first poll."""
+        with self._lock:
+            return self._get_quota_left()
+
+    @property
+    def rate(self) -> Optional[float]:
+        """The estimated rate of billable requests (per second) across all clients of the account."""
+        with self._lock:
+            return self._rate
+
+    @property
+    def stats(self) -> dict:
+        """A snapshot of the quota state and the forecast."""
+        with self._lock:
+            return {
+                "quota_limit": self._quota_limit,
+                "quota_used": self._quota_used,
+                "quota_left": self._get_quota_left(),
+                "local_calls": self._local_calls,
+                "rate": self._rate,
+                "seconds_left": self._forecast(),
+                "cache_only": self._is_low(),
+            }
+
+    def forecast(self) -> Optional[float]:
+        """
+        Forecast when the quota will run out at the current rate.
+
+        Returns:
+            Optional[float]: The number of seconds until the quota runs out, or None if it is not known or the rate is zero.
+        """
+        with self._lock:
+            return self._forecast()
+
+    def is_cache_only(self, priority: Priority) -> bool:
+        """
+        Check whether lookups of the given priority may only be answered from the cache.
+
+        Args:
+            priority (Priority): The priority of the lookup.
+
+        Returns:
+            bool: True if the lookup must not use the API.
+        """
+        if priority < self.cache_only_priority:
+            return False
+        with self._lock:
+            return self._is_low()
+
+    def record_call(self):
+        """
+        Count a billable call made since the last poll.
+        """
+        with self._lock:
+            self._local_calls += 1
+
+    def mark_exhausted(self):
+        """
+        Record that the API reported the quota as exceeded. Cleared by the next poll showing quota left.
+        """
+        with self._lock:
+            self._exhausted = True
+
+    def update(self, quota_info: dict, now: Optional[float] = None):
+        """
+        Update the state from a `get_quota_info` response.
+
+        Args:
+            quota_info (dict): The response, with `quota_limit`, `quota_used` and `quota_left`.
+            now (Optional[float], optional): The time of the poll (`time.monotonic()`). Defaults to None (now).
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            used = quota_info["quota_used"]
+            if self._polled_at is not None and now > self._polled_at:
+                # the server-side count includes calls made by other processes
+                rate = max(0, used - self._quota_used) / (now - self._polled_at)
+                if self._rate is None:
+                    self._rate = rate
+                else:
+                    self._rate = self.smoothing * rate + (1 - self.smoothing) * self._rate
+
+            self._quota_limit = quota_info["quota_limit"]
+            self._quota_used = used
+            self._quota_left = quota_info["quota_left"]
+            self._polled_at = now
+            self._local_calls = 0
+            self._exhausted = self._quota_left <= 0
+
+    def start(self, poll: Union[Callable[[], dict], weakref.WeakMethod]):
+        """
+        Start polling in a daemon thread.
+
+        Args:
+            poll (Union[Callable[[], dict], weakref.WeakMethod]): A function returning a fresh `get_quota_info`
+                response. With a `weakref.WeakMethod`, the thread does not keep the object of the method alive, and
+                stops once it is garbage-collected.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._poll_forever,
+            args=(poll,),
+            name="parityvend-quota",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the polling thread.
+        """
+        self._stop.set()
+
+    async def poll_forever_async(self, poll: Callable[[], Awaitable[dict]]):
+        """
+        Poll forever from an event loop. Run it as a task and cancel the task to stop.
+
+        Args:
+            poll (Callable[[], Awaitable[dict]]): A coroutine function returning a fresh `get_quota_info` response.
+        """
+        import asyncio
+
+        while True:
+            try:
+                self.update(await poll())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"ParityVend API quota poll failed: {exc!r}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _poll_forever(self, poll: Union[Callable[[], dict], weakref.WeakMethod]):
+        while not self._stop.is_set():
+            poll_once = poll() if isinstance(poll, weakref.WeakMethod) else poll
+            if poll_once is None:
+                # the client was garbage-collected
+                return
+            try:
+                self.update(poll_once())
+            except Exception as exc:
+                logger.warning(f"ParityVend API quota poll failed: {exc!r}")
+            # do not keep the client alive while waiting
+            poll_once = None
+            self._stop.wait(self.poll_interval)
+
+    def _get_quota_left(self) -> Optional[int]:
+        if self._quota_left is None:
+            return None
+        return self._quota_left - self._local_calls
+
+    def _forecast(self) -> Optional[float]:
+        quota_left = self._get_quota_left()
+        if quota_left is None or not self._rate:
+            return None
+        return max(0.0, quota_left / self._rate)
+
+    def _is_low(self) -> bool:
+        if self._exhausted:
+            return True
+
+        quota_left = self._get_quota_left()
+        if quota_left is None:
+            return False
+        if quota_left <= self.reserve * self._quota_limit:
+            return True
+
+        seconds_left = self._forecast()
+        return (
+            self.forecast_horizon is not None
+            and seconds_left is not None
+            and seconds_left <= self.forecast_horizon
+        )
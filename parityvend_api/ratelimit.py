@@ -0,0 +1,236 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Optional
+
+from .exceptions import RateLimitExceededError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_STATE = struct.Struct("dd")  # tokens, time of the last refill
+
+
+class RateLimiter:
+    """
+    A token-bucket rate limiter for API requests.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens per second. Every request takes one token.
+    When the bucket is empty, a request either waits for the next token or fails fast with `RateLimitExceededError`.
+
+    By default the bucket lives in the process. Pass `path` to share it between all processes on the host that use
+    the same file: its state is kept in a small memory-mapped file and updated under an exclusive file lock, so no
+    coordinating daemon is needed.
+
+    Args:
+        rate (float): The number of requests allowed per second.
+        burst (Optional[float], optional): The size of the bucket, i.e. how many requests may be sent at once after an
+            idle period. Defaults to None (equal to `rate`, but at least 1).
+        path (Optional[str], optional): The path of the state file shared between processes. Defaults to None (process-local).
+        block (bool, optional): Whether to wait for a token (True) or to raise `RateLimitExceededError` (False) when the
+            bucket is empty. Can be overridden per acquisition. Defaults to True.
+        max_wait (Optional[float], optional): The longest time (in seconds) to wait for a token before raising
+            `RateLimitExceededError`. Defaults to None (no limit).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        path: Optional[str] = None,
+        block: bool = True,
+        max_wait: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError('"rate" must be positive.')
+
+        self.rate: float = rate
+        self.burst: float = burst if burst is not None else max(1.0, rate)
+        self.path: Optional[str] = path
+        self.block: bool = block
+        self.max_wait: Optional[float] = max_wait
+
+        self._lock = threading.Lock()
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+
+        self._fd: Optional[int] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(rate={self.rate!r}, burst={self.burst!r}, path={self.path!r})"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("_lock", "_fd", "_mmap", "_pid"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        # the shared state file is reopened on first use, see `_shared_state`
+        for name in ("_fd", "_mmap", "_pid"):
+            self.__dict__.setdefault(name, None)
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens currently in the bucket."""
+        with self._lock:
+            if self.path is None:
+                tokens, _ = self._refill(self._tokens, self._updated, time.monotonic())
+                return tokens
+
+            with self._shared_state() as state:
+                tokens, _ = self._refill(*_STATE.unpack(state), time.monotonic())
+            return tokens
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available, without waiting.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        return self._take() == 0
+
+    def acquire(self, block: Optional[bool] = None):
+        """
+        Take a token, blocking the current thread until one is available.
+
+        Args:
+            block (Optional[bool], optional): Whether to wait for a token. Defaults to None (the limiter's `block`).
+
+        Raises:
+            RateLimitExceededError: If no token is available and the limiter does not block, or waiting would exceed `max_wait`.
+        """
+        started = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            self._check_wait(wait, started, block)
+            time.sleep(wait)
+
+    async def acquire_async(self, block: Optional[bool] = None):
+        """
+        Take a token, waiting (without blocking the event loop) until one is available.
+
+        Args:
+            block (Optional[bool], optional): Whether to wait for a token. Defaults to None (the limiter's `block`).
+
+        Raises:
+            RateLimitExceededError: If no token is available and the limiter does not block, or waiting would exceed `max_wait`.
+        """
+        import asyncio
+
+        started = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            self._check_wait(wait, started, block)
+            await asyncio.sleep(wait)
+
+    def close(self):
+        """
+        Close the shared state file, if any.
+        """
+        with self._lock:
+            self._close()
+
+    def _check_wait(self, wait: float, started: float, block: Optional[bool]):
+        block = self.block if block is None else block
+        if not block:
+            raise RateLimitExceededError(
+                f"ParityVend API client-side rate limit ({self.rate}/s) reached. Next token in {wait:.3f}s.",
+                retry_after=wait,
+            )
+
+        if self.max_wait is not None and time.monotonic() - started + wait > self.max_wait:
+            raise RateLimitExceededError(
+                f"ParityVend API client-side rate limit ({self.rate}/s) reached. Waiting for a token would exceed {self.max_wait}s.",
+                retry_after=wait,
+            )
+
+    def _take(self) -> float:
+        """Take a token and return 0, or return how long to wait until one is available."""
+        with self._lock:
+            if self.path is None:
+                self._tokens, self._updated = self._refill(
+                    self._tokens, self._updated, time.monotonic()
+                )
+                wait, self._tokens = self._consume(self._tokens)
+                return wait
+
+            with self._shared_state() as state:
+                # read the clock under the file lock, so that updates from other processes are never in the future
+                tokens, updated = self._refill(*_STATE.unpack(state), time.monotonic())
+                wait, tokens = self._consume(tokens)
+                state[:] = _STATE.pack(tokens, updated)
+                return wait
+
+    def _refill(self, tokens: float, updated: float, now: float):
+        if updated <= 0 or updated > now + 1:
+            # a new state file, or one left over from before a reboot
+            return self.burst, now
+        if updated > now:
+            return tokens, updated
+        return min(self.burst, tokens + (now - updated) * self.rate), now
+
+    def _consume(self, tokens: float):
+        if tokens >= 1:
+            return 0.0, tokens - 1
+        return (1 - tokens) / self.rate, tokens
+
+    def _shared_state(self):
+        if self._mmap is None or self._pid != os.getpid():
+            # a forked child must not share the parent's open file description, or the locks would not exclude each other
+            self._close()
+            self._open()
+        return _LockedState(self._fd, self._mmap)
+
+    def _open(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < _STATE.size:
+            os.ftruncate(fd, _STATE.size)
+        self._fd = fd
+        self._mmap = mmap.mmap(fd, _STATE.size)
+        self._pid = os.getpid()
+
+    def _close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._fd)
+        self._fd = None
+        self._mmap = None
+        self._pid = None
+
+
+class _LockedState:
+    """Holds an exclusive lock on the shared state file and exposes its bytes."""
+
+    def __init__(self, fd: int, state: mmap.mmap):
+        self.fd = fd
+        self.state = state
+
+    def __enter__(self) -> mmap.mmap:
+        if fcntl:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        return self.state
+
+    def __exit__(self, *exc_info):
+        if fcntl:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
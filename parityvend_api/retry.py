@@ -0,0 +1,139 @@
+import random
+import time
+from typing import Iterable, Optional, Tuple, Type, Union
+
+from .exceptions import APIError, ConnectionError
+
+
+class RetryPolicy:
+    """
+    A class describing when and how failed API requests are retried.
+
+    Delays use exponential backoff with full jitter: the n-th retry waits a random time between 0 and
+    `min(backoff_max, backoff_base * 2 ** (n - 1))` seconds, so that many clients failing at the same
+    moment do not retry in lockstep. A `Retry-After` header sent by the API takes precedence over the
+    computed delay.
+
+    Args:
+        max_attempts (int, optional): The maximum number of attempts, including the first one. Defaults to 3.
+        retry_on_status (Iterable[int], optional): HTTP status codes that are retried. Defaults to 429, 500, 502, 503 and 504.
+        retry_on_exceptions (Tuple[Type[Exception], ...], optional): Exceptions that are retried. `APIError`s are only retried
+            if their status code is in `retry_on_status`. Defaults to `ConnectionError` and `APIError`.
+        backoff_base (float, optional): The delay cap (in seconds) of the first retry. Defaults to 0.1.
+        backoff_max (float, optional): The largest delay cap (in seconds) of a single retry. Defaults to 10.0.
+        budget (Optional[float], optional): The total time (in seconds) a request may spend retrying, counted from the
+            first attempt. A delay (including a `Retry-After`) is shortened to the rest of the budget, and no retry is
+            made once the budget is spent. Defaults to 30.0.
+        respect_retry_after (bool, optional): Whether to wait for the time given in the `Retry-After` header. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_on_status: Iterable[int] = (429, 500, 502, 503, 504),
+        retry_on_exceptions: Tuple[Type[Exception], ...] = (ConnectionError, APIError),
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        budget: Optional[float] = 30.0,
+        respect_retry_after: bool = True,
+    ):
+        self.max_attempts: int = max_attempts
+        self.retry_on_status: frozenset = frozenset(retry_on_status)
+        self.retry_on_exceptions: Tuple[Type[Exception], ...] = tuple(
+            retry_on_exceptions
+        )
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.budget: Optional[float] = budget
+        self.respect_retry_after: bool = respect_retry_after
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(max_attempts={self.max_attempts!r}, budget={self.budget!r})"
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Check whether a failed attempt may be retried, regardless of the attempt count and budget.
+
+        Args:
+            exc (BaseException): The exception raised by the attempt.
+
+        Returns:
+            bool: True if the exception is retryable.
+        """
+        if not isinstance(exc, self.retry_on_exceptions):
+            return False
+
+        if isinstance(exc, APIError):
+            return exc.status_code in self.retry_on_status
+        return True
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Get a jittered backoff delay for the given attempt.
+
+        Args:
+            attempt (int): The number of the attempt that has just failed (starting at 1).
+
+        Returns:
+            float: The delay in seconds.
+        """
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def get_retry_delay(
+        self, exc: BaseException, attempt: int, elapsed: float
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt, and how long to wait before doing so.
+
+        Args:
+            exc (BaseException): The exception raised by the attempt.
+            attempt (int): The number of the attempt that has just failed (starting at 1).
+            elapsed (float): The time (in seconds) spent since the first attempt started.
+
+        Returns:
+            Optional[float]: The delay in seconds, at most the rest of the budget, or None if the request must not be
+                retried.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return None
+
+        delay = self.get_backoff(attempt)
+
+        retry_after = getattr(exc, "retry_after", None)
+        if self.respect_retry_after and retry_after is not None:
+            delay = retry_after
+
+        if self.budget is not None:
+            remaining = self.budget - elapsed
+            if remaining <= 0:
+                return None
+            # a `Retry-After` longer than the rest of the budget still gets one last attempt, at the end of the budget
+            delay = min(delay, remaining)
+        return delay
+
+
+def parse_retry_after(value: Union[str, None]) -> Optional[float]:
+    """
+    Parse the value of a `Retry-After` header.
+
+    Args:
+        value (Union[str, None]): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
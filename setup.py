@@ -13,6 +13,7 @@ setup(
     license="Apache License 2.0",
     packages=["parityvend_api", "parityvend_api.cache"],
     install_requires=["requests>=2.31.0", "cachetools>=5.3.3", "aiohttp>=3.9.3"],
+    extras_require={"fast": ["orjson>=3.9.0"]},
     include_package_data=True,
     zip_safe=False,
 )
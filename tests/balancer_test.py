@@ -0,0 +1,141 @@
+import asyncio
+import socket
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI, URLBalancer
+from parityvend_api.exceptions import ConnectionError
+from parityvend_api.objects import Country
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+
+def _unused_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def stubs():
+    """Two local stub servers, a fast one and a slow one."""
+    fast = StubAPI(payloads.routes(), delay=0.001)
+    slow = StubAPI(payloads.routes(), delay=0.05)
+    with ExitStack() as stack:
+        fast.url = stack.enter_context(serve(fast))
+        slow.url = stack.enter_context(serve(slow))
+        yield fast, slow
+
+
+def test_select_prefers_faster():
+    balancer = URLBalancer(["http://a", "http://b/", "http://c"])
+    assert balancer.urls == ["http://a", "http://b", "http://c"]
+
+    balancer.record("http://a/backend/x", 0.5)
+    balancer.record("http://b/backend/x", 0.01)
+    balancer.record("http://c/backend/x", 0.1)
+
+    picks = [balancer.select() for _ in range(300)]
+    assert picks.count("http://b") > picks.count("http://c") > picks.count("http://a")
+    # power of two choices never picks the slowest of three
+    assert picks.count("http://a") == 0
+
+
+def test_ewma():
+    balancer = URLBalancer(["http://a"], smoothing=0.5)
+    balancer.record("http://a/", 1.0)
+    balancer.record("http://a/", 0.0)
+    assert balancer.stats["http://a"]["latency"] == 0.5
+
+
+def test_match():
+    balancer = URLBalancer(["http://127.0.0.1:800", "http://proxy/parityvend"])
+    assert balancer.match("http://127.0.0.1:8001/backend/x") is None
+    assert balancer.match("http://127.0.0.1:800/backend/x") == "http://127.0.0.1:800"
+    assert (
+        balancer.match("http://proxy/parityvend/backend") == "http://proxy/parityvend"
+    )
+
+
+def test_cooldown():
+    balancer = URLBalancer(["http://a", "http://b"], cooldown=0.05)
+    balancer.record("http://a/backend/x", exc=OSError())
+    assert not balancer.stats["http://a"]["healthy"]
+    assert {balancer.select() for _ in range(20)} == {"http://b"}
+
+    tried = set()
+    assert balancer.get_failover_url("http://b/backend/x", tried) is None
+    assert tried == {"http://b"}
+
+    time.sleep(0.06)
+    assert balancer.stats["http://a"]["healthy"]
+    failover_url = balancer.get_failover_url("http://b/backend/x", set())
+    assert failover_url == "http://a/backend/x"
+
+
+def test_routes_to_faster(stubs):
+    fast, slow = stubs
+    parityvend = ParityVendAPI(secret_key, api_urls=[slow.url, fast.url])
+
+    for _ in range(40):
+        country = parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+        assert country == Country("ZW")
+
+    assert fast.count > slow.count
+    assert fast.count + slow.count == 40
+    assert parityvend.url_balancer.stats[fast.url]["latency"] < 0.05
+
+
+def test_failover(stubs):
+    fast, _ = stubs
+    dead = _unused_url()
+    balancer = URLBalancer([dead, fast.url])
+    parityvend = ParityVendAPI(secret_key, api_urls=balancer)
+
+    for _ in range(5):
+        country = parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+        assert country == Country("ZW")
+
+    stats = balancer.stats
+    assert stats[dead]["failures"] == 1
+    assert not stats[dead]["healthy"]
+    assert fast.count == 5
+
+
+def test_all_down():
+    parityvend = ParityVendAPI(secret_key, api_urls=[_unused_url(), _unused_url()])
+
+    with pytest.raises(ConnectionError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert all(
+        stats["failures"] == 1 for stats in parityvend.url_balancer.stats.values()
+    )
+
+
+def test_warm_up(stubs):
+    fast, slow = stubs
+    parityvend = ParityVendAPI(secret_key, api_urls=[slow.url, fast.url])
+    assert parityvend.warm_up(4) == 4
+    assert fast.count == slow.count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_failover(stubs):
+    fast, slow = stubs
+    dead = _unused_url()
+    parityvend = AsyncParityVendAPI(secret_key, api_urls=[dead, slow.url, fast.url])
+
+    results = await asyncio.gather(
+        *(
+            parityvend.get_country_from_ip(ip, cache=False)
+            for ip in [ipv4_zimbabwe, ipv4_switzerland] * 10
+        )
+    )
+    assert results == [Country("ZW"), Country("CH")] * 10
+    assert fast.count + slow.count == 20
+    assert parityvend.url_balancer.stats[dead]["failures"] >= 1
+
+    await parityvend.deinit()
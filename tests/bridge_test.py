@@ -0,0 +1,122 @@
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from parityvend_api import BridgedParityVendAPI, Priority
+from parityvend_api.objects import Country
+from tests.variables import (
+    ipv4_switzerland,
+    ipv4_venezuela,
+    ipv4_zimbabwe,
+    secret_key,
+)
+
+
+def _bridge_threads():
+    return [t for t in threading.enumerate() if t.name == "parityvend-bridge"]
+
+
+def test_invalid_options():
+    threads = len(_bridge_threads())
+
+    with pytest.raises(TypeError):
+        BridgedParityVendAPI(secret_key, no_such_option=True)
+    assert len(_bridge_threads()) == threads
+
+
+def test_methods(stub_api):
+    with BridgedParityVendAPI(secret_key) as parityvend:
+        assert parityvend.running
+        assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+        response = parityvend.get_discount_from_ip(ipv4_venezuela, "eur")
+        assert response["discount"] == 0.6
+        assert response["country"] == Country("VE")
+
+        assert "parityvend-banner" in parityvend.get_banner_from_ip(ipv4_zimbabwe)
+        response = parityvend.get_discount_with_html_from_ip(ipv4_zimbabwe)
+        assert "parityvend-banner" in response["html"]
+
+        assert parityvend.get_quota_info()["quota_left"] == 8766
+        assert parityvend.get_discounts_info()["discounts"]
+        assert parityvend.get_exchange_rate_info("EUR")["rates"]["EUR"] == 1.0
+
+        assert parityvend.get_countries_from_ips(
+            [ipv4_zimbabwe, ipv4_switzerland], priority=Priority.INTERACTIVE
+        ) == [Country("ZW"), Country("CH")]
+        discounts = parityvend.get_discounts_from_ips([ipv4_venezuela, ipv4_zimbabwe])
+        assert [discount["discount"] for discount in discounts] == [0.6, 0.7]
+
+    assert not parityvend.running
+    assert parityvend.loop.is_closed()
+    assert not _bridge_threads()
+
+
+def test_one_loop_for_many_threads(stub_api):
+    stub_api.delay = 0.1
+    parityvend = BridgedParityVendAPI(secret_key, pool_maxsize=100)
+
+    started = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
+        countries = list(
+            executor.map(
+                lambda _: parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False),
+                range(50),
+            )
+        )
+    assert countries == [Country("ZW")] * 50
+    assert time.monotonic() - started < 2.5
+    assert len(_bridge_threads()) == 1
+
+    parityvend.close()
+
+
+def test_bulk_fan_out(stub_api):
+    stub_api.delay = 0.1
+    parityvend = BridgedParityVendAPI(secret_key, pool_maxsize=500)
+
+    countries = parityvend.get_countries_from_ips(
+        [ipv4_zimbabwe] * 500, cache=False, max_concurrency=500
+    )
+    assert countries == [Country("ZW")] * 500
+    # the lookups overlapped, one after another would keep a single request in flight
+    assert stub_api.peak_inflight >= 20
+    assert len(_bridge_threads()) == 1
+    assert stub_api.count == 500
+
+    parityvend.close()
+
+
+def test_submit_and_run(stub_api):
+    with BridgedParityVendAPI(secret_key) as parityvend:
+        future = parityvend.submit(parityvend.api.get_country_from_ip(ipv4_zimbabwe))
+        assert future.result(5) == Country("ZW")
+
+        stub_api.delay = 0.5
+        with pytest.raises(concurrent.futures.TimeoutError):
+            parityvend.run(
+                parityvend.api.get_country_from_ip(ipv4_switzerland), timeout=0.05
+            )
+
+        async def nested():
+            return parityvend.get_country_from_ip(ipv4_zimbabwe)
+
+        with pytest.raises(RuntimeError):
+            parityvend.run(nested())
+
+    with pytest.raises(RuntimeError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+
+
+def test_close_drains(stub_api):
+    stub_api.delay = 0.2
+    parityvend = BridgedParityVendAPI(secret_key)
+
+    future = parityvend.submit(parityvend.api.get_country_from_ip(ipv4_zimbabwe))
+    time.sleep(0.05)
+    parityvend.close()
+
+    assert future.result(0) == Country("ZW")
+    parityvend.close()
@@ -0,0 +1,164 @@
+import pytest
+
+from parityvend_api import (
+    AsyncParityVendAPI,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ParityVendAPI,
+    no_discount_fallback,
+)
+from parityvend_api.exceptions import APIError, ConnectionError, ProcessingError
+from parityvend_api.objects import Country
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+unavailable = (503, {"Content-Type": "text/html"}, b"unavailable")
+
+
+def _breaker(**kwargs):
+    options = {"window_size": 4, "minimum_calls": 4, "open_duration": 60}
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def test_opens_on_failure_rate():
+    changes = []
+    breaker = _breaker(on_state_change=lambda old, new: changes.append((old, new)))
+
+    for exc in (None, APIError(), ConnectionError()):
+        assert breaker.allow_request()
+        breaker.record(0.01, exc)
+    assert breaker.state is CircuitState.CLOSED
+
+    assert breaker.allow_request()
+    breaker.record(0.01, ConnectionError())
+
+    assert breaker.state is CircuitState.OPEN
+    assert changes == [(CircuitState.CLOSED, CircuitState.OPEN)]
+    assert not breaker.allow_request()
+    assert breaker.metrics["short_circuited_calls"] == 1
+    assert breaker.metrics["failed_calls"] == 3
+
+
+def test_processing_errors_are_not_failures():
+    breaker = _breaker()
+
+    for _ in range(8):
+        assert breaker.allow_request()
+        breaker.record(0.01, ProcessingError())
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_opens_on_slow_calls():
+    breaker = _breaker(slow_call_duration=0.5, slow_call_rate_threshold=0.75)
+
+    for duration in (1, 1, 0.1, 1):
+        assert breaker.allow_request()
+        breaker.record(duration)
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.metrics["slow_calls"] == 3
+
+
+def test_half_open():
+    changes = []
+    breaker = _breaker(open_duration=0, half_open_max_calls=2)
+    breaker.add_listener(lambda old, new: changes.append(new))
+
+    for _ in range(4):
+        breaker.allow_request()
+        breaker.record(0.01, ConnectionError())
+
+    assert breaker.allow_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record(0.01)
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.record(0.01)
+    assert breaker.state is CircuitState.CLOSED
+
+    assert changes == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+    assert breaker.metrics["opened"] == breaker.metrics["closed"] == 1
+
+
+def test_half_open_failure():
+    breaker = _breaker(open_duration=0)
+
+    for _ in range(4):
+        breaker.allow_request()
+        breaker.record(0.01, ConnectionError())
+
+    assert breaker.allow_request()
+    breaker.record(0.01, APIError())
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.metrics["opened"] == 2
+
+
+def test_cancelled_probe_is_released():
+    breaker = _breaker(open_duration=0)
+
+    for _ in range(4):
+        breaker.allow_request()
+        breaker.record(0.01, ConnectionError())
+
+    assert breaker.allow_request()
+    breaker.record(0.01, KeyboardInterrupt())
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_handler_short_circuits(stub_api):
+    stub_api.routes["get-country-from-ip"] = unavailable
+    breaker = _breaker()
+    parityvend = ParityVendAPI(secret_key, circuit_breaker=breaker)
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert stub_api.count == 4
+
+
+def test_handler_fallback(stub_api):
+    stub_api.routes["get-discount-from-ip"] = unavailable
+    parityvend = ParityVendAPI(
+        secret_key, circuit_breaker=_breaker(), fallback=no_discount_fallback
+    )
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            parityvend.get_discount_from_ip(ipv4_zimbabwe)
+
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    assert response["discount"] is None
+    assert response["country"] == {}
+    assert parityvend.get_country_from_ip(ipv4_switzerland) == Country("XX")
+    assert stub_api.count == 4
+
+    with pytest.raises(CircuitOpenError):
+        parityvend.get_quota_info()
+
+
+@pytest.mark.asyncio
+async def test_async_handler_fallback(stub_api):
+    stub_api.routes["get-discount-from-ip"] = unavailable
+    breaker = _breaker()
+    parityvend = AsyncParityVendAPI(
+        secret_key, circuit_breaker=breaker, fallback=no_discount_fallback
+    )
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            await parityvend.get_discount_from_ip(ipv4_zimbabwe)
+
+    response = await parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    assert response["discount"] is None
+    assert stub_api.count == 4
+    assert breaker.metrics["short_circuited_calls"] == 1
+
+    await parityvend.deinit()
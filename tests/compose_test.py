@@ -0,0 +1,245 @@
+import asyncio
+import pickle
+import time
+
+import pytest
+
+from parityvend_api import (
+    COUNTRIES,
+    AsyncParityVendAPI,
+    BaseCurrencyDeriver,
+    DiscountComposer,
+    ParityVendAPI,
+)
+from tests import payloads
+from tests.variables import ipv4_venezuela, ipv4_zimbabwe, secret_key
+
+IPS = [*payloads.ip_countries, "1.2.3.4"]
+
+
+def _wait_for(condition, timeout=5):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout
+        time.sleep(0.01)
+
+
+def _composer(**options):
+    composer = DiscountComposer(**options)
+    composer.update_discounts({"status": "ok", "discounts": payloads.discounts_raw})
+    for base_currency in composer.base_currencies:
+        composer.update_rates(
+            base_currency,
+            {
+                "status": "ok",
+                "rates": {
+                    code: rate / payloads.rates_usd[base_currency]
+                    for code, rate in payloads.rates_usd.items()
+                },
+            },
+        )
+    return composer
+
+
+def test_composed_response_regression():
+    composer = DiscountComposer()
+    composer.update_discounts(
+        {"status": "ok", "discounts": payloads.discounts_ve}
+    )
+    composer.update_rates(
+        "USD", {"status": "ok", "rates": payloads.rates_usd_ve}
+    )
+
+    expected = ParityVendAPI.convert_result(
+        "get-discount-from-ip", payloads.composed_discount_ve
+    )
+    response = composer.compose(COUNTRIES["VE"], "USD")
+    assert response == expected
+    assert repr(response) == repr(expected)
+    assert response.country is COUNTRIES["VE"]
+    assert composer.compose(COUNTRIES["VE"], "USD") is response
+
+
+def test_non_numeric_rates():
+    composer = DiscountComposer(base_currencies=["USD"])
+    composer.update_discounts({"status": "ok", "discounts": payloads.discounts_raw})
+    composer.update_rates(
+        "USD",
+        {"status": "ok", "rates": {**payloads.rates_usd, "ZWL": None, "CHF": "n/a"}},
+    )
+
+    # left to the API, as when the rate is missing
+    assert composer.compose(COUNTRIES["ZW"], "USD") is None
+    assert composer.compose(COUNTRIES["CH"], "USD") is None
+    response = composer.compose(COUNTRIES["VE"], "USD")
+    assert response.currency.conversion_rate == payloads.rates_usd["VES"]
+
+
+def test_not_composed():
+    composer = DiscountComposer(base_currencies=["usd"], max_age=60)
+    assert not composer.is_ready("USD")
+    assert composer.compose(COUNTRIES["ZW"], "USD") is None
+
+    composer.update_discounts({"status": "ok", "discounts": payloads.discounts_raw})
+    composer.update_rates("USD", {"status": "error", "error_name": "paid_only"})
+    assert composer.compose(COUNTRIES["ZW"], "USD") is None
+
+    composer.update_rates("USD", {"status": "ok", "rates": {"USD": 1.0}}, now=0)
+    # stale
+    assert not composer.is_ready("USD")
+    composer.update_rates("USD", {"status": "ok", "rates": {"USD": 1.0}})
+    assert composer.compose(COUNTRIES["US"], "USD").currency.conversion_rate == 1.0
+    # no exchange rate for the country's currency
+    assert composer.compose(COUNTRIES["ZW"], "USD") is None
+    assert composer.compose(COUNTRIES["ZW"], "EUR") is None
+
+    copy = pickle.loads(pickle.dumps(composer))
+    assert copy.compose(COUNTRIES["US"], "USD") == composer.compose(
+        COUNTRIES["US"], "USD"
+    )
+
+
+def test_same_as_stub_api(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+    composing = ParityVendAPI(
+        secret_key, discount_composer=DiscountComposer(["USD", "EUR"])
+    )
+    _wait_for(lambda: composing.discount_composer.is_ready("EUR"))
+    stub_api.requests.clear()
+
+    for base_currency in ("USD", "EUR"):
+        for ip in IPS:
+            expected = parityvend.get_discount_from_ip(ip, base_currency)
+            response = composing.get_discount_from_ip(ip, base_currency)
+            assert response == expected
+            assert repr(response) == repr(expected)
+
+    assert stub_api.count_endpoint("get-discount-from-ip") == 2 * len(IPS)
+    # the composing handler only looked up the country of each IP address once
+    assert stub_api.count_endpoint("get-country-from-ip") == len(IPS)
+
+    # other base currencies use the API
+    composing.get_discount_from_ip(ipv4_zimbabwe, "GBP")
+    assert stub_api.count_endpoint("get-discount-from-ip") == 2 * len(IPS) + 1
+    composing.discount_composer.stop()
+
+
+def test_refresh(stub_api):
+    composer = _composer()
+    composing = ParityVendAPI(secret_key, discount_composer=composer)
+    _wait_for(lambda: stub_api.count_endpoint("get-exchange-rate-info"))
+    assert composing.get_discount_from_ip(ipv4_venezuela).discount == 0.6
+
+    stub_api.routes["get-discounts-info"] = {
+        "status": "ok",
+        "discounts": {**payloads.discounts_raw, "VE": ["spring", 0.25]},
+    }
+    composing.refresh_discount_tables()
+
+    response = composing.get_discount_from_ip(ipv4_venezuela)
+    assert (response.discount, response.coupon_code) == (0.25, "spring")
+    assert stub_api.count_endpoint("get-discount-from-ip") == 0
+    assert composer.stats["discounts_age"] < 5
+    composer.stop()
+
+
+@pytest.mark.asyncio
+async def test_same_as_stub_api_async(stub_api):
+    async with AsyncParityVendAPI(secret_key) as parityvend, AsyncParityVendAPI(
+        secret_key, discount_composer=DiscountComposer(["USD", "EUR"])
+    ) as composing:
+        while not composing.discount_composer.is_ready("EUR"):
+            await asyncio.sleep(0.01)
+        stub_api.requests.clear()
+
+        for base_currency in ("USD", "EUR"):
+            for ip in IPS:
+                expected = await parityvend.get_discount_from_ip(ip, base_currency)
+                response = await composing.get_discount_from_ip(ip, base_currency)
+                assert response == expected
+
+        assert stub_api.count_endpoint("get-discount-from-ip") == 2 * len(IPS)
+        assert stub_api.count_endpoint("get-country-from-ip") == len(IPS)
+
+
+def test_derived(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+    deriving = ParityVendAPI(secret_key, base_currency_deriver=BaseCurrencyDeriver())
+    expected = {
+        (ip, base_currency): parityvend.get_discount_from_ip(ip, base_currency)
+        for base_currency in ("USD", "EUR", "GBP")
+        for ip in IPS
+    }
+    stub_api.requests.clear()
+
+    for (ip, base_currency), expected_response in expected.items():
+        response = deriving.get_discount_from_ip(ip, base_currency)
+        assert response == expected_response
+        assert repr(response) == repr(expected_response)
+        assert deriving.get_discount_from_ip(ip, base_currency) is response
+
+    # every IP address was only requested in USD
+    assert stub_api.count_endpoint("get-discount-from-ip") == len(IPS)
+    assert stub_api.count_endpoint("get-exchange-rate-info") == 1
+
+    deriver = deriving.base_currency_deriver
+    response = deriving.get_discount_from_ip(ipv4_zimbabwe)
+    # no exchange rate for the base currency
+    assert deriver.derive(response, "SEK") is None
+
+    copy = pickle.loads(pickle.dumps(deriver))
+    assert copy.derive(response, "EUR") == expected[ipv4_zimbabwe, "EUR"]
+
+
+def test_derived_non_numeric_rates(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    deriver = BaseCurrencyDeriver()
+    deriver.update_rates(
+        {"status": "ok", "rates": {**payloads.rates_usd, "EUR": "n/a", "ZWL": None}}
+    )
+
+    assert deriver.derive(response, "EUR") is None
+    assert deriver.derive(response, "GBP") is None
+
+    deriver.update_rates({"status": "ok", "rates": {**payloads.rates_usd, "EUR": 0}})
+    assert deriver.derive(response, "EUR") is None
+    derived = deriver.derive(response, "GBP")
+    assert derived.currency.conversion_rate == pytest.approx(
+        payloads.rates_usd["ZWL"] / payloads.rates_usd["GBP"]
+    )
+
+
+def test_derived_without_rates(stub_api):
+    stub_api.routes["get-exchange-rate-info"] = {
+        "status": "error",
+        "error_name": "paid_only",
+    }
+    deriving = ParityVendAPI(
+        secret_key, base_currency_deriver=BaseCurrencyDeriver(retry_interval=60)
+    )
+
+    for base_currency in ("EUR", "GBP"):
+        response = deriving.get_discount_from_ip(ipv4_zimbabwe, base_currency)
+        assert response == payloads.discount_payload("ZW", base_currency)
+
+    # the lookups fell back to the API, and the table was only requested once
+    assert stub_api.count_endpoint("get-discount-from-ip") == 2
+    assert stub_api.count_endpoint("get-exchange-rate-info") == 1
+    assert deriving.base_currency_deriver.is_stale()
+
+
+@pytest.mark.asyncio
+async def test_derived_async(stub_api):
+    async with AsyncParityVendAPI(secret_key) as parityvend, AsyncParityVendAPI(
+        secret_key, base_currency_deriver=BaseCurrencyDeriver()
+    ) as deriving:
+        for base_currency in ("USD", "EUR", "GBP"):
+            for ip in IPS:
+                expected = await parityvend.get_discount_from_ip(ip, base_currency)
+                response = await deriving.get_discount_from_ip(ip, base_currency)
+                assert response == expected
+
+        # three base currencies from `parityvend`, USD only from `deriving`
+        assert stub_api.count_endpoint("get-discount-from-ip") == 4 * len(IPS)
+        assert stub_api.count_endpoint("get-exchange-rate-info") == 1
@@ -0,0 +1,14 @@
+import pytest
+
+from tests import payloads
+from tests.stub_server import StubAPI, serve
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """Serve the recorded payloads locally and point both handlers at them."""
+    stub = StubAPI(payloads.routes())
+    with serve(stub) as url:
+        monkeypatch.setattr("parityvend_api.handler.API_URL", url)
+        stub.url = url
+        yield stub
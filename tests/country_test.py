@@ -1,6 +1,9 @@
 import pytest
-from parityvend_api.objects import Country
-from parityvend_api import COUNTRIES, get_country_by_code
+from parityvend_api.data import COUNTRY_CODES, COUNTRY_IDS
+from parityvend_api.objects import Country, Discounts
+from parityvend_api import COUNTRIES, ParityVendAPI, get_country_by_code
+from tests import payloads
+from tests.variables import ipv4_zimbabwe, secret_key
 
 
 def test_init():
@@ -56,3 +59,49 @@ def test_getattr_fail():
     country = Country("US")
     with pytest.raises(AttributeError):
         country.blah
+
+
+def test_ids():
+    assert COUNTRY_IDS["AC"] == 0
+    assert COUNTRY_IDS["XX"] == 255
+    for country_id, code in enumerate(COUNTRY_CODES):
+        country = COUNTRIES.get_by_id(country_id)
+        assert country.id == country_id
+        assert country is COUNTRIES[code] is get_country_by_code(code.lower())
+        # the code is the shared string from `COUNTRY_CODES`, not a copy
+        assert country.code is code
+        assert Country(code.lower().encode()).code is code
+
+
+def test_discounts_by_id():
+    discounts = Discounts(
+        {**payloads.discounts_raw, "zw": ["lower", 0.1], "ZZ": ["", 0.2]}
+    )
+    zw = COUNTRIES["ZW"]
+
+    assert discounts["ZW"].coupon_code == "lower"
+    assert (
+        discounts.get_discount_by_country(zw.id)
+        is discounts.get_discount_by_country(zw)
+        is discounts.get_discount_by_country(b"zw")
+        is discounts["ZW"]
+    )
+    assert [i for i, d in enumerate(discounts.discounts_by_id) if d] == sorted(
+        COUNTRY_IDS[code] for code in payloads.discounts_raw
+    )
+    # unknown countries are kept by code
+    assert discounts["ZZ"].country is None
+    with pytest.raises(KeyError):
+        discounts.get_discount_by_country("ZZ")
+    with pytest.raises(KeyError):
+        discounts.get_discount_by_country("GB")
+
+
+def test_cached_as_id(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) is COUNTRIES["ZW"]
+    cache_key = ("get-country-from-ip", ipv4_zimbabwe)
+    assert parityvend.cache[cache_key] == COUNTRY_IDS["ZW"]
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) is COUNTRIES["ZW"]
+    assert stub_api.count == 1
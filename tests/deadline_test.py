@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import pytest
+
+from parityvend_api import (
+    AsyncParityVendAPI,
+    DeadlineExceededError,
+    ParityVendAPI,
+    no_discount_fallback,
+)
+from parityvend_api.objects import Country
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+
+def _wait_for(condition, timeout=5):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout
+        time.sleep(0.01)
+
+
+def test_deadline_met(stub_api):
+    parityvend = ParityVendAPI(secret_key, deadline=5)
+
+    assert parityvend.get_discount_from_ip(ipv4_zimbabwe)["discount"] == 0.7
+    assert parityvend.deadline_stats["met"] == 1
+    assert parityvend.deadline_stats["missed"] == 0
+
+
+def test_deadline_missed(stub_api):
+    stub_api.delay = 0.3
+    parityvend = ParityVendAPI(secret_key, fallback=no_discount_fallback)
+
+    started = time.monotonic()
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe, deadline=0.05)
+    assert time.monotonic() - started < 0.25
+    assert response["discount"] is None
+    assert parityvend.deadline_stats["missed"] == 1
+
+    # the late response still fills the cache
+    _wait_for(lambda: parityvend.deadline_stats["completed_late"] == 1)
+    stub_api.delay = 0
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe, deadline=0.05)
+    assert response["discount"] == 0.7
+    assert stub_api.count == 1
+
+
+def test_deadline_shares_background_request(stub_api):
+    stub_api.delay = 0.3
+    parityvend = ParityVendAPI(secret_key, fallback=no_discount_fallback, deadline=0.02)
+
+    for _ in range(5):
+        assert parityvend.get_country_from_ip(ipv4_switzerland) == Country("XX")
+
+    _wait_for(lambda: parityvend.deadline_stats["completed_late"] == 1)
+    assert parityvend.get_country_from_ip(ipv4_switzerland) == Country("CH")
+    assert stub_api.count == 1
+    assert parityvend.deadline_stats["missed"] == 5
+
+
+def test_deadline_without_fallback(stub_api):
+    stub_api.delay = 0.3
+    parityvend = ParityVendAPI(secret_key)
+
+    with pytest.raises(DeadlineExceededError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe, deadline=0.02)
+
+
+def test_deadline_failed_late(stub_api):
+    stub_api.delay = 0.2
+    stub_api.routes["get-country-from-ip"] = (503, {}, b"")
+    parityvend = ParityVendAPI(secret_key, fallback=no_discount_fallback)
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe, deadline=0.02) == Country("XX")
+    _wait_for(lambda: parityvend.deadline_stats["failed_late"] == 1)
+
+
+@pytest.mark.asyncio
+async def test_async_deadline_missed(stub_api):
+    stub_api.delay = 0.3
+    parityvend = AsyncParityVendAPI(
+        secret_key, fallback=no_discount_fallback, deadline=0.05
+    )
+
+    response = await parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    assert response["discount"] is None
+    assert parityvend.deadline_stats["missed"] == 1
+
+    while parityvend.deadline_stats["completed_late"] != 1:
+        await asyncio.sleep(0.01)
+
+    response = await parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    assert response["discount"] == 0.7
+    assert stub_api.count == 1
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+async def test_async_deadline_without_fallback(stub_api):
+    stub_api.delay = 0.1
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    with pytest.raises(DeadlineExceededError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe, deadline=0)
+
+    while parityvend.deadline_stats["completed_late"] != 1:
+        await asyncio.sleep(0.01)
+    await parityvend.deinit()
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI
+from parityvend_api.decoders import get_default_json_loads
+from parityvend_api.exceptions import APIError
+from tests import payloads
+from tests.variables import ipv4_zimbabwe, secret_key
+
+
+def test_default_json_loads():
+    json_loads = get_default_json_loads()
+    payload = payloads.discount_payload("ZW", html=payloads.banner_html("ZW"))
+
+    assert json_loads(json.dumps(payload).encode("utf8")) == payload
+
+
+def test_default_json_loads_prefers_orjson():
+    orjson = pytest.importorskip("orjson")
+    assert get_default_json_loads() is orjson.loads
+
+
+def test_custom_json_loads_receives_text(stub_api):
+    received = []
+
+    def json_loads(data):
+        received.append(data)
+        return json.loads(data)
+
+    parityvend = ParityVendAPI(secret_key, json_loads=json_loads)
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe)
+
+    assert response["discount"] == 0.7
+    assert isinstance(received[0], str)
+
+
+def test_invalid_json(stub_api):
+    stub_api.routes["get-quota-info"] = (
+        200,
+        {"Content-Type": "application/json"},
+        b"{not json",
+    )
+    parityvend = ParityVendAPI(secret_key)
+
+    with pytest.raises(APIError):
+        parityvend.get_quota_info()
+
+
+@pytest.mark.asyncio
+async def test_async_custom_json_loads_receives_text(stub_api):
+    received = []
+
+    def json_loads(data):
+        received.append(data)
+        return json.loads(data)
+
+    parityvend = AsyncParityVendAPI(secret_key, json_loads=json_loads)
+    response = await parityvend.get_discount_from_ip(ipv4_zimbabwe)
+
+    assert response["discount"] == 0.7
+    assert isinstance(received[0], str)
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [b"{not json", b'{"status": "\xff\xfe"}'])
+async def test_async_invalid_json(stub_api, body):
+    stub_api.routes["get-quota-info"] = (
+        200,
+        {"Content-Type": "application/json"},
+        body,
+    )
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    with pytest.raises(APIError):
+        await parityvend.get_quota_info()
+
+    await parityvend.deinit()
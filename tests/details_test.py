@@ -1,5 +1,8 @@
+import copy
+import pickle
+
 import pytest
-from parityvend_api.objects import Response
+from parityvend_api.objects import FrozenResponse, Response
 
 
 def test_init():
@@ -37,3 +40,38 @@ def test_nested_all():
     data = {"foo": {"bar": "baz"}, "ham": "eggs"}
     response = Response(data)
     assert tuple(response.items()) == tuple(data.items())
+
+
+def test_nested_decoded_once():
+    data = {"foo": {"bar": "baz"}}
+    response = Response(data)
+    assert type(response.foo) is Response
+    assert response.foo is response.foo is response["foo"]
+    assert type(data["foo"]) is dict
+
+
+def test_slots():
+    response = Response({"foo": "bar"})
+    assert not hasattr(response, "__dict__")
+    assert not hasattr(response, "blah")
+    assert getattr(response, "blah", None) is None
+    assert copy.deepcopy(response) == response
+
+
+def test_frozen():
+    data = {"foo": {"bar": "baz"}, "ham": "eggs"}
+    response = FrozenResponse(data)
+    assert response == data
+    assert type(response.foo) is FrozenResponse
+    assert not hasattr(response, "__dict__")
+
+    with pytest.raises(TypeError):
+        response["ham"] = "spam"
+    with pytest.raises(TypeError):
+        response.foo.update(bar="qux")
+    with pytest.raises(KeyError):
+        response.blah
+
+    unpickled = pickle.loads(pickle.dumps(response))
+    assert unpickled == data
+    assert type(unpickled.foo) is FrozenResponse
@@ -0,0 +1,82 @@
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from parityvend_api import COUNTRIES, ParityVendAPI
+from parityvend_api.objects import Discounts
+from tests import payloads
+from tests.variables import secret_key
+
+
+def _raw(**changes):
+    raw = {code: list(value) for code, value in payloads.discounts_raw.items()}
+    raw.update(changes)
+    return {code: value for code, value in raw.items() if value is not None}
+
+
+def test_snapshot_reused():
+    snapshot = Discounts.get_snapshot(_raw())
+
+    assert Discounts.get_snapshot(_raw()) is snapshot
+    assert Discounts(_raw()).version == snapshot.version
+    assert Discounts(_raw(ZW=["example_coupon", 0.6])).version != snapshot.version
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+    assert snapshot.get_discount_by_country(COUNTRIES["ZW"].id).discount == 0.7
+    with pytest.raises(KeyError):
+        snapshot.get_discount_by_country(COUNTRIES["GB"].id)
+    with pytest.raises(KeyError):
+        snapshot.get_discount_by_country(-1)
+
+
+def test_version_is_stable():
+    code = (
+        "from parityvend_api.objects import Discounts; from tests import payloads; "
+        "print(Discounts(payloads.discounts_raw).version)"
+    )
+    versions = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        for _ in range(2)
+    }
+    assert versions == {Discounts(payloads.discounts_raw).version}
+
+
+def test_diff():
+    old = Discounts.get_snapshot(_raw(GB=["", 0.1]))
+    new = Discounts.get_snapshot(
+        _raw(SV=["example_coupon", 0.4], US=["spring", 0.0], FR=["", 0.2])
+    )
+
+    assert old.diff(old) == {} == old.diff(Discounts(_raw(GB=["", 0.1])))
+    # unchanged discounts are shared with the previous snapshot
+    assert new["ZW"] is old["ZW"]
+    assert new["SV"] is not old["SV"]
+
+    changes = old.diff(new)
+    assert set(changes) == {"SV", "US", "FR", "GB"}
+    assert changes["SV"] == (old["SV"], new["SV"])
+    assert changes["SV"][1].discount == 0.4
+    assert changes["FR"] == (None, new["FR"])
+    assert changes["GB"][1] is None
+
+
+def test_unknown_countries():
+    old = Discounts(_raw(ZZ=["", 0.1]))
+    new = Discounts(_raw(ZZ=["", 0.2], YY=["", 0.3]))
+
+    assert set(old.diff(new)) == {"ZZ", "YY"}
+    assert old.diff(new)["YY"][0] is None
+
+
+def test_handler_reuses_snapshot(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+
+    first = parityvend.get_discounts_info(cache=False)
+    second = parityvend.get_discounts_info(cache=False)
+
+    assert first is not second
+    assert first.discounts is second.discounts
+    assert stub_api.count == 2
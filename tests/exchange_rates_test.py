@@ -0,0 +1,86 @@
+import pickle
+import time
+from array import array
+
+import pytest
+
+from parityvend_api import DiscountComposer, ExchangeRates, ParityVendAPI
+from parityvend_api.data import CURRENCY_IDS
+from tests import payloads
+from tests.variables import secret_key
+
+
+def test_cross_rates():
+    rates = ExchangeRates(payloads.rates_usd)
+
+    assert rates == payloads.rates_usd
+    assert rates.get_rate("USD", "EUR") == payloads.rates_usd["EUR"]
+    assert rates.get_rate("eur", b"GBP") == pytest.approx(0.7603 / 0.9012)
+    assert rates.get_rate(CURRENCY_IDS["GBP"], "GBP") == 1.0
+    assert rates.rates_by_id[rates.get_currency_id("CHF")] == 0.8471
+    assert rates.rates_by_id[CURRENCY_IDS["SEK"]] == 0.0
+    assert pickle.loads(pickle.dumps(rates)) == rates
+
+    for currency in ("SEK", "XYZ", -1, 1000):
+        with pytest.raises(KeyError):
+            rates.get_rate("USD", currency)
+
+    # a currency this version of the library does not know about
+    rates = ExchangeRates({**payloads.rates_usd, "XYZ": 2.0})
+    assert rates.get_currency_id("XYZ") == len(CURRENCY_IDS)
+    assert rates.get_rate("XYZ", "USD") == 0.5
+
+
+def test_invalid_rates():
+    raw_rates = {**payloads.rates_usd, "SEK": None, "NOK": "n/a", "DKK": 0}
+    rates = ExchangeRates(raw_rates)
+
+    assert rates == raw_rates
+    for currency in ("SEK", "NOK", "DKK"):
+        assert rates.rates_by_id[CURRENCY_IDS[currency]] == 0.0
+        with pytest.raises(KeyError):
+            rates.get_rate("USD", currency)
+    assert rates.get_rate("USD", "EUR") == payloads.rates_usd["EUR"]
+
+    rebased = rates.rebase("EUR")
+    assert rebased["SEK"] is None
+    assert rebased.get_rate("EUR", "USD") == pytest.approx(
+        1 / payloads.rates_usd["EUR"]
+    )
+
+
+def test_convert():
+    rates = ExchangeRates(payloads.rates_usd)
+    rate = rates.get_rate("EUR", "JPY")
+
+    assert rates.convert(10, "EUR", "JPY") == 10 * rate
+    converted = rates.convert([10, 19.99, 0], "EUR", "JPY")
+    assert converted == array("d", [10 * rate, 19.99 * rate, 0.0])
+    assert rates.convert(array("d", [10, 19.99, 0]), "EUR", "JPY") == converted
+    assert rates.convert((), "EUR", "JPY") == array("d")
+
+
+def test_rebase(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+    rates = parityvend.get_exchange_rate_info("USD").rates
+
+    assert isinstance(rates, ExchangeRates)
+    for base_currency in ("EUR", "GBP", "JPY"):
+        assert rates.rebase(base_currency) == parityvend.get_exchange_rate_info(
+            base_currency
+        ).rates
+    with pytest.raises(KeyError):
+        rates.rebase("SEK")
+
+
+def test_composer_refresh(stub_api):
+    composer = DiscountComposer(["USD", "EUR", "GBP"])
+    parityvend = ParityVendAPI(secret_key, discount_composer=composer)
+    while not composer.is_ready("GBP"):
+        time.sleep(0.01)
+    composer.stop()
+
+    # the EUR and GBP tables are rebased from the USD table
+    assert stub_api.count_endpoint("get-exchange-rate-info") == 1
+    parityvend.refresh_discount_tables()
+    assert stub_api.count_endpoint("get-exchange-rate-info") == 2
@@ -0,0 +1,213 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from parityvend_api import (
+    AdaptiveLimiter,
+    AsyncParityVendAPI,
+    CircuitBreaker,
+    HedgePolicy,
+    ParityVendAPI,
+    QuotaManager,
+    RateLimiter,
+    RetryPolicy,
+    URLBalancer,
+)
+from parityvend_api.objects import Country
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+
+def _lookup(parityvend, ip):
+    return parityvend.get_country_from_ip(ip)
+
+
+def test_pickle_components():
+    limiter = AdaptiveLimiter(initial_limit=5)
+    limiter.acquire()
+    rate_limiter = RateLimiter(rate=10)
+    rate_limiter.acquire()
+
+    for component in (
+        CircuitBreaker(window_size=5),
+        HedgePolicy(percentile=0.9),
+        limiter,
+        rate_limiter,
+        QuotaManager(reserve=0.2),
+        URLBalancer(["http://a", "http://b"]),
+        RetryPolicy(max_attempts=5),
+    ):
+        copy = pickle.loads(pickle.dumps(component))
+        assert type(copy) is type(component)
+
+    copy = pickle.loads(pickle.dumps(rate_limiter))
+    assert copy.rate == 10
+    assert copy.try_acquire()
+
+    copy = pickle.loads(pickle.dumps(limiter))
+    assert copy.limit == 5
+    assert copy.inflight == 0
+    copy.acquire()
+    copy.release()
+
+
+def test_pickle_handler(stub_api):
+    limiter = AdaptiveLimiter(initial_limit=3)
+    parityvend = ParityVendAPI(
+        secret_key,
+        limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=2),
+        api_urls=[stub_api.url],
+        cache_options={"maxsize": 16},
+    )
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    data = pickle.dumps(parityvend)
+    copy = pickle.loads(data)
+
+    assert copy.session is not parityvend.session
+    assert copy.cache_options == {"maxsize": 16, "ttl": 24 * 60 * 60}
+    assert len(copy.cache.cache) == 0
+    assert copy.limiter.limit == 3
+    assert copy.retry_policy.max_attempts == 2
+    assert copy.get_country_from_ip(ipv4_switzerland) == Country("CH")
+    assert stub_api.count == 2
+
+
+@pytest.mark.asyncio
+async def test_pickle_async_handler(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key, api_urls=[stub_api.url])
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    copy = pickle.loads(pickle.dumps(parityvend))
+    assert copy.session is None
+    assert await copy.get_country_from_ip(ipv4_switzerland) == Country("CH")
+
+    await parityvend.aclose()
+    await copy.aclose()
+
+
+def _on_state_change(old_state, new_state):
+    pass
+
+
+def test_pickle_unpicklable_callables():
+    for options in (
+        {"fallback": lambda endpoint_name, input_vars: None},
+        {"json_loads": lambda data: {}},
+        {"circuit_breaker": CircuitBreaker(on_state_change=lambda old, new: None)},
+    ):
+        parityvend = ParityVendAPI(secret_key, **options)
+        with pytest.raises(TypeError, match="is not picklable"):
+            pickle.dumps(parityvend)
+        parityvend.close()
+
+    parityvend = ParityVendAPI(
+        secret_key, circuit_breaker=CircuitBreaker(on_state_change=_on_state_change)
+    )
+    copy = pickle.loads(pickle.dumps(parityvend))
+    assert copy.circuit_breaker.listeners == [_on_state_change]
+    parityvend.close()
+    copy.close()
+
+
+def test_process_pool(stub_api):
+    parityvend = ParityVendAPI(secret_key, api_urls=[stub_api.url])
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        countries = list(
+            executor.map(
+                _lookup,
+                [parityvend] * 4,
+                [ipv4_zimbabwe, ipv4_switzerland] * 2,
+            )
+        )
+    assert countries == [Country("ZW"), Country("CH")] * 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_fork(stub_api):
+    limiter = AdaptiveLimiter(initial_limit=2)
+    parityvend = ParityVendAPI(secret_key, limiter=limiter)
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    session = parityvend.session
+    limiter.acquire()
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            ok = (
+                parityvend.session is not session
+                and limiter.inflight == 0
+                # the cache was kept, so this is not a request
+                and parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+                and parityvend.get_country_from_ip(ipv4_switzerland) == Country("CH")
+            )
+        finally:
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert parityvend.session is session
+    assert limiter.inflight == 1
+    assert stub_api.count == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_fork_starts_pollers_on_first_request(stub_api):
+    quota_manager = QuotaManager(poll_interval=60)
+    parityvend = ParityVendAPI(secret_key, quota_manager=quota_manager)
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert quota_manager._thread.is_alive()
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            # no thread is started by the after-fork hook, nor by a cache hit
+            ok = (
+                quota_manager._thread is None
+                and parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+                and quota_manager._thread is None
+                and parityvend.get_country_from_ip(ipv4_switzerland) == Country("CH")
+                and quota_manager._thread.is_alive()
+            )
+        finally:
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    parityvend.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_fork_async(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    async def lookup(ip):
+        return await parityvend.get_country_from_ip(ip)
+
+    loop = asyncio.new_event_loop()
+    assert loop.run_until_complete(lookup(ipv4_zimbabwe)) == Country("ZW")
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            ok = not parityvend._loop_sessions and asyncio.run(
+                lookup(ipv4_switzerland)
+            ) == Country("CH")
+        finally:
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert loop.run_until_complete(lookup(ipv4_switzerland)) == Country("CH")
+
+    loop.run_until_complete(parityvend.aclose())
+    loop.close()
@@ -1,4 +1,3 @@
-import json
 from ipaddress import IPv4Address, IPv6Address
 
 import pytest
@@ -6,6 +5,7 @@ import aiohttp
 
 from parityvend_api import AsyncParityVendAPI
 from parityvend_api.cache.default import DefaultCache
+from parityvend_api.decoders import get_default_json_loads
 from parityvend_api.exceptions import ProcessingError
 from parityvend_api.objects import Country, Response, Discounts, Discount
 from tests.variables import (
@@ -20,6 +20,15 @@ from tests.variables import (
 )
 
 
+def _without_conversion_rate(response):
+    # conversion rates change all the time; responses are immutable, so compare a copy
+    currency = response["currency"]
+    return {
+        **response,
+        "currency": {k: v for k, v in currency.items() if k != "conversion_rate"},
+    }
+
+
 @pytest.mark.asyncio
 async def test_init():
     parityvend = AsyncParityVendAPI(secret_key)
@@ -33,7 +42,7 @@ async def test_init():
         }
     }
 
-    assert parityvend.json_loads == json.loads
+    assert parityvend.json_loads == get_default_json_loads()
     assert parityvend.session is None
     await parityvend.init()
     assert isinstance(parityvend.session, aiohttp.ClientSession)
@@ -284,10 +293,10 @@ async def test_get_discount_from_ip_none():
     response_free = await parityvend_free.get_discount_from_ip(google_ipv4)
     response_free_ch = await parityvend_free.get_discount_from_ip(ipv4_switzerland)
 
-    response["currency"].pop("conversion_rate")
-    response_ch["currency"].pop("conversion_rate")
-    response_free["currency"].pop("conversion_rate")
-    response_free_ch["currency"].pop("conversion_rate")
+    response = _without_conversion_rate(response)
+    response_ch = _without_conversion_rate(response_ch)
+    response_free = _without_conversion_rate(response_free)
+    response_free_ch = _without_conversion_rate(response_free_ch)
 
     assert response == {
         "status": "ok",
@@ -351,10 +360,10 @@ async def test_get_discount_with_html_from_ip_none():
         ipv4_switzerland
     )
 
-    response["currency"].pop("conversion_rate")
-    response_ch["currency"].pop("conversion_rate")
-    response_free["currency"].pop("conversion_rate")
-    response_free_ch["currency"].pop("conversion_rate")
+    response = _without_conversion_rate(response)
+    response_ch = _without_conversion_rate(response_ch)
+    response_free = _without_conversion_rate(response_free)
+    response_free_ch = _without_conversion_rate(response_free_ch)
 
     assert response == {
         "status": "ok",
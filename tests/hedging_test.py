@@ -0,0 +1,140 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from parityvend_api import AsyncParityVendAPI, HedgePolicy, ParityVendAPI
+from parityvend_api.objects import Country
+from tests.variables import ipv4_zimbabwe, secret_key
+
+
+def _first_slow(seconds=0.5):
+    counter = itertools.count()
+    return lambda: seconds if next(counter) == 0 else 0
+
+
+def test_delay_percentile():
+    policy = HedgePolicy(percentile=0.9, min_samples=10, initial_delay=1.0)
+    assert policy.get_delay() == 1.0
+
+    for latency in range(1, 101):
+        policy.record_latency(latency / 1000)
+    assert policy.get_delay() == pytest.approx(0.09, abs=0.002)
+
+
+def test_delay_bounds():
+    policy = HedgePolicy(min_samples=1, min_delay=0.05, max_delay=0.2)
+
+    policy.record_latency(0.001)
+    assert policy.get_delay() == 0.05
+
+    for _ in range(16):
+        policy.record_latency(5)
+    assert policy.get_delay() == 0.2
+
+
+def test_budget():
+    policy = HedgePolicy(budget=0.1)
+
+    for _ in range(20):
+        policy.get_delay()
+    assert policy.try_hedge()
+    assert policy.try_hedge()
+    assert not policy.try_hedge()
+    assert policy.stats["hedged"] == 2
+
+
+def test_hedged_request(stub_api):
+    stub_api.delay = _first_slow()
+    policy = HedgePolicy(initial_delay=0.05, budget=1.0)
+    parityvend = ParityVendAPI(secret_key, hedge_policy=policy)
+
+    started = time.monotonic()
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert time.monotonic() - started < 0.4
+
+    assert stub_api.count == 2
+    assert policy.stats["hedged"] == 1
+    assert policy.stats["hedge_wins"] == 1
+
+
+def test_hedge_budget_exhausted(stub_api):
+    stub_api.delay = _first_slow(0.2)
+    policy = HedgePolicy(initial_delay=0.05, budget=0)
+    parityvend = ParityVendAPI(secret_key, hedge_policy=policy)
+
+    started = time.monotonic()
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert time.monotonic() - started >= 0.2
+
+    assert stub_api.count == 1
+    assert policy.stats["hedged"] == 0
+
+
+def test_fast_request_is_not_hedged(stub_api):
+    policy = HedgePolicy(initial_delay=1, budget=1.0)
+    parityvend = ParityVendAPI(secret_key, hedge_policy=policy)
+
+    for _ in range(3):
+        parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+
+    assert stub_api.count == 3
+    assert policy.stats["requests"] == 3
+    assert policy.stats["hedged"] == 0
+
+
+def test_queued_requests_are_not_hedged(stub_api):
+    stub_api.delay = 0.1
+    policy = HedgePolicy(initial_delay=0.3, budget=1.0)
+    parityvend = ParityVendAPI(secret_key, pool_maxsize=2, hedge_policy=policy)
+    callers = 4 * parityvend._get_hedge_executor()._max_workers
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        # each caller waits for up to 0.4 s for a free thread, longer than the delay
+        countries = list(
+            executor.map(
+                lambda _: parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False),
+                range(callers),
+            )
+        )
+
+    assert countries == [Country("ZW")] * callers
+    assert stub_api.count == callers
+    assert policy.stats["hedged"] == 0
+
+
+def test_requests_do_not_wait_for_hedge_threads(stub_api):
+    stub_api.delay = 0.1
+    policy = HedgePolicy(initial_delay=0.3, budget=1.0)
+    parityvend = ParityVendAPI(secret_key, pool_maxsize=2, hedge_policy=policy)
+    max_workers = parityvend._get_hedge_executor()._max_workers
+    callers = 4 * max_workers
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        list(
+            executor.map(
+                lambda _: parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False),
+                range(callers),
+            )
+        )
+
+    # the callers without a free hedge thread sent their requests themselves
+    assert stub_api.peak_inflight > max_workers
+    assert parityvend._hedge_threads_busy == 0
+
+
+@pytest.mark.asyncio
+async def test_async_hedged_request(stub_api):
+    stub_api.delay = _first_slow()
+    policy = HedgePolicy(initial_delay=0.05, budget=1.0)
+    parityvend = AsyncParityVendAPI(secret_key, hedge_policy=policy)
+
+    started = time.monotonic()
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert time.monotonic() - started < 0.4
+
+    assert stub_api.count == 2
+    assert policy.stats["hedge_wins"] == 1
+
+    await parityvend.deinit()
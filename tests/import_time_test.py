@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_is_lazy():
+    code = """
+import sys
+import parityvend_api
+from parityvend_api import COUNTRIES
+print(sorted(m for m in ("aiohttp", "asyncio", "requests") if m in sys.modules))
+print(sum(country is not None for country in COUNTRIES._countries))
+"""
+    assert _run(code).stdout.splitlines() == ["[]", "0"]
+
+
+def test_transports_imported_on_use():
+    code = """
+import sys
+import parityvend_api
+print(sorted(m for m in ("aiohttp", "asyncio", "requests") if m in sys.modules))
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI
+print(sorted(m for m in ("aiohttp", "requests") if m in sys.modules))
+ParityVendAPI("key")
+print(sorted(m for m in ("aiohttp", "requests") if m in sys.modules))
+AsyncParityVendAPI("key")
+print(sorted(m for m in ("aiohttp", "requests") if m in sys.modules))
+"""
+    assert _run(code).stdout.splitlines() == [
+        "[]",
+        "[]",
+        "['requests']",
+        "['aiohttp', 'requests']",
+    ]
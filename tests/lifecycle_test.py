@@ -0,0 +1,199 @@
+import asyncio
+import gc
+import threading
+import time
+import weakref
+
+import aiohttp
+import pytest
+
+from parityvend_api import (
+    AsyncParityVendAPI,
+    DeadlineExceededError,
+    DiscountComposer,
+    ParityVendAPI,
+    QuotaManager,
+)
+from parityvend_api.handler import _clients
+from parityvend_api.exceptions import ConnectionError
+from parityvend_api.objects import Country
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+
+@pytest.mark.asyncio
+async def test_context_manager(stub_api):
+    async with AsyncParityVendAPI(secret_key) as parityvend:
+        session = parityvend.session
+        assert isinstance(session, aiohttp.ClientSession)
+        assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    assert session.closed
+    assert parityvend.session is None
+
+
+def test_session_per_loop(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key)
+    sessions = []
+
+    async def lookup(ip):
+        sessions.append(parityvend.session)
+        result = await parityvend.get_country_from_ip(ip, cache=False)
+        sessions.append(parityvend.session)
+        return result
+
+    # one loop after another, as with pytest or repeated asyncio.run calls
+    assert asyncio.run(lookup(ipv4_zimbabwe)) == Country("ZW")
+    assert asyncio.run(lookup(ipv4_switzerland)) == Country("CH")
+    assert sessions[0] is None and sessions[2] is None
+    assert sessions[1] is not sessions[3]
+
+    # and several loops at the same time, each in its own thread
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(asyncio.run(lookup(ipv4_zimbabwe)))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [Country("ZW")] * 4
+    assert len(set(map(id, sessions[4:]))) >= 4
+
+    asyncio.run(parityvend.aclose())
+
+
+def test_aclose_other_loop(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+
+    async def init():
+        await parityvend.init()
+        return parityvend.session
+
+    session = asyncio.run_coroutine_threadsafe(init(), loop).result()
+    asyncio.run(parityvend.aclose())
+    assert session.closed
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_aclose_stopped_loop(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key)
+    loop = asyncio.new_event_loop()
+
+    async def lookup():
+        await parityvend.get_country_from_ip(ipv4_zimbabwe)
+        return parityvend.session
+
+    session = loop.run_until_complete(lookup())
+    asyncio.run(parityvend.aclose())
+    assert session.closed
+
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_deinit_does_not_cancel(stub_api, caplog):
+    stub_api.delay = 0.5
+    parityvend = AsyncParityVendAPI(secret_key)
+    await parityvend.init()
+    session = parityvend.session
+
+    task = asyncio.ensure_future(parityvend.get_country_from_ip(ipv4_zimbabwe))
+    await asyncio.sleep(0.05)
+    await parityvend.deinit()
+
+    assert session.closed
+    # unlike `aclose`, the requests in flight are not drained and cancelled
+    assert "requests in flight" not in caplog.text
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_aclose_drains(stub_api):
+    stub_api.delay = 0.2
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    task = asyncio.ensure_future(parityvend.get_country_from_ip(ipv4_zimbabwe))
+    await asyncio.sleep(0.05)
+    await parityvend.aclose(drain_timeout=5)
+
+    assert task.done()
+    assert task.result() == Country("ZW")
+    assert parityvend.session is None
+
+
+@pytest.mark.asyncio
+async def test_aclose_drains_deadline_refresh(stub_api):
+    stub_api.delay = 0.2
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    with pytest.raises(DeadlineExceededError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe, deadline=0.01)
+    await parityvend.aclose()
+
+    assert parityvend.deadline_stats["completed_late"] == 1
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert stub_api.count == 1
+    await parityvend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_drain_timeout(stub_api):
+    stub_api.delay = 0.5
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    task = asyncio.ensure_future(parityvend.get_country_from_ip(ipv4_zimbabwe))
+    await asyncio.sleep(0.05)
+    await parityvend.aclose(drain_timeout=0.05)
+
+    with pytest.raises(ConnectionError):
+        await task
+
+
+def test_sync_close(stub_api):
+    quota_manager = QuotaManager(poll_interval=60)
+    composer = DiscountComposer(refresh_interval=60)
+    with ParityVendAPI(
+        secret_key, quota_manager=quota_manager, discount_composer=composer
+    ) as parityvend:
+        assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+        assert quota_manager._thread.is_alive()
+
+    for thread in (quota_manager._thread, composer._thread):
+        thread.join(5)
+        assert not thread.is_alive()
+    assert parityvend not in _clients
+
+    with pytest.raises(TypeError):
+        with AsyncParityVendAPI(secret_key):
+            pass
+
+
+def test_dropped_client_stops_pollers(stub_api):
+    quota_manager = QuotaManager(poll_interval=0.05)
+    composer = DiscountComposer(refresh_interval=0.05)
+    parityvend = ParityVendAPI(
+        secret_key, quota_manager=quota_manager, discount_composer=composer
+    )
+    client = weakref.ref(parityvend)
+    del parityvend
+
+    # the pollers only hold the client while they poll
+    started = time.monotonic()
+    while client() is not None:
+        assert time.monotonic() - started < 5
+        gc.collect()
+        time.sleep(0.01)
+
+    for thread in (quota_manager._thread, composer._thread):
+        thread.join(5)
+        assert not thread.is_alive()
@@ -0,0 +1,300 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from parityvend_api import (
+    AdaptiveLimiter,
+    AsyncParityVendAPI,
+    ParityVendAPI,
+    Priority,
+    RetryPolicy,
+)
+from parityvend_api.exceptions import APIError, ConnectionError, ProcessingError
+from parityvend_api.objects import Country
+from tests.variables import (
+    ipv4_switzerland,
+    ipv4_venezuela,
+    ipv4_zimbabwe,
+    secret_key,
+)
+
+
+def _fill(limiter):
+    for _ in range(limiter.limit):
+        limiter.acquire()
+
+
+def test_additive_increase():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=6)
+
+    for _ in range(40):
+        _fill(limiter)
+        for _ in range(limiter.limit):
+            limiter.release(0.01)
+
+    assert limiter.limit == 6
+    assert limiter.inflight == 0
+
+
+def test_no_increase_when_idle():
+    limiter = AdaptiveLimiter(initial_limit=10)
+
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 10
+
+
+def test_decrease_on_failure():
+    limiter = AdaptiveLimiter(initial_limit=10, backoff_ratio=0.5, min_limit=2)
+
+    limiter.acquire()
+    limiter.release(0.01, ConnectionError())
+    assert limiter.limit == 5
+
+    for exc in (APIError(status_code=503), ConnectionError()):
+        limiter.acquire()
+        limiter.release(0.01, exc)
+    assert limiter.limit == 2
+
+    limiter.acquire()
+    limiter.release(0.01, ProcessingError())
+    assert limiter.limit == 2
+
+
+def test_decrease_on_latency():
+    limiter = AdaptiveLimiter(initial_limit=10, tolerance=2, backoff_ratio=0.5)
+
+    limiter.acquire()
+    limiter.release(0.01)
+    limiter.acquire()
+    limiter.release(0.015)
+    assert limiter.limit == 10
+
+    limiter.acquire()
+    limiter.release(0.05)
+    assert limiter.limit == 5
+
+    fixed = AdaptiveLimiter(initial_limit=10, latency_target=1, backoff_ratio=0.5)
+    fixed.acquire()
+    fixed.release(1.5)
+    assert fixed.limit == 5
+
+
+def test_queue_depth():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    limiter.acquire()
+
+    acquired = threading.Event()
+
+    def waiter():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while limiter.queue_depth != 1:
+        pass
+    assert not acquired.is_set()
+
+    limiter.release()
+    assert acquired.wait(5)
+    thread.join()
+    assert limiter.queue_depth == 0
+    assert limiter.inflight == 1
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_cancelled():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    await limiter.acquire_async()
+
+    task = asyncio.ensure_future(limiter.acquire_async())
+    await asyncio.sleep(0.01)
+    assert limiter.queue_depth == 1
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.queue_depth == 0
+
+    limiter.release()
+    assert limiter.inflight == 0
+
+
+async def _acquire_in_order(limiter, priorities, order):
+    async def acquire(index, priority):
+        await limiter.acquire_async(priority)
+        order.append(index)
+
+    tasks = []
+    for index, priority in enumerate(priorities, len(order) + limiter.queue_depth):
+        tasks.append(asyncio.ensure_future(acquire(index, priority)))
+        await asyncio.sleep(0.01)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    await limiter.acquire_async()
+
+    order = []
+    tasks = await _acquire_in_order(
+        limiter,
+        [Priority.BACKGROUND, Priority.BACKGROUND, Priority.INTERACTIVE],
+        order,
+    )
+    assert limiter.get_queue_depth(Priority.BACKGROUND) == 2
+    assert limiter.get_queue_depth(Priority.INTERACTIVE) == 1
+
+    for _ in tasks:
+        limiter.release()
+        await asyncio.sleep(0.01)
+    assert order == [2, 0, 1]
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_starvation_protection():
+    limiter = AdaptiveLimiter(initial_limit=1, starvation_timeout=0.05)
+    await limiter.acquire_async()
+
+    order = []
+    tasks = await _acquire_in_order(limiter, [Priority.BACKGROUND], order)
+    await asyncio.sleep(0.05)
+    tasks += await _acquire_in_order(limiter, [Priority.INTERACTIVE], order)
+
+    for _ in tasks:
+        limiter.release()
+        await asyncio.sleep(0.01)
+    assert order == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_interactive_ahead_of_bulk(stub_api):
+    stub_api.delay = 0.02
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    parityvend = AsyncParityVendAPI(secret_key, limiter=limiter)
+
+    bulk = asyncio.ensure_future(
+        parityvend.get_countries_from_ips(
+            [ipv4_zimbabwe, ipv4_switzerland] * 5, cache=False
+        )
+    )
+    await asyncio.sleep(0.03)
+    assert await parityvend.get_country_from_ip(ipv4_venezuela) == Country("VE")
+    assert not bulk.done()
+
+    await bulk
+    paths = stub_api.requests
+    assert [ipv4_venezuela in path for path in paths].index(True) <= 2
+
+    await parityvend.deinit()
+
+
+def test_bulk(stub_api):
+    stub_api.delay = 0.02
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+    parityvend = ParityVendAPI(secret_key, limiter=limiter)
+
+    ips = [ipv4_zimbabwe, ipv4_switzerland] * 10
+    countries = parityvend.get_countries_from_ips(ips, cache=False)
+
+    assert countries == [Country("ZW"), Country("CH")] * 10
+    assert stub_api.count == 20
+    assert limiter.inflight == 0
+    assert 1 <= limiter.limit <= 4
+
+    discounts = parityvend.get_discounts_from_ips(ips)
+    assert [discount["discount"] for discount in discounts] == [0.7, 0.0] * 10
+
+
+def test_bulk_return_exceptions(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+
+    results = parityvend.get_countries_from_ips(
+        [ipv4_zimbabwe, b"\xff"], return_exceptions=True
+    )
+    assert results[0] == Country("ZW")
+    assert isinstance(results[1], UnicodeDecodeError)
+
+    with pytest.raises(UnicodeDecodeError):
+        parityvend.get_countries_from_ips([ipv4_zimbabwe, b"\xff"])
+
+
+def test_bulk_failure_cancels_pending(stub_api):
+    stub_api.delay = 0.05
+    parityvend = ParityVendAPI(secret_key)
+
+    with pytest.raises(UnicodeDecodeError):
+        parityvend.get_countries_from_ips(
+            [b"\xff"] + [ipv4_zimbabwe] * 40, cache=False, max_concurrency=2
+        )
+    # only the lookups already running when the batch failed were sent
+    assert stub_api.count <= 2
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_failure_cancels_pending(stub_api):
+    stub_api.delay = 0.05
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    with pytest.raises(UnicodeDecodeError):
+        await parityvend.get_countries_from_ips(
+            [b"\xff"] + [ipv4_zimbabwe] * 40, cache=False, max_concurrency=2
+        )
+    await asyncio.sleep(0.2)
+    assert stub_api.count <= 2
+
+    await parityvend.deinit()
+
+
+def test_latency_excludes_retry_delays(stub_api):
+    responses = iter([(429, {"Retry-After": "0.3"}, b"busy")])
+    route = stub_api.routes["get-country-from-ip"]
+    stub_api.routes["get-country-from-ip"] = lambda parts: next(responses, None) or (
+        route(parts)
+    )
+    limiter = AdaptiveLimiter()
+    latencies = []
+    release = limiter.release
+
+    def record_release(latency=None, exc=None):
+        latencies.append(latency)
+        release(latency, exc)
+
+    limiter.release = record_release
+    parityvend = ParityVendAPI(secret_key, limiter=limiter, retry_policy=RetryPolicy())
+
+    started = time.monotonic()
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert time.monotonic() - started >= 0.3
+    # the limiter got the latency of the successful attempt, not of the whole call
+    assert len(latencies) == 1 and latencies[0] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_shared_limiter(stub_api):
+    stub_api.delay = 0.02
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+    parityvend = AsyncParityVendAPI(secret_key, limiter=limiter)
+    parityvend_sync = ParityVendAPI(secret_key, limiter=limiter)
+
+    ips = [ipv4_zimbabwe, ipv4_switzerland] * 10
+    countries, sync_countries = await asyncio.gather(
+        parityvend.get_countries_from_ips(ips, cache=False),
+        asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: parityvend_sync.get_countries_from_ips(ips, cache=False),
+        ),
+    )
+
+    assert countries == sync_countries == [Country("ZW"), Country("CH")] * 10
+    assert stub_api.count == 40
+    assert limiter.inflight == 0
+    assert limiter.queue_depth == 0
+
+    await parityvend.deinit()
@@ -0,0 +1,139 @@
+import math
+import multiprocessing
+
+import pytest
+
+from parityvend_api import BulkProcessPool, ParityVendAPI
+from parityvend_api.data import COUNTRY_IDS
+from tests import payloads
+from tests.variables import (
+    ipv4_switzerland,
+    ipv4_venezuela,
+    ipv4_zimbabwe,
+    secret_key,
+)
+
+
+class FailingParityVendAPI(ParityVendAPI):
+    # defined at module level, so that spawned workers can unpickle it
+    def get_countries_from_ips(self, ips, *args, **kwargs):
+        if "8.8.8.8" in ips:
+            raise ValueError("bad chunk")
+        return super().get_countries_from_ips(ips, *args, **kwargs)
+
+
+@pytest.fixture
+def pool(stub_api):
+    # spawned workers do not see the monkeypatched API_URL, so pass the URL explicitly
+    parityvend = ParityVendAPI(secret_key, api_urls=[stub_api.url])
+    context = multiprocessing.get_context("spawn")
+    with BulkProcessPool(parityvend, 2, chunk_size=4, mp_context=context) as pool:
+        yield pool
+
+
+def _rows(chunks):
+    rows = {}
+    for chunk in chunks:
+        for i, index in enumerate(chunk["index"]):
+            rows[index] = {column: values[i] for column, values in chunk.items()}
+    return rows
+
+
+def test_iter_countries(stub_api, pool):
+    ips = [ipv4_zimbabwe, ipv4_switzerland, ipv4_venezuela, "8.8.8.8"] * 5
+
+    rows = _rows(pool.iter_countries(iter(ips)))
+
+    assert sorted(rows) == list(range(len(ips)))
+    for index, ip in enumerate(ips):
+        assert rows[index]["ip"] == ip
+        assert rows[index]["country"] == payloads.ip_countries[ip]
+        assert rows[index]["country_id"] == COUNTRY_IDS[rows[index]["country"]]
+        assert rows[index]["error"] is None
+    # every IP address went to one worker, which cached it
+    assert stub_api.count_endpoint("get-country-from-ip") == 4
+
+
+def test_iter_discounts(stub_api, pool):
+    ips = [ipv4_zimbabwe, ipv4_switzerland, "1.2.3.4"]
+
+    chunks = list(pool.iter_discounts(ips, "EUR"))
+    rows = _rows(chunks)
+
+    for chunk in chunks:
+        assert chunk["discount"].typecode == "d"
+        assert chunk["conversion_rate"].typecode == "d"
+    assert rows[0]["country"] == "ZW"
+    assert rows[0]["discount"] == 0.7
+    assert rows[0]["coupon_code"] == "example_coupon"
+    assert rows[0]["currency_code"] == "ZWL"
+    assert rows[0]["conversion_rate"] == pytest.approx(
+        payloads.rates_usd["ZWL"] / payloads.rates_usd["EUR"]
+    )
+    assert rows[1]["country"] == "CH"
+    assert rows[1]["currency_code"] == "CHF"
+    # no discount for an unknown country
+    assert rows[2]["country"] is None
+    assert math.isnan(rows[2]["discount"])
+    assert math.isnan(rows[2]["conversion_rate"])
+
+
+def test_errors(stub_api, pool):
+    stub_api.routes["get-country-from-ip"] = (500, {}, b"")
+
+    rows = _rows(pool.iter_countries([ipv4_zimbabwe, ipv4_switzerland]))
+
+    for row in rows.values():
+        assert row["country"] is None
+        assert row["country_id"] == -1
+        assert "Error" in row["error"]
+
+
+def test_error_payloads(stub_api):
+    stub_api.routes["get-discount-from-ip"] = {
+        "status": "error",
+        "error_name": "invalid_ip",
+    }
+    parityvend = ParityVendAPI(
+        secret_key, api_urls=[stub_api.url], raise_exc_on_error=False
+    )
+    context = multiprocessing.get_context("spawn")
+
+    with BulkProcessPool(parityvend, 1, mp_context=context) as pool:
+        rows = _rows(pool.iter_discounts([ipv4_zimbabwe, ipv4_switzerland]))
+
+    for row in rows.values():
+        assert row["country"] is None
+        assert row["country_id"] == -1
+        assert math.isnan(row["discount"])
+        assert row["error"] == "invalid_ip"
+
+
+def test_chunk_failure(stub_api):
+    parityvend = FailingParityVendAPI(secret_key, api_urls=[stub_api.url])
+    context = multiprocessing.get_context("spawn")
+
+    with BulkProcessPool(parityvend, 1, chunk_size=2, mp_context=context) as pool:
+        with pytest.raises(ValueError, match="bad chunk"):
+            list(pool.iter_countries([ipv4_zimbabwe, "8.8.8.8"] * 3))
+
+        # the worker is still alive, and the chunks left over from the failed run are
+        # discarded
+        ips = [ipv4_switzerland, ipv4_venezuela]
+        rows = _rows(pool.iter_countries(ips))
+        assert sorted(rows) == [0, 1]
+        assert [rows[index]["ip"] for index in rows] == ips
+
+
+def test_abandoned_run(stub_api, pool):
+    chunks = pool.iter_countries([ipv4_zimbabwe, "8.8.8.8"] * 20)
+    next(chunks)
+    chunks.close()
+
+    ips = [ipv4_switzerland, ipv4_venezuela] * 3
+    rows = _rows(pool.iter_countries(ips))
+
+    assert sorted(rows) == list(range(len(ips)))
+    for index, ip in enumerate(ips):
+        assert rows[index]["ip"] == ip
+        assert rows[index]["country"] == payloads.ip_countries[ip]
@@ -0,0 +1,151 @@
+from parityvend_api.data import COUNTRIES_META
+
+# Payloads in the shape returned by the ParityVend API, used by the offline tests
+# and the benchmarks.
+
+rates_usd = {
+    "USD": 1.0,
+    "EUR": 0.9012,
+    "GBP": 0.7603,
+    "CHF": 0.8471,
+    "ZWL": 322.0,
+    "VES": 36.61,
+    "CNY": 7.0921,
+    "JPY": 142.37,
+}
+
+discounts_raw = {
+    "AC": ["", 0.0],
+    "CH": ["", 0.0],
+    "SV": ["example_coupon", 0.5],
+    "US": ["", 0.0],
+    "VE": ["example_coupon", 0.6],
+    "ZW": ["example_coupon", 0.7],
+}
+
+
+def country_payload(code):
+    name, emoji_flag, currency_code, currency_symbol, currency_localized = (
+        COUNTRIES_META[code]
+    )
+    return {
+        "code": code,
+        "name": name,
+        "emoji_flag": emoji_flag,
+        "currency_code": currency_code,
+        "currency_symbol": currency_symbol,
+        "currency_localized": currency_localized,
+    }
+
+
+def discount_payload(code, base_currency="USD", html=None):
+    if code == "XX":
+        payload = {
+            "status": "ok",
+            "discount": None,
+            "discount_str": None,
+            "coupon_code": None,
+            "country": {},
+            "currency": {},
+        }
+        return payload if html is None else {"status": "ok", "html": None, **payload}
+
+    coupon_code, discount = discounts_raw.get(code, ["", 0.0])
+    _, _, currency_code, currency_symbol, currency_localized = COUNTRIES_META[code]
+    payload = {
+        "status": "ok",
+        "discount": discount,
+        "discount_str": f"{discount:.2%}",
+        "coupon_code": coupon_code,
+        "country": country_payload(code),
+        "currency": {
+            "code": currency_code,
+            "symbol": currency_symbol,
+            "localized_symbol": currency_localized,
+            "conversion_rate": rates_usd[currency_code] / rates_usd[base_currency],
+        },
+    }
+    if html is not None:
+        payload = {"status": "ok", "html": html, **payload}
+    return payload
+
+
+def banner_html(code):
+    coupon_code, discount = discounts_raw.get(code, ["", 0.0])
+    name = COUNTRIES_META[code][0]
+    return (
+        f'<div class="parityvend-banner">Hey! It looks like you are from {name}. '
+        f"We support Purchasing Power Parity so we are offering a {discount:.2%} "
+        f"discount on all products! Use code <b>{coupon_code}</b> at checkout.</div>"
+    )
+
+
+ip_countries = {
+    "102.128.79.255": "ZW",
+    "2c0f:f758::": "ZW",
+    "102.129.143.0": "CH",
+    "190.206.117.0": "VE",
+    "8.8.8.8": "US",
+}
+
+quota_info = {
+    "status": "ok",
+    "quota_limit": 10000,
+    "quota_used": 1234,
+    "quota_left": 8766,
+}
+
+
+# a `get-discount-from-ip` response (Venezuela, USD) in the shape of the API reference example, and table entries
+# written to match it. It is not a captured API response: it only pins the shape of composed responses
+composed_discount_ve = {
+    "status": "ok",
+    "discount": 0.4,
+    "discount_str": "40.00%",
+    "coupon_code": "example_coupon",
+    "country": {
+        "code": "VE",
+        "name": "Venezuela",
+        "emoji_flag": "🇻🇪",
+        "currency_code": "VES",
+        "currency_symbol": "Bs.",
+        "currency_localized": "VESBs.",
+    },
+    "currency": {
+        "code": "VES",
+        "symbol": "Bs.",
+        "localized_symbol": "VESBs.",
+        "conversion_rate": 36.092756259083146,
+    },
+}
+discounts_ve = {"VE": ["example_coupon", 0.4]}
+rates_usd_ve = {"USD": 1.0, "VES": 36.092756259083146}
+
+
+def routes():
+    """Route table for `tests.stub_server.StubAPI` serving the payloads above."""
+
+    def country_of(parts):
+        return ip_countries.get(parts[0], "XX")
+
+    return {
+        "get-country-from-ip": lambda parts: {
+            "status": "ok",
+            "country": country_of(parts),
+        },
+        "get-discount-from-ip": lambda parts: discount_payload(
+            country_of(parts), parts[1]
+        ),
+        "get-discount-with-html-from-ip": lambda parts: discount_payload(
+            country_of(parts), parts[1], banner_html(country_of(parts))
+        ),
+        "get-banner-from-ip": lambda parts: banner_html(country_of(parts)),
+        "get-quota-info": quota_info,
+        "get-discounts-info": {"status": "ok", "discounts": discounts_raw},
+        "get-exchange-rate-info": lambda parts: {
+            "status": "ok",
+            "rates": {
+                code: rate / rates_usd[parts[0]] for code, rate in rates_usd.items()
+            },
+        },
+    }
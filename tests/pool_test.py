@@ -0,0 +1,97 @@
+import aiohttp
+import pytest
+import requests
+
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI
+from parityvend_api.objects import Country
+from tests.variables import ipv4_zimbabwe, secret_key
+
+
+def test_default_pool():
+    parityvend = ParityVendAPI(secret_key)
+    adapter = parityvend.session.get_adapter("https://api.parityvend.cloud")
+
+    assert adapter._pool_maxsize == requests.adapters.DEFAULT_POOLSIZE
+    assert adapter._pool_block is False
+
+
+def test_pool_options():
+    parityvend = ParityVendAPI(secret_key, pool_connections=4, pool_maxsize=64)
+    adapter = parityvend.session.get_adapter("https://api.parityvend.cloud")
+
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 64
+
+
+def test_limit_per_host():
+    parityvend = ParityVendAPI(secret_key, pool_maxsize=64, limit_per_host=16)
+    adapter = parityvend.session.get_adapter("https://api.parityvend.cloud")
+
+    assert adapter._pool_maxsize == 16
+    assert adapter._pool_block is True
+
+
+def test_keepalive_timeout(stub_api):
+    parityvend = ParityVendAPI(secret_key, keepalive_timeout=0)
+    adapter = parityvend.session.get_adapter(stub_api.url)
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert len(adapter.poolmanager.pools) == 1
+
+    parityvend._last_request_time -= 1
+    # never cleared while another request is using the pools
+    parityvend._requests_in_flight = 1
+    parityvend._expire_idle_connections()
+    assert len(adapter.poolmanager.pools) == 1
+
+    parityvend._requests_in_flight = 0
+    parityvend._expire_idle_connections()
+    assert len(adapter.poolmanager.pools) == 0
+
+
+def test_warm_up(stub_api):
+    stub_api.delay = 0.1
+    parityvend = ParityVendAPI(secret_key, pool_maxsize=4, prewarm_connections=4)
+    # creating the handler does not block on the network
+    assert stub_api.count == 0
+    assert parityvend.warm_up() == 4
+    assert stub_api.count == 4
+
+    pools = parityvend.session.get_adapter(stub_api.url).poolmanager.pools
+    (pool,) = [pools[key] for key in pools.keys()]
+    assert pool.num_connections == 4
+
+    assert parityvend.warm_up(2) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_connector_options():
+    parityvend = AsyncParityVendAPI(
+        secret_key,
+        pool_maxsize=256,
+        limit_per_host=64,
+        keepalive_timeout=30,
+        dns_cache_ttl=300,
+    )
+    await parityvend.init()
+    connector = parityvend.session.connector
+
+    assert isinstance(connector, aiohttp.TCPConnector)
+    assert connector.limit == 256
+    assert connector.limit_per_host == 64
+    assert connector._keepalive_timeout == 30
+    assert connector.use_dns_cache
+    assert connector._cached_hosts._ttl == 300
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+async def test_async_warm_up(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key, prewarm_connections=3)
+    await parityvend.init()
+
+    assert stub_api.count == 3
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    await parityvend.deinit()
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+
+from parityvend_api import (
+    AsyncParityVendAPI,
+    ParityVendAPI,
+    Priority,
+    QuotaManager,
+    QuotaReservedError,
+    no_discount_fallback,
+)
+from parityvend_api.objects import Country
+from tests.variables import ipv4_switzerland, ipv4_venezuela, ipv4_zimbabwe, secret_key
+
+
+def _quota(used, limit=1000):
+    return {
+        "status": "ok",
+        "quota_limit": limit,
+        "quota_used": used,
+        "quota_left": limit - used,
+    }
+
+
+def _wait_for(condition, timeout=5):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout
+        time.sleep(0.01)
+
+
+def test_forecast():
+    manager = QuotaManager()
+    assert manager.forecast() is None
+    assert manager.quota_left is None
+
+    manager.update(_quota(100), now=0)
+    manager.update(_quota(200), now=10)
+    assert manager.rate == 10
+    assert manager.forecast() == 80
+
+    manager.record_call()
+    manager.record_call()
+    assert manager.quota_left == 798
+    assert manager.stats["local_calls"] == 2
+
+    manager.update(_quota(400), now=20)
+    assert manager.rate == pytest.approx(0.3 * 20 + 0.7 * 10)
+    assert manager.stats["local_calls"] == 0
+
+
+def test_reserve():
+    manager = QuotaManager(reserve=0.1)
+
+    assert not manager.is_cache_only(Priority.BACKGROUND)
+
+    manager.update(_quota(899))
+    assert not manager.is_cache_only(Priority.BACKGROUND)
+
+    manager.record_call()
+    assert manager.is_cache_only(Priority.BACKGROUND)
+    assert not manager.is_cache_only(Priority.INTERACTIVE)
+
+
+def test_forecast_horizon():
+    manager = QuotaManager(reserve=0, forecast_horizon=3600)
+
+    manager.update(_quota(0), now=0)
+    manager.update(_quota(100), now=600)
+    assert not manager.is_cache_only(Priority.BACKGROUND)
+
+    manager.update(_quota(500), now=1200)
+    assert manager.forecast() < 3600
+    assert manager.is_cache_only(Priority.BACKGROUND)
+
+
+def test_exhausted():
+    manager = QuotaManager(reserve=0)
+    manager.mark_exhausted()
+    assert manager.is_cache_only(Priority.BACKGROUND)
+
+    manager.update(_quota(10))
+    assert not manager.is_cache_only(Priority.BACKGROUND)
+
+
+def test_handler_background_cache_only(stub_api):
+    stub_api.routes["get-quota-info"] = _quota(950)
+    manager = QuotaManager(reserve=0.1)
+    parityvend = ParityVendAPI(secret_key, quota_manager=manager)
+
+    _wait_for(lambda: manager.quota_left is not None)
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert manager.stats["local_calls"] == 1
+
+    results = parityvend.get_countries_from_ips(
+        [ipv4_zimbabwe, ipv4_switzerland], return_exceptions=True
+    )
+    assert results[0] == Country("ZW")
+    assert isinstance(results[1], QuotaReservedError)
+
+    assert parityvend.get_countries_from_ips(
+        [ipv4_switzerland], priority=Priority.INTERACTIVE
+    ) == [Country("CH")]
+    assert stub_api.count_endpoint("get-country-from-ip") == 2
+
+    manager.stop()
+
+
+def test_handler_background_fallback(stub_api):
+    stub_api.routes["get-quota-info"] = _quota(1000)
+    manager = QuotaManager()
+    parityvend = ParityVendAPI(
+        secret_key, quota_manager=manager, fallback=no_discount_fallback
+    )
+
+    _wait_for(lambda: manager.quota_left is not None)
+    response = parityvend.get_discount_from_ip(
+        ipv4_venezuela, priority=Priority.BACKGROUND
+    )
+    assert response["discount"] is None
+    assert stub_api.count_endpoint("get-discount-from-ip") == 0
+
+    manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_handler_polls(stub_api):
+    stub_api.routes["get-quota-info"] = _quota(950)
+    manager = QuotaManager(poll_interval=0.05)
+    parityvend = AsyncParityVendAPI(secret_key, quota_manager=manager)
+    await parityvend.init()
+
+    while manager.quota_left is None:
+        await asyncio.sleep(0.01)
+
+    results = await parityvend.get_countries_from_ips(
+        [ipv4_zimbabwe], return_exceptions=True
+    )
+    assert isinstance(results[0], QuotaReservedError)
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    stub_api.routes["get-quota-info"] = _quota(100)
+    while manager.is_cache_only(Priority.BACKGROUND):
+        await asyncio.sleep(0.01)
+    assert await parityvend.get_countries_from_ips([ipv4_switzerland]) == [
+        Country("CH")
+    ]
+
+    await parityvend.deinit()
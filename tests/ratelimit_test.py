@@ -0,0 +1,116 @@
+import multiprocessing
+import time
+
+import pytest
+
+from parityvend_api import (
+    AsyncParityVendAPI,
+    ParityVendAPI,
+    RateLimiter,
+    RateLimitExceededError,
+)
+from parityvend_api.objects import Country
+from tests.variables import ipv4_zimbabwe, secret_key
+
+
+def _count_tokens(path, seconds, results):
+    limiter = RateLimiter(rate=20, burst=10, path=path)
+    taken = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        taken += limiter.try_acquire()
+        time.sleep(0.001)
+    results.put(taken)
+
+
+def test_burst():
+    limiter = RateLimiter(rate=1, burst=5)
+
+    assert sum(limiter.try_acquire() for _ in range(10)) == 5
+    assert limiter.tokens < 1
+
+
+def test_refill():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    started = time.monotonic()
+    limiter.acquire()
+    assert 0.01 <= time.monotonic() - started < 0.2
+
+
+def test_fail_fast():
+    limiter = RateLimiter(rate=1, burst=1, block=False)
+    limiter.acquire()
+
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        limiter.acquire()
+    assert 0 < exc_info.value.retry_after <= 1
+
+    with pytest.raises(RateLimitExceededError):
+        RateLimiter(rate=1, burst=0, max_wait=0.1).acquire()
+
+
+def test_shared(tmp_path):
+    path = str(tmp_path / "parityvend.bucket")
+    a = RateLimiter(rate=1, burst=3, path=path)
+    b = RateLimiter(rate=1, burst=3, path=path)
+
+    assert a.try_acquire()
+    assert b.try_acquire()
+    assert a.try_acquire()
+    assert not b.try_acquire()
+    assert not a.try_acquire()
+
+    a.close()
+    b.close()
+
+
+def test_shared_between_processes(tmp_path):
+    path = str(tmp_path / "parityvend.bucket")
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_count_tokens, args=(path, 0.5, results))
+        for _ in range(4)
+    ]
+
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    taken = sum(results.get() for _ in processes)
+    # the burst of 10 plus 20/s for ~0.5s (processes start at slightly different times)
+    assert 10 <= taken <= 10 + 20 * 0.8
+
+
+def test_handler_fail_fast(stub_api):
+    parityvend = ParityVendAPI(
+        secret_key, rate_limiter=RateLimiter(rate=1, burst=2, block=False)
+    )
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False) == Country("ZW")
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False) == Country("ZW")
+    with pytest.raises(RateLimitExceededError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+
+    # cache hits do not take tokens
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+    assert stub_api.count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_handler_waits(stub_api):
+    parityvend = AsyncParityVendAPI(
+        secret_key, rate_limiter=RateLimiter(rate=20, burst=1)
+    )
+
+    started = time.monotonic()
+    for _ in range(3):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+    assert time.monotonic() - started >= 0.09
+    assert stub_api.count == 3
+
+    await parityvend.deinit()
@@ -0,0 +1,160 @@
+import pytest
+
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI, RetryPolicy
+from parityvend_api.exceptions import (
+    APIError,
+    ConnectionError,
+    ProcessingError,
+    QuotaExceededError,
+)
+from parityvend_api.retry import parse_retry_after
+from tests import payloads
+from tests.variables import ipv4_zimbabwe, secret_key
+
+over_quota = {"status": "error", "error_name": "over_quota"}
+
+
+def _flaky(failures, status=503, headers=None):
+    """A route failing `failures` times before serving the recorded payload."""
+    calls = []
+
+    def route(parts):
+        calls.append(parts)
+        if len(calls) <= failures:
+            return status, {"Content-Type": "text/html", **(headers or {})}, b"busy"
+        return {"status": "ok", "country": "ZW"}
+
+    return route
+
+
+def test_backoff_full_jitter():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=2.0)
+
+    for attempt in range(1, 10):
+        cap = min(2.0, 0.5 * 2 ** (attempt - 1))
+        assert all(0 <= policy.get_backoff(attempt) <= cap for _ in range(100))
+
+
+def test_retry_delay():
+    policy = RetryPolicy(max_attempts=3, budget=1.0, backoff_max=0.1)
+
+    assert policy.get_retry_delay(ConnectionError(), 1, 0) is not None
+    assert policy.get_retry_delay(APIError(status_code=503), 2, 0) is not None
+    assert policy.get_retry_delay(ConnectionError(), 3, 0) is None
+    assert policy.get_retry_delay(APIError(status_code=400), 1, 0) is None
+    assert policy.get_retry_delay(ProcessingError(), 1, 0) is None
+    assert policy.get_retry_delay(QuotaExceededError(), 1, 0) is None
+    assert policy.get_retry_delay(ConnectionError(), 1, 1.5) is None
+
+
+def test_retry_after():
+    policy = RetryPolicy(budget=10)
+
+    assert policy.get_retry_delay(APIError(status_code=429, retry_after=3), 1, 0) == 3
+    # capped at the rest of the budget
+    assert policy.get_retry_delay(APIError(status_code=429, retry_after=30), 1, 4) == 6
+    assert policy.get_retry_delay(APIError(status_code=429, retry_after=3), 1, 10) is None
+    assert (
+        RetryPolicy(respect_retry_after=False).get_retry_delay(
+            APIError(status_code=429, retry_after=30), 1, 0
+        )
+        < 30
+    )
+
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry(stub_api):
+    stub_api.routes["get-country-from-ip"] = _flaky(2)
+    parityvend = ParityVendAPI(
+        secret_key, retry_policy=RetryPolicy(backoff_base=0.01)
+    )
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe).code == "ZW"
+    assert stub_api.count == 3
+
+
+def test_retry_exhausted(stub_api):
+    stub_api.routes["get-country-from-ip"] = _flaky(5)
+    parityvend = ParityVendAPI(
+        secret_key, retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01)
+    )
+
+    with pytest.raises(APIError) as exc_info:
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert exc_info.value.status_code == 503
+    assert stub_api.count == 3
+
+
+def test_retry_after_header(stub_api):
+    stub_api.routes["get-country-from-ip"] = _flaky(1, 429, {"Retry-After": "0"})
+    parityvend = ParityVendAPI(
+        secret_key, retry_policy=RetryPolicy(backoff_base=60, budget=5)
+    )
+
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe).code == "ZW"
+    assert stub_api.count == 2
+
+
+def test_no_retry_on_over_quota(stub_api):
+    stub_api.routes["get-country-from-ip"] = over_quota
+    parityvend = ParityVendAPI(
+        secret_key,
+        raise_exc_on_error=False,
+        retry_policy=RetryPolicy(backoff_base=0.01),
+    )
+
+    with pytest.raises(QuotaExceededError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert stub_api.count == 1
+
+
+def test_no_retry_by_default(stub_api):
+    stub_api.routes["get-country-from-ip"] = _flaky(1)
+    parityvend = ParityVendAPI(secret_key)
+
+    with pytest.raises(APIError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert stub_api.count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_retry(stub_api):
+    stub_api.routes["get-country-from-ip"] = _flaky(2)
+    parityvend = AsyncParityVendAPI(
+        secret_key, retry_policy=RetryPolicy(backoff_base=0.01)
+    )
+
+    assert (await parityvend.get_country_from_ip(ipv4_zimbabwe)).code == "ZW"
+    assert stub_api.count == 3
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+async def test_async_no_retry_on_over_quota(stub_api):
+    stub_api.routes["get-country-from-ip"] = over_quota
+    parityvend = AsyncParityVendAPI(
+        secret_key, retry_policy=RetryPolicy(backoff_base=0.01)
+    )
+
+    with pytest.raises(ProcessingError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert stub_api.count == 1
+
+    await parityvend.deinit()
+
+    parityvend = AsyncParityVendAPI(
+        secret_key,
+        raise_exc_on_error=False,
+        retry_policy=RetryPolicy(backoff_base=0.01),
+    )
+
+    with pytest.raises(QuotaExceededError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert stub_api.count == 2
+
+    await parityvend.deinit()
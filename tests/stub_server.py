@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAPI:
+    """A local stand-in for the ParityVend API used by the offline tests.
+
+    `routes` maps an endpoint name (e.g. "get-country-from-ip") to a payload, or to a
+    callable receiving the path segments after the private key and returning one.
+    A payload is a dict (sent as JSON), a str (sent as HTML) or a
+    `(status, headers, body)` tuple. `peak_inflight` is the largest number of
+    requests that were being answered at the same time.
+    """
+
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = routes or {}
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.peak_inflight = 0
+
+    @property
+    def count(self):
+        with self.lock:
+            return len(self.requests)
+
+    def count_endpoint(self, endpoint_name):
+        with self.lock:
+            return sum(1 for path in self.requests if f"/{endpoint_name}/" in path)
+
+    def respond(self, method, path):
+        with self.lock:
+            self.requests.append(path)
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+        try:
+            return self._respond(method, path)
+        finally:
+            with self.lock:
+                self.inflight -= 1
+
+    def _respond(self, method, path):
+        if self.delay:
+            time.sleep(self.delay() if callable(self.delay) else self.delay)
+
+        parts = path.split("?")[0].strip("/").split("/")
+        if len(parts) < 2 or parts[0] != "backend":
+            return 200, {"Content-Type": "text/html"}, b""
+
+        payload = self.routes.get(parts[1])
+        if callable(payload):
+            payload = payload(parts[3:])
+
+        if payload is None:
+            return 404, {"Content-Type": "text/html"}, b"not found"
+        if isinstance(payload, tuple):
+            return payload
+        if isinstance(payload, str):
+            return 200, {"Content-Type": "text/html"}, payload.encode("utf8")
+        return (
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(payload).encode("utf8"),
+        )
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _handle(self, send_body=True):
+            status, headers, body = stub.respond(self.command, self.path)
+            if isinstance(body, str):
+                body = body.encode("utf8")
+            try:
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_GET(self):
+            self._handle()
+
+        def do_HEAD(self):
+            self._handle(send_body=False)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@contextmanager
+def serve(stub):
+    """Run `stub` on a free local port and yield its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(stub))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,94 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from parityvend_api import ParityVendAPI
+from parityvend_api.cache.default import DefaultCache
+from parityvend_api.objects import COUNTRIES, Country
+from tests.variables import ipv4_switzerland, ipv4_zimbabwe, secret_key
+
+
+@pytest.fixture
+def fast_switching():
+    # switch threads as often as possible, to bring races out on builds with a GIL
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target, count=16):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_default_cache_threads(fast_switching):
+    # a small cache with a short TTL, so reads and writes keep evicting and expiring entries
+    cache = DefaultCache(maxsize=32, ttl=0.001)
+
+    def hammer():
+        rng = random.Random()
+        for _ in range(5000):
+            key = rng.randrange(256)
+            cache[key] = key
+            try:
+                assert cache[key] == key
+            except KeyError:
+                pass
+            key in cache
+
+    assert _run_threads(hammer) == []
+    assert len(cache.cache) <= 32
+
+
+def test_cache_hits_return_frozen_results(stub_api):
+    parityvend = ParityVendAPI(secret_key)
+    response = parityvend.get_discount_from_ip(ipv4_zimbabwe)
+    discounts_info = parityvend.get_discounts_info()
+
+    assert parityvend.get_discount_from_ip(ipv4_zimbabwe) is response
+    assert parityvend.get_discounts_info() is discounts_info
+    assert response.country is COUNTRIES["ZW"]
+    assert response.currency is response.currency
+    assert stub_api.count == 2
+
+    with pytest.raises(TypeError):
+        response["discount"] = 0.0
+    with pytest.raises(TypeError):
+        response.currency.pop("conversion_rate")
+    with pytest.raises(TypeError):
+        response.country["name"] = "Narnia"
+    with pytest.raises(TypeError):
+        discounts_info.discounts.clear()
+    copy = dict(response)
+    copy["discount"] = 0.0
+    assert response.discount == 0.7
+
+
+def test_cached_lookups_threads(stub_api, fast_switching):
+    parityvend = ParityVendAPI(secret_key)
+    ips = [ipv4_zimbabwe, ipv4_switzerland]
+    expected = [Country("ZW"), Country("CH")]
+
+    def lookup():
+        for _ in range(300):
+            for ip, country in zip(ips, expected):
+                response = parityvend.get_discount_from_ip(ip)
+                assert response["country"] == country
+                assert response.currency.code == country.currency_code
+
+    assert _run_threads(lookup) == []
@@ -0,0 +1,117 @@
+import asyncio
+import gc
+import os
+import random
+import time
+
+import aiohttp
+import pytest
+
+from parityvend_api import AsyncParityVendAPI, ParityVendAPI
+from parityvend_api.exceptions import ConnectionError
+from parityvend_api.objects import Country
+from tests.variables import ipv4_zimbabwe, secret_key
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_sync_timeouts(stub_api):
+    parityvend = ParityVendAPI(secret_key, connect_timeout=1, read_timeout=0.05)
+    assert parityvend.request_options["timeout"] == (1, 0.05)
+
+    stub_api.delay = 0.2
+    with pytest.raises(ConnectionError):
+        parityvend.get_country_from_ip(ipv4_zimbabwe)
+
+    stub_api.delay = 0
+    assert parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+
+@pytest.mark.asyncio
+async def test_client_timeout(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key, connect_timeout=1, read_timeout=0.05)
+
+    timeout = parityvend.get_client_timeout(2)
+    assert isinstance(timeout, aiohttp.ClientTimeout)
+    assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (2, 1, 0.05)
+
+    await parityvend.init()
+    assert parityvend.session.timeout.sock_read == 0.05
+    assert parityvend.session.timeout.total == 300
+
+    stub_api.delay = 0.2
+    started = time.monotonic()
+    with pytest.raises(ConnectionError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe)
+    assert time.monotonic() - started < 0.2
+
+    stub_api.delay = 0
+    assert await parityvend.get_country_from_ip(ipv4_zimbabwe) == Country("ZW")
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+async def test_total_timeout(stub_api):
+    parityvend = AsyncParityVendAPI(secret_key)
+
+    stub_api.delay = 0.2
+    with pytest.raises(ConnectionError):
+        await parityvend.get_country_from_ip(ipv4_zimbabwe, timeout=0.05)
+
+    await parityvend.deinit()
+
+
+@pytest.mark.asyncio
+async def test_cancel_releases_connection(stub_api):
+    stub_api.delay = 0.2
+    parityvend = AsyncParityVendAPI(secret_key, pool_maxsize=1)
+
+    task = asyncio.ensure_future(parityvend.get_country_from_ip(ipv4_zimbabwe))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # the only pooled connection is free again
+    stub_api.delay = 0
+    result = await asyncio.wait_for(
+        parityvend.get_country_from_ip(ipv4_zimbabwe), timeout=1
+    )
+    assert result == Country("ZW")
+
+    await parityvend.deinit()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+@pytest.mark.asyncio
+async def test_stress_no_leaks(stub_api):
+    """Fire 10k requests at a slow stub, half of them timing out, and check that no
+    tasks or sockets are left behind."""
+    random.seed(0)
+    stub_api.delay = lambda: random.choice((0.0, 0.1))
+    fds = _open_fds()
+    tasks = asyncio.all_tasks()
+
+    parityvend = AsyncParityVendAPI(secret_key, pool_maxsize=200, read_timeout=0.05)
+    results = await asyncio.gather(
+        *(
+            parityvend.get_country_from_ip(ipv4_zimbabwe, cache=False)
+            for _ in range(10_000)
+        ),
+        return_exceptions=True,
+    )
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert all(isinstance(error, ConnectionError) for error in errors)
+    assert 0 < len(errors) < len(results)
+    assert results.count(Country("ZW")) == len(results) - len(errors)
+
+    await parityvend.deinit()
+    await asyncio.sleep(0.1)
+    gc.collect()
+
+    assert asyncio.all_tasks() == tasks
+    assert _open_fds() <= fds